@@ -1,28 +0,0 @@
-def linreg_slope(series, length):
-    """
-    Calculates the slope of the linear regression line for a given series.
-
-    The slope is a measure of the rate of change of the series over a specified period.
-    It helps identify the direction and strength of the trend.
-
-    Parameters:
-    ----------
-    series : pd.Series
-        The input series (e.g., closing prices).
-    length : int
-        The lookback period for calculating the slope.
-
-    Returns:
-    -------
-    float
-        The slope of the linear regression line.
-
-    Example Usage:
-    --------------
-    ```python
-    slope = linreg_slope(data['close'], length=14)
-    ```
-    """
-    x = np.arange(len(series))
-    slope = np.polyfit(x[-length:], series[-length:], 1)[0]
-    return slope
@@ -0,0 +1,132 @@
+import importlib
+
+# Nothing is imported here: submodules (and pandas/NumPy with them) load on first
+# attribute access, so `import indicators` stays cheap for short-lived processes.
+# `indicators.<name>` is always a submodule, since importing one binds it on the
+# package under its own name anyway and most indicators live in a module named
+# after them; the functions are in the flat `indicators.api` namespace.
+
+# Every DataFrame indicator -> the submodule that defines it
+INDICATORS = {
+    'calculate_adx': 'adx',
+    'calculate_aroon': 'calculate_aroon',
+    'calculate_atr': 'calculate_atr',
+    'calculate_bbp': 'calculate_bbp',
+    'calculate_bollinger_bands': 'calculate_bollinger_bands',
+    'calculate_coppock_curve': 'calculate_coppock_curve',
+    'calculate_dirmov': 'calculate_dirmov',
+    'calculate_donchian': 'calculate_donchian',
+    'calculate_ema': 'calculate_ema',
+    'calculate_fibobars': 'fibobars',
+    'calculate_heikin_ashi': 'heikin_ashi',
+    'calculate_ichimoku': 'calculate_ichimoku',
+    'calculate_kvo': 'calculate_kvo',
+    'calculate_macd': 'calculate_macd',
+    'calculate_obv': 'calculate_obv',
+    'calculate_percentage_oscillator': 'percentage_oscillator',
+    'calculate_psar': 'calculate_psar',
+    'calculate_rsi': 'rsi',
+    'calculate_sma': 'calculate_sma',
+    'calculate_stochastic': 'stochastic_oscillator',
+    'calculate_supertrend': 'supertrend',
+    'calculate_true_range': 'calculate_atr',
+    'hma': 'hma',
+    'kairi_relative_index': 'calculate_kairi_relative_index',
+    'kalman_filter': 'kalman_filter',
+    'linreg_slope': 'calculate_linreg_slope',
+    'mass_index': 'calculate_mass_index',
+    'rolling_linreg': 'calculate_linreg_slope',
+    'thma': 'thma',
+    'wma': 'hma',
+}
+
+# Tool functions -> their submodule
+_TOOLS = {
+    'as_panel': 'panel',
+    'stack_symbols': 'panel',
+    'rolling_extremum': 'rolling_extremum',
+    'rolling_max': 'rolling_extremum',
+    'rolling_min': 'rolling_extremum',
+    'rolling_argmax': 'rolling_extremum',
+    'rolling_argmin': 'rolling_extremum',
+    'SharedUniverse': 'parallel',
+    'run_parallel': 'parallel',
+    'ColumnStore': 'store',
+    'run_chunked': 'chunked',
+    'stream_csv': 'chunked',
+    'save_checkpoint': 'checkpoint',
+    'load_checkpoint': 'checkpoint',
+    'MultiTimeframe': 'timeframes',
+    'resample_bars': 'timeframes',
+    'LivePipeline': 'live',
+    'last_n': 'tail',
+    'screen': 'tail',
+    'profile': 'profiling',
+    'backtest': 'backtest',
+    'backtest_grid': 'backtest',
+    'as_fields': 'adapters',
+    'compute': 'backends',
+    'set_backend': 'backends',
+    'use_backend': 'backends',
+    'FeaturePlan': 'features',
+    'plan_features': 'features',
+    'compute_features': 'features',
+    'sweep_macd': 'sweep',
+    'sweep_supertrend': 'sweep',
+    'sweep_bollinger_bands': 'sweep',
+    'sweep_stochastic': 'sweep',
+}
+
+_SUBMODULES = frozenset({
+    'adapters', 'adx', 'api', 'backends', 'backtest', 'benchmark', 'calculate_aroon', 'calculate_atr', 'calculate_bbp',
+    'calculate_bollinger_bands', 'calculate_coppock_curve', 'calculate_dirmov', 'calculate_donchian', 'calculate_ema',
+    'calculate_ichimoku', 'calculate_kairi_relative_index', 'calculate_kvo', 'calculate_linreg_slope', 'calculate_macd',
+    'calculate_mass_index', 'calculate_obv', 'calculate_psar', 'calculate_sma', 'checkpoint', 'chunked', 'features',
+    'fibobars', 'heikin_ashi', 'hma', 'kalman_filter', 'kernels', 'live', 'panel', 'parallel',
+    'percentage_oscillator', 'profiling', 'rolling_extremum', 'rsi', 'stochastic_oscillator', 'store', 'streaming',
+    'supertrend', 'sweep', 'tail', 'thma', 'timeframes', 'values',
+})
+
+__all__ = ['INDICATORS', 'get_indicator'] + sorted(_SUBMODULES)
+
+
+def get_indicator(name):
+    """
+    Returns an indicator function from `INDICATORS` by name, importing its module.
+
+    Parameters:
+    ----------
+    name : str
+        A key of `INDICATORS`.
+
+    Returns:
+    -------
+    callable
+        The indicator function.
+
+    Example Usage:
+    --------------
+    ```python
+    import indicators
+
+    for name in indicators.INDICATORS:
+        func = indicators.get_indicator(name)
+    rsi = indicators.api.calculate_rsi(data, 14)    # loads indicators.rsi on first use
+    ```
+    """
+    if name not in INDICATORS:
+        raise KeyError(f"Unknown indicator '{name}'.")
+    return getattr(importlib.import_module(f'.{INDICATORS[name]}', __name__), name)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in INDICATORS or name in _TOOLS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'; "
+                             f"functions are in indicators.api (indicators.api.{name})")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from .panel import wrap_like
+from .profiling import profiled
+
+# Input normalization. `as_fields` turns any supported input into a dict of field
+# name -> NumPy array that shares memory with the input wherever its layout allows;
+# `wrap_as` puts results back into the input's container type. Fields are strided
+# views when the input stores them interleaved (a C-ordered time x fields matrix, a
+# structured array); kernels that need contiguous rows copy those once, so store the
+# fields column-major (or as separate arrays) to avoid it. Arrow inputs need
+# pyarrow, which is only imported when one is passed.
+
+def _is_arrow(data):
+    return type(data).__module__.split('.')[0] == 'pyarrow'
+
+
+def _arrow_array(column):
+    # Numeric chunks without nulls are read in place through the buffer protocol;
+    # anything else is converted, with nulls as NaN
+    import pyarrow as pa
+
+    chunks = column.chunks if isinstance(column, pa.ChunkedArray) else [column]
+    if len(chunks) == 1 and chunks[0].null_count == 0 and (pa.types.is_floating(chunks[0].type)
+                                                           or pa.types.is_integer(chunks[0].type)):
+        chunk = chunks[0]
+        # `chunk.offset` counts elements (a slice of a larger array), frombuffer bytes
+        return np.frombuffer(chunk.buffers()[1], dtype=chunk.type.to_pandas_dtype(), count=len(chunk),
+                             offset=chunk.offset * (chunk.type.bit_width // 8))
+    if not chunks:
+        return np.empty(0)
+    return np.concatenate([chunk.to_numpy(zero_copy_only=False) for chunk in chunks])
+
+
+def _rename(fields, columns):
+    # `columns` maps input names to field names and wins over the other names,
+    # which match case-insensitively
+    renamed = {columns[name]: values for name, values in fields.items() if name in columns}
+    for name, values in fields.items():
+        if name not in columns:
+            renamed.setdefault(name.lower() if isinstance(name, str) else name, values)
+    return renamed
+
+
+@profiled
+def as_fields(data, columns=None):
+    """
+    Normalizes an OHLCV input to a dict of NumPy arrays, without copying.
+
+    Parameters:
+    ----------
+    data : DataFrame, Series, numpy.ndarray, dict, structured array, or pyarrow Table
+        The input. A panel (dict of time x symbols DataFrames, see `panel.as_panel`)
+        gives 2-D fields. A Series or a 1-D array is a single field; a 2-D array is
+        a single field per symbol, or one column per field with a list `columns`. A
+        pyarrow Table or RecordBatch gives its columns, a pyarrow Array or
+        ChunkedArray a single field.
+    columns : dict, list or str, optional
+        A dict renames input columns to field names ({'Adj Close': 'close'}); other
+        names are lowercased, so 'High' is read as 'high'. A list names the columns
+        of a 2-D array in order (['open', 'high', 'low', 'close', 'volume']). A
+        string names the field of a single-field input. Default maps a single field
+        to 'close'.
+
+    Returns:
+    -------
+    dict
+        Field name -> 1-D (time) or 2-D (time x symbols) array.
+
+    Example Usage:
+    --------------
+    ```python
+    fields = as_fields(matrix, columns=['open', 'high', 'low', 'close', 'volume'])
+    fields = as_fields(arrow_table, columns={'px_last': 'close'})
+    fields['close'].base is not None        # a view of the input
+    ```
+    """
+    if isinstance(data, pd.DataFrame):
+        fields = {name: data[name].to_numpy() for name in data.columns}
+    elif isinstance(data, dict):
+        fields = {name: values.to_numpy() if isinstance(values, (pd.Series, pd.DataFrame)) else np.asarray(values)
+                  for name, values in data.items()}
+    elif _is_arrow(data) and hasattr(data, 'column_names'):
+        fields = {name: _arrow_array(data.column(name)) for name in data.column_names}
+    elif isinstance(data, np.ndarray) and data.dtype.names:
+        fields = {name: data[name] for name in data.dtype.names}
+    elif isinstance(columns, (list, tuple)):
+        array = np.asarray(data)
+        if array.ndim != 2 or array.shape[1] != len(columns):
+            raise ValueError("A list of columns needs a 2-D array with one column per name.")
+        return {field: array[:, j] for j, field in enumerate(columns)}
+    else:
+        # A single field
+        if isinstance(data, pd.Series):
+            values = data.to_numpy()
+        elif _is_arrow(data):
+            values = _arrow_array(data)
+        else:
+            values = np.asarray(data)
+        return {columns or 'close': values}
+    return _rename(fields, columns if isinstance(columns, dict) else {})
+
+
+def wrap_as(result, data):
+    """
+    Puts kernel results back into the container type of the input.
+
+    Parameters:
+    ----------
+    result : numpy.ndarray or tuple of numpy.ndarray
+        Outputs with one row per input bar.
+    data
+        The input given to `as_fields`.
+
+    Returns:
+    -------
+    Series or DataFrame (indexed like the input) for pandas inputs, pyarrow Arrays
+    for Arrow inputs, otherwise the arrays themselves; a tuple for several outputs.
+    """
+    if isinstance(result, tuple):
+        return tuple(wrap_as(values, data) for values in result)
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        return pd.Series(result, index=data.index, copy=False)
+    if isinstance(data, dict):
+        like = next((values for values in data.values() if isinstance(values, (pd.Series, pd.DataFrame))), None)
+        return wrap_like(result, like) if like is not None else result
+    if _is_arrow(data):
+        import pyarrow as pa
+        return pa.array(result)
+    return result
@@ -1,14 +1,18 @@
 import pandas as pd
 import numpy as np
 
+from .profiling import profiled
+
+@profiled
 def calculate_adx(data, period=14, smoothing_period=14):
     """
     Calculate the Average Directional Index (ADX) for a given dataset.
 
     Parameters:
     ----------
-    data : pandas.DataFrame
-        DataFrame containing 'high', 'low', and 'close' price columns.
+    data : pandas.DataFrame or dict
+        DataFrame containing 'high', 'low', and 'close' price columns, or a panel
+        (see `panel.as_panel`) with one column per symbol in each field.
     period : int, optional
         The lookback period for calculating TR, DM+, and DM-. Default is 14.
     smoothing_period : int, optional
@@ -22,10 +26,10 @@ def calculate_adx(data, period=14, smoothing_period=14):
     df = data.copy()
     df['TR'] = np.maximum(df['high'] - df['low'], 
                           np.maximum(abs(df['high'] - df['close'].shift()), abs(df['low'] - df['close'].shift())))
-    df['DM+'] = np.where((df['high'] - df['high'].shift()) > (df['low'].shift() - df['low']), 
-                         np.maximum(df['high'] - df['high'].shift(), 0), 0)
-    df['DM-'] = np.where((df['low'].shift() - df['low']) > (df['high'] - df['high'].shift()), 
-                         np.maximum(df['low'].shift() - df['low'], 0), 0)
+    up = df['high'] - df['high'].shift()
+    down = df['low'].shift() - df['low']
+    df['DM+'] = up.clip(lower=0).where(up > down, 0)
+    df['DM-'] = down.clip(lower=0).where(down > up, 0)
     
     df['TR'] = df['TR'].rolling(window=period).mean()
     df['DM+'] = df['DM+'].rolling(window=period).mean()
@@ -0,0 +1,24 @@
+import importlib
+
+from . import INDICATORS, _TOOLS
+
+# Every indicator and tool function under one flat namespace. The package itself
+# only holds submodules, so `indicators.<name>` is always a module; the functions
+# are here, and each loads its own module (and pandas with it) on first access.
+#
+#     from indicators.api import calculate_macd, as_panel
+
+__all__ = sorted(set(INDICATORS) | set(_TOOLS))
+
+
+def __getattr__(name):
+    module = INDICATORS.get(name) or _TOOLS.get(name)
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f'.{module}', __package__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,537 @@
+import contextlib
+import contextvars
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from . import values
+from .adapters import as_fields, wrap_as
+from .adx import calculate_adx
+from .calculate_aroon import calculate_aroon
+from .calculate_atr import calculate_atr, calculate_true_range
+from .calculate_bbp import calculate_bbp
+from .calculate_bollinger_bands import calculate_bollinger_bands
+from .calculate_coppock_curve import calculate_coppock_curve
+from .calculate_dirmov import calculate_dirmov
+from .calculate_donchian import calculate_donchian
+from .calculate_ema import calculate_ema
+from .calculate_ichimoku import calculate_ichimoku
+from .calculate_kairi_relative_index import kairi_relative_index
+from .calculate_kvo import calculate_kvo
+from .calculate_macd import calculate_macd
+from .calculate_mass_index import mass_index
+from .calculate_obv import calculate_obv
+from .calculate_psar import calculate_psar
+from .calculate_sma import calculate_sma
+from .fibobars import calculate_fibobars
+from .heikin_ashi import calculate_heikin_ashi
+from .hma import hma, wma
+from .kalman_filter import kalman_filter
+from .panel import as_panel
+from .percentage_oscillator import calculate_percentage_oscillator
+from .profiling import profiled, span
+from .rsi import calculate_rsi
+from .stochastic_oscillator import calculate_stochastic
+from .supertrend import calculate_supertrend
+from .thma import thma
+
+# Every indicator of `IMPLEMENTATIONS` runs on up to three backends that give the
+# same values: 'pandas', the DataFrame functions (the reference); 'numpy', the
+# values-only functions of `values`; and 'numba', compiled bar-by-bar loops for the
+# path-dependent indicators (PSAR, Supertrend, Fibobars, Kalman filter, OBV), used
+# when Numba is importable. The backend is chosen per call or for a block or the
+# whole process; an indicator the chosen backend does not cover, or a backend that
+# is not installed, falls back along numba -> numpy -> pandas.
+
+BACKENDS = ('pandas', 'numpy', 'numba')
+_FALLBACK = {'numba': ('numba', 'numpy', 'pandas'), 'numpy': ('numpy', 'pandas'), 'pandas': ('pandas',)}
+
+_backend = contextvars.ContextVar('indicators_backend', default='numba')
+_UNLOADED = object()
+_compiled = _UNLOADED
+
+
+def _shallow(data):
+    # Functions that add their columns to the input must not touch the caller's
+    return data.copy(deep=False) if isinstance(data, pd.DataFrame) else dict(data)
+
+
+# Bar-by-bar loops over (time x columns) float64 arrays, filling the output arrays in
+# place. They reproduce the scalar loops of `kernels` one column at a time, including
+# Python's `min`/`max` (the first argument wins unless another compares smaller or
+# larger), and are compiled with `numba.njit` on first use.
+
+def _psar_loop(high, low, initial_af, max_af, step_af, psar, trend, ep, af):
+    n, m = high.shape
+    for j in range(m):
+        start = 0
+        while start < n and (np.isnan(high[start, j]) or np.isnan(low[start, j])):
+            start += 1
+        if start == n:
+            continue
+        cur_psar, cur_trend, cur_ep, cur_af = low[start, j], 1, high[start, j], initial_af[j]
+        psar[start, j], trend[start, j], ep[start, j], af[start, j] = cur_psar, cur_trend, cur_ep, cur_af
+        for i in range(start + 1, n):
+            sar = cur_psar + cur_af * (cur_ep - cur_psar)
+            if cur_trend == 1:
+                prior = low[i - 2, j] if i > start + 1 else low[i - 1, j]
+                if low[i - 1, j] < sar:
+                    sar = low[i - 1, j]
+                if prior < sar:
+                    sar = prior
+                if low[i, j] < sar:
+                    cur_trend, cur_psar, cur_ep, cur_af = -1, cur_ep, low[i, j], initial_af[j]
+                else:
+                    cur_psar = sar
+                    if high[i, j] > cur_ep:
+                        cur_ep = high[i, j]
+                        cur_af = cur_af + step_af[j]
+                        if max_af[j] < cur_af:
+                            cur_af = max_af[j]
+            else:
+                prior = high[i - 2, j] if i > start + 1 else high[i - 1, j]
+                if high[i - 1, j] > sar:
+                    sar = high[i - 1, j]
+                if prior > sar:
+                    sar = prior
+                if high[i, j] > sar:
+                    cur_trend, cur_psar, cur_ep, cur_af = 1, cur_ep, high[i, j], initial_af[j]
+                else:
+                    cur_psar = sar
+                    if low[i, j] < cur_ep:
+                        cur_ep = low[i, j]
+                        cur_af = cur_af + step_af[j]
+                        if max_af[j] < cur_af:
+                            cur_af = max_af[j]
+            psar[i, j], trend[i, j], ep[i, j], af[i, j] = cur_psar, cur_trend, cur_ep, cur_af
+
+
+def _supertrend_loop(close, upper_band, lower_band, final_upper, final_lower, supertrend, direction):
+    n, m = close.shape
+    for j in range(m):
+        start = 0
+        while start < n and (np.isnan(upper_band[start, j]) or np.isnan(lower_band[start, j])):
+            start += 1
+        if start == n:
+            continue
+        fu, fl, d = upper_band[start, j], lower_band[start, j], 1
+        final_upper[start, j], final_lower[start, j] = fu, fl
+        supertrend[start, j], direction[start, j] = fl, d
+        for i in range(start + 1, n):
+            prev_fu, prev_fl = fu, fl
+            fu = upper_band[i, j]
+            if close[i - 1, j] < prev_fu and prev_fu < fu:
+                fu = prev_fu
+            fl = lower_band[i, j]
+            if close[i - 1, j] > prev_fl and prev_fl > fl:
+                fl = prev_fl
+            if d == -1 and close[i, j] > prev_fu:
+                d = 1
+            elif d == 1 and close[i, j] < prev_fl:
+                d = -1
+            final_upper[i, j], final_lower[i, j], direction[i, j] = fu, fl, d
+            supertrend[i, j] = fl if d == 1 else fu
+
+
+def _supertrend_flip_loop(close, upper_band, lower_band, supertrend):
+    n, m = close.shape
+    for j in range(m):
+        if n == 0:
+            break
+        prev = upper_band[0, j]
+        supertrend[0, j] = prev
+        for i in range(1, n):
+            prev = upper_band[i, j] if close[i, j] > prev else lower_band[i, j]
+            supertrend[i, j] = prev
+
+
+def _fibobars_loop(highest_high, lowest_low, close, open_price, period, fibo_level, trend):
+    n, m = close.shape
+    for j in range(m):
+        first = 0
+        while first < n and np.isnan(close[first, j]):
+            first += 1
+        prev = 0
+        for i in range(first + period, n):
+            rng = (highest_high[i, j] - lowest_low[i, j]) * fibo_level[j]
+            if open_price[i, j] > close[i, j]:
+                prev = 1 if (prev >= 0 and rng < close[i, j] - lowest_low[i, j]) else -1
+            else:
+                prev = -1 if (prev <= 0 and rng < highest_high[i, j] - close[i, j]) else 1
+            trend[i, j] = prev
+
+
+def _obv_loop(close, volume, obv):
+    n, m = close.shape
+    for j in range(m):
+        total = 0.0
+        for i in range(n):
+            if i > 0:
+                delta = close[i, j] - close[i - 1, j]
+                if delta > 0:
+                    total += volume[i, j]
+                elif delta < 0:
+                    total -= volume[i, j]
+            obv[i, j] = total
+
+
+def _kalman_loop(observations, process_variance, measurement_variance, smooth, estimates, errors):
+    # `errors` is scratch space for the posterior errors of one column
+    n, m = observations.shape
+    for j in range(m):
+        first = 0
+        while first < n and np.isnan(observations[first, j]):
+            first += 1
+        estimate, error, end = 0.0, 1.0, first
+        while end < n and not np.isnan(observations[end, j]):
+            priori_error = error + process_variance
+            gain = priori_error / (priori_error + measurement_variance)
+            estimate = estimate + gain * (observations[end, j] - estimate)
+            error = (1 - gain) * priori_error
+            estimates[end, j], errors[end] = estimate, error
+            end += 1
+        if smooth:
+            # Rauch-Tung-Striebel pass, backwards over the filtered run
+            for i in range(end - 2, first - 1, -1):
+                ratio = errors[i] / (errors[i] + process_variance)
+                estimates[i, j] = estimates[i, j] + ratio * (estimates[i + 1, j] - estimates[i, j])
+
+
+def _loops():
+    # The compiled loops, or None without Numba; compiled once per process
+    global _compiled
+    if _compiled is _UNLOADED:
+        try:
+            import numba
+        except ImportError:
+            _compiled = None
+        else:
+            jit = numba.njit(cache=True, nogil=True)
+            _compiled = {'psar': jit(_psar_loop), 'supertrend': jit(_supertrend_loop),
+                         'supertrend_flip': jit(_supertrend_flip_loop), 'fibobars': jit(_fibobars_loop),
+                         'obv': jit(_obv_loop), 'kalman': jit(_kalman_loop)}
+    return _compiled
+
+
+def _columns(values):
+    # A (time x columns) float64 view of a 1-D or 2-D input
+    array = np.ascontiguousarray(values, dtype=np.float64)
+    return array.reshape(len(array), -1)
+
+
+def _per_column(param, m):
+    return np.ascontiguousarray(np.broadcast_to(np.asarray(param, dtype=np.float64), (m,)))
+
+
+def _numba_psar(high, low, initial_af=0.0, max_af=0.2, step_af=0.02):
+    shape = np.shape(high)
+    high, low = _columns(high), _columns(low)
+    n, m = high.shape
+    psar, trend = np.full((n, m), np.nan), np.zeros((n, m), dtype=np.int64)
+    ep, af = np.full((n, m), np.nan), np.full((n, m), np.nan)
+    _loops()['psar'](high, low, _per_column(initial_af, m), _per_column(max_af, m), _per_column(step_af, m),
+                     psar, trend, ep, af)
+    return psar.reshape(shape)
+
+
+def _numba_supertrend(high, low, close, atr_period=10, factor=3, ratchet=True):
+    shape = np.shape(close)
+    high, low, close = _columns(high), _columns(low), _columns(close)
+    prev_close = values._shift(close)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    average = values._rolling_mean(tr, atr_period)
+    hl2 = (high + low) / 2
+    upper_band = hl2 + factor * average
+    lower_band = hl2 - factor * average
+    line = np.full(close.shape, np.nan)
+    if ratchet:
+        final_upper, final_lower = np.full(close.shape, np.nan), np.full(close.shape, np.nan)
+        direction = np.zeros(close.shape, dtype=np.int64)
+        _loops()['supertrend'](close, upper_band, lower_band, final_upper, final_lower, line, direction)
+    else:
+        _loops()['supertrend_flip'](close, upper_band, lower_band, line)
+    return line.reshape(shape)
+
+
+def _numba_fibobars(ha_open, ha_high, ha_low, ha_close, period=14, fibo_level=0.618):
+    shape = np.shape(ha_close)
+    close = _columns(ha_close)
+    highest = values._rolling(_columns(ha_high), period, 'max')
+    lowest = values._rolling(_columns(ha_low), period, 'min')
+    trend = np.zeros(close.shape, dtype=np.int64)
+    _loops()['fibobars'](highest, lowest, close, _columns(ha_open), period,
+                         _per_column(fibo_level, close.shape[1]), trend)
+    return trend.reshape(shape)
+
+
+def _numba_obv(close, volume):
+    shape = np.shape(close)
+    close = _columns(close)
+    obv = np.empty(close.shape)
+    _loops()['obv'](close, _columns(volume), obv)
+    return obv.reshape(shape)
+
+
+def _numba_kalman_filter(values, process_variance=1e-1, measurement_variance=1, smooth=False):
+    shape = np.shape(values)
+    observations = _columns(values)
+    estimates = np.full(observations.shape, np.nan)
+    _loops()['kalman'](observations, float(process_variance), float(measurement_variance), bool(smooth),
+                       estimates, np.empty(len(observations)))
+    return estimates.reshape(shape)
+
+
+# One indicator across the backends. `fields` are the input columns, passed in that
+# order to the `values` function of the same name and to `numba`; `pandas` takes the
+# DataFrame (or panel) and the same parameters, and returns the same outputs.
+Implementation = namedtuple('Implementation', ['fields', 'pandas', 'numba'])
+
+_OHLC = ('open', 'high', 'low', 'close')
+_HA = ('ha_open', 'ha_high', 'ha_low', 'ha_close')
+
+IMPLEMENTATIONS = {
+    'supertrend': Implementation(
+        ('high', 'low', 'close'),
+        lambda d, atr_period=10, factor=3, ratchet=True:
+            calculate_supertrend(_shallow(d), atr_period, factor, ratchet)['supertrend_l'],
+        _numba_supertrend),
+    'psar': Implementation(('high', 'low'), lambda d, *a, **k: calculate_psar(_shallow(d), *a, **k)['PSAR'],
+                           _numba_psar),
+    'fibobars': Implementation(_HA, lambda d, period=14, fibo_level=0.618: calculate_fibobars(d, period, fibo_level),
+                               _numba_fibobars),
+    'kalman_filter': Implementation(('close',), lambda d, *a, **k: kalman_filter(d, 'close', *a, **k),
+                                    _numba_kalman_filter),
+    'obv': Implementation(('close', 'volume'), lambda d: calculate_obv(d), _numba_obv),
+    'heikin_ashi': Implementation(_OHLC, lambda d: tuple(calculate_heikin_ashi(_shallow(d))[f] for f in _HA), None),
+    'thma': Implementation(('close',), lambda d, period: thma(d['close'], period), None),
+    'hma': Implementation(('close',), lambda d, period: hma(d['close'], period), None),
+    'wma': Implementation(('close',), lambda d, period: wma(d['close'], period), None),
+    'adx': Implementation(('high', 'low', 'close'), lambda d, *a, **k: calculate_adx(_shallow(d), *a, **k)['ADX'],
+                          None),
+    'aroon': Implementation(
+        ('high', 'low'),
+        lambda d, period=14: (lambda r: (r['Aroon_Up'], r['Aroon_Down']))(calculate_aroon(_shallow(d), period)),
+        None),
+    'atr': Implementation(('high', 'low', 'close'), lambda d, window=14: calculate_atr(d, window), None),
+    'true_range': Implementation(('high', 'low', 'close'),
+                                 lambda d: calculate_true_range(d['high'], d['low'], d['close']), None),
+    'bbp': Implementation(('high', 'low', 'close'), lambda d, *a, **k: calculate_bbp(_shallow(d), *a, **k)['BBP'],
+                          None),
+    'bollinger_bands': Implementation(('close',), lambda d, *a, **k: calculate_bollinger_bands(d, *a, **k), None),
+    'coppock_curve': Implementation(
+        ('close',), lambda d, *a, **k: calculate_coppock_curve(_shallow(d), *a, **k)['CoppockCurve'], None),
+    'dirmov': Implementation(('high', 'low'), lambda d, length=14: calculate_dirmov(d['high'], d['low'], length),
+                             None),
+    'donchian': Implementation(('high', 'low'), lambda d, period=20: calculate_donchian(d, period), None),
+    'ema': Implementation(('close',), lambda d, period: calculate_ema(d, 'close', period), None),
+    'ichimoku': Implementation(
+        ('high', 'low'),
+        lambda d, conversion_periods=9, base_periods=26, lagging_span2_periods=52:
+            calculate_ichimoku(d, conversion_periods, base_periods, lagging_span2_periods),
+        None),
+    'kairi_relative_index': Implementation(('ha_close',), lambda d, length=14: kairi_relative_index(d, length), None),
+    'kvo': Implementation(('high', 'low', 'close', 'volume'),
+                          lambda d, *a, **k: calculate_kvo(_shallow(d), *a, **k)['KVO'], None),
+    'macd': Implementation(('close',), lambda d, *a, **k: calculate_macd(d, *a, **k), None),
+    'mass_index': Implementation(('ha_high', 'ha_low'), lambda d, *a, **k: mass_index(d, *a, **k), None),
+    'percentage_oscillator': Implementation(
+        ('close',), lambda d, *a, **k: calculate_percentage_oscillator(_shallow(d), *a, **k)['PO'], None),
+    'rsi': Implementation(('close',), lambda d, length=14: calculate_rsi(d, length), None),
+    'sma': Implementation(('close',), lambda d, period=14: calculate_sma(_shallow(d), 'close', period)[f'SMA_{period}'],
+                          None),
+    'stochastic': Implementation(('high', 'low', 'close'),
+                                 lambda d, length=14, smoothing=3: calculate_stochastic(d, length, smoothing), None),
+}
+
+
+def set_backend(name):
+    """
+    Sets the backend `compute` uses when a call does not name one.
+
+    Parameters:
+    ----------
+    name : str
+        'pandas', 'numpy' or 'numba' (the default: compiled loops where available,
+        otherwise NumPy).
+
+    Returns:
+    -------
+    str
+        The previous backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'; expected one of {BACKENDS}.")
+    previous = _backend.get()
+    _backend.set(name)
+    return previous
+
+
+def get_backend():
+    """Returns the backend `compute` uses when a call does not name one."""
+    return _backend.get()
+
+
+@contextlib.contextmanager
+def use_backend(name):
+    """
+    Context manager selecting the backend for the calls made inside it (in the
+    current thread or task only).
+
+    Example Usage:
+    --------------
+    ```python
+    with use_backend('pandas'):
+        line = compute('supertrend', data, 10, 3)
+    ```
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'; expected one of {BACKENDS}.")
+    token = _backend.set(name)
+    try:
+        yield
+    finally:
+        _backend.reset(token)
+
+
+def resolve_backend(name, backend=None):
+    """
+    Returns the backend that runs indicator `name` when `backend` (default: the
+    current one) is requested, after the numba -> numpy -> pandas fallback.
+    """
+    if name not in IMPLEMENTATIONS:
+        raise KeyError(f"Unknown indicator '{name}'.")
+    backend = backend or _backend.get()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'; expected one of {BACKENDS}.")
+    for candidate in _FALLBACK[backend]:
+        if candidate == 'numba' and (IMPLEMENTATIONS[name].numba is None or _loops() is None):
+            continue
+        return candidate
+
+
+def _frame(data, fields, needed):
+    # The pandas functions take a DataFrame or a panel of DataFrames; other inputs
+    # are wrapped around their field arrays
+    if isinstance(data, pd.DataFrame) and all(field in data for field in needed):
+        return data
+    if isinstance(data, dict) and all(isinstance(data.get(field), pd.DataFrame) for field in needed):
+        return data
+    like = data if isinstance(data, (pd.Series, pd.DataFrame)) else None
+    if isinstance(data, dict):
+        like = next((v for v in data.values() if isinstance(v, (pd.Series, pd.DataFrame))), None)
+    subset = {field: fields[field] for field in needed}
+    if fields[needed[0]].ndim == 2:
+        return as_panel(subset, index=None if like is None else like.index,
+                        columns=like.columns if isinstance(like, pd.DataFrame) else None)
+    return pd.DataFrame(subset, index=None if like is None else like.index, copy=False)
+
+
+@profiled
+def compute(name, data, *args, backend=None, columns=None, **kwargs):
+    """
+    Computes an indicator on the selected backend.
+
+    Parameters:
+    ----------
+    name : str
+        A key of `IMPLEMENTATIONS` ('supertrend', 'psar', 'rsi', ...).
+    data : DataFrame, dict, numpy.ndarray, structured array or pyarrow Table
+        OHLCV input in any form `adapters.as_fields` accepts: a DataFrame, a panel
+        (see `panel.as_panel`), a dict of 1-D or 2-D arrays, ... Its fields are read
+        without copying. Indicators on Heikin-Ashi candles ('fibobars',
+        'mass_index', 'kairi_relative_index') read the 'ha_*' fields.
+    *args, **kwargs
+        The indicator's parameters, named as in the `values` function.
+    backend : str, optional
+        'pandas', 'numpy' or 'numba'. Default is the current backend (see
+        `set_backend`). Falls back to the next backend along numba -> numpy ->
+        pandas when the requested one does not cover the indicator or is not
+        installed.
+    columns : dict, list or str, optional
+        Maps the input's names to fields; see `adapters.as_fields`.
+
+    Returns:
+    -------
+    The outputs of the `values` function in the input's container type (see
+    `adapters.wrap_as`): Series for a DataFrame, DataFrames for a panel, arrays for
+    arrays, pyarrow Arrays for Arrow; a tuple for several outputs.
+
+    Example Usage:
+    --------------
+    ```python
+    line = compute('supertrend', data, 10, 3)                   # Numba if installed
+    sar = compute('psar', panel, max_af=0.3, backend='numpy')
+    macd_line, signal_line = compute('macd', data, backend='pandas')
+    rsi = compute('rsi', arrow_table, 14, columns={'px_last': 'close'})     # pyarrow Array
+    ```
+    """
+    implementation = IMPLEMENTATIONS.get(name)
+    chosen = resolve_backend(name, backend)
+    fields = as_fields(data, columns)
+    missing = [field for field in implementation.fields if field not in fields]
+    if missing:
+        raise KeyError(f"Indicator '{name}' needs the fields {missing}.")
+    with span(f'{name} [{chosen}]', fields[implementation.fields[-1]]):
+        if chosen == 'pandas':
+            result = implementation.pandas(_frame(data, fields, implementation.fields), *args, **kwargs)
+            result = tuple(np.asarray(output) for output in result) if isinstance(result, tuple) else np.asarray(result)
+        else:
+            func = implementation.numba if chosen == 'numba' else getattr(values, name)
+            result = func(*(fields[field] for field in implementation.fields), *args, **kwargs)
+    return wrap_as(result, data)
+
+
+def check_parity(names=None, data=None, bars=5_000, symbols=1, seed=0, tolerance=1e-9):
+    """
+    Checks that every backend agrees with the pandas reference.
+
+    Each indicator runs with its default parameters on every backend and each
+    output is compared element by element with the pandas one. Errors are scaled by
+    the largest magnitude of the reference output, as in
+    `benchmark.float32_accuracy`.
+
+    Parameters:
+    ----------
+    names : iterable of str, optional
+        Keys of `IMPLEMENTATIONS`. Default is all of them.
+    data : pandas.DataFrame or dict, optional
+        Input with OHLCV and 'ha_*' fields. Default is `benchmark.synthetic_ohlcv`
+        of `bars`, `symbols` and `seed`.
+    tolerance : float, optional
+        Largest allowed scaled error. Default is 1e-9.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per indicator, backend and output with the backend that actually
+        ran (after fallback), 'max_abs_error', 'max_scaled_error', 'mismatched'
+        (elements beyond the tolerance, or NaN in only one of the two) and 'ok'.
+    """
+    if data is None:
+        from .benchmark import synthetic_ohlcv
+        data = synthetic_ohlcv(bars, symbols, seed)
+    defaults = {'thma': (14,), 'hma': (14,), 'wma': (14,), 'ema': (20,)}
+    rows = []
+    for name in names or IMPLEMENTATIONS:
+        args = defaults.get(name, ())
+        reference = compute(name, data, *args, backend='pandas')
+        reference = reference if isinstance(reference, tuple) else (reference,)
+        for backend in BACKENDS[1:]:
+            result = compute(name, data, *args, backend=backend)
+            result = result if isinstance(result, tuple) else (result,)
+            for k, (expected, actual) in enumerate(zip(reference, result)):
+                expected = np.asarray(expected, dtype=np.float64)
+                actual = np.asarray(actual, dtype=np.float64)
+                with np.errstate(invalid='ignore'):
+                    error = np.abs(actual - expected)
+                finite = np.isfinite(error).any()
+                scale = np.nanmax(np.abs(expected)) if np.isfinite(expected).any() else 1.0
+                scale = scale or 1.0
+                mismatched = (np.isnan(expected) != np.isnan(actual)) | (error > tolerance * scale)
+                rows.append({'case': name, 'backend': backend, 'output': k,
+                             'ran': resolve_backend(name, backend),
+                             'max_abs_error': np.nanmax(error) if finite else 0.0,
+                             'max_scaled_error': np.nanmax(error) / scale if finite else 0.0,
+                             'mismatched': int(mismatched.sum()), 'ok': not mismatched.any()})
+    return pd.DataFrame(rows).set_index(['case', 'backend', 'output'])
@@ -0,0 +1,245 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .heikin_ashi import calculate_heikin_ashi
+from .kernels import fibobars_kernel, psar_kernel, supertrend_kernel
+from .profiling import profiled, span
+from .sweep import sweep_macd
+
+# Signals are target positions (1 long, -1 short, 0 flat, or any fraction) decided
+# on a bar's close and filled at the next bar's open, so every strategy's return is
+# its held position times the open-to-open return. Each change of position pays
+# `fee + slippage` per unit traded. Strategies (columns) are evaluated together in
+# blocks of columns small enough for the temporaries to stay in cache.
+
+BacktestResult = namedtuple('BacktestResult', ['equity', 'stats'])
+
+# Cells (rows x columns) per block of the PnL pass
+_BLOCK_CELLS = 1 << 16
+# Bytes held per signal cell while a grid batch is built and evaluated
+_CELL_BYTES = 10 * 8
+
+
+def _columns_per(rows, cells):
+    return max(1, int(cells // max(rows, 1)))
+
+
+def _run(open_price, signals, fee, slippage, periods_per_year, allow_short, equity_out):
+    # open_price: (T, 1) or (T, k); signals: (T, k). Returns a dict of stats arrays.
+    held = np.zeros(signals.shape)
+    held[1:] = np.nan_to_num(signals[:-1])
+    if not allow_short:
+        np.maximum(held, 0, out=held)
+    traded = np.abs(np.diff(held, axis=0, prepend=0.0))
+    returns = np.zeros(open_price.shape)
+    np.divide(open_price[1:], open_price[:-1], out=returns[1:])
+    returns[1:] -= 1
+    # The held position earns the return to the next open; the last bar has none
+    returns = np.roll(returns, -1, axis=0)
+    returns[-1] = 0.0
+    net = np.nan_to_num(held * returns) - traded * (fee + slippage)
+    equity = np.cumprod(1 + net, axis=0)
+    if equity_out is not None:
+        equity_out[...] = equity
+    rows = len(net)
+    peak = np.maximum.accumulate(equity, axis=0)
+    std = net.std(axis=0, ddof=1) if rows > 1 else np.full(net.shape[1], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, net.mean(axis=0) / std * np.sqrt(periods_per_year), np.nan)
+        annual = np.where(equity[-1] > 0, equity[-1] ** (periods_per_year / rows) - 1, -1.0)
+    return {'total_return': equity[-1] - 1, 'annual_return': annual, 'sharpe': sharpe,
+            'max_drawdown': (1 - equity / peak).max(axis=0),
+            'turnover': traded.sum(axis=0) / rows * periods_per_year,
+            'trades': np.count_nonzero(traded, axis=0)}
+
+
+@profiled
+def backtest(open_price, signals, fee=0.0, slippage=0.0, periods_per_year=252, allow_short=True,
+             keep_equity=True):
+    """
+    Turns a (time x strategies) signal matrix into equity curves and summary stats.
+
+    Parameters:
+    ----------
+    open_price : pandas.Series or array-like
+        Open prices, 1-D (shared by every strategy) or 2-D with one column per strategy.
+    signals : pandas.DataFrame or array-like
+        Target position per bar and strategy, decided at the bar's close and filled
+        at the next bar's open. NaN means flat.
+    fee : float, optional
+        Fee as a fraction of the traded notional (0.0005 = 5 bps). Default is 0.
+    slippage : float, optional
+        Adverse fill price move as a fraction of the open. Default is 0.
+    periods_per_year : float, optional
+        Bars per year, to annualize return, Sharpe and turnover. Default is 252.
+    allow_short : bool, optional
+        If False, negative signals are flat. Default is True.
+    keep_equity : bool, optional
+        Return the equity curves; with False only the stats are kept. Default is True.
+
+    Returns:
+    -------
+    BacktestResult
+        `equity`: DataFrame (time x strategies) of equity starting at 1, or None.
+        `stats`: DataFrame indexed by strategy with 'total_return', 'annual_return',
+        'sharpe', 'max_drawdown', 'turnover' (annualized units traded) and 'trades'.
+
+    Example Usage:
+    --------------
+    ```python
+    macd_line, signal_line = calculate_macd(data)
+    signals = pd.DataFrame({'macd': np.sign(macd_line - signal_line)})
+    result = backtest(data['open'], signals, fee=0.0005, slippage=0.0002)
+    result.stats.loc['macd', 'sharpe']
+    ```
+    """
+    frame = signals if isinstance(signals, pd.DataFrame) else pd.DataFrame(np.asarray(signals))
+    values = frame.to_numpy(dtype=np.float64)
+    prices = np.asarray(open_price, dtype=np.float64)
+    prices = prices[:, None] if prices.ndim == 1 else prices
+    if len(prices) != len(values):
+        raise ValueError("open_price and signals must have the same number of rows.")
+    equity = np.empty(values.shape) if keep_equity else None
+    width = _columns_per(len(values), _BLOCK_CELLS)
+    parts = []
+    for start in range(0, values.shape[1], width):
+        columns = slice(start, start + width)
+        parts.append(_run(prices if prices.shape[1] == 1 else prices[:, columns], values[:, columns], fee,
+                          slippage, periods_per_year, allow_short,
+                          equity[:, columns] if keep_equity else None))
+    stats = pd.DataFrame({key: np.concatenate([part[key] for part in parts]) if parts else []
+                          for key in ('total_return', 'annual_return', 'sharpe', 'max_drawdown', 'turnover',
+                                      'trades')}, index=frame.columns)
+    if keep_equity:
+        equity = pd.DataFrame(equity, index=frame.index, columns=frame.columns, copy=False)
+    return BacktestResult(equity, stats)
+
+
+# Signal builders: each evaluates a whole batch of parameter tuples at once and
+# returns a (time x batch) DataFrame of positions whose columns are the tuples.
+
+def supertrend_signals(data, grid):
+    """Supertrend direction (1 up, -1 down, 0 warm-up) for (atr_period, factor) pairs."""
+    grid = [tuple(params) for params in grid]
+    high, low, close = data['high'], data['low'], data['close']
+    prev_close = close.shift(1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    atrs = {period: tr.rolling(window=period).mean().to_numpy() for period in sorted({p[0] for p in grid})}
+    # One kernel pass over every pair: column j has its own ATR and factor
+    atr = np.column_stack([atrs[p[0]] for p in grid])
+    factors = np.array([p[1] for p in grid], dtype=np.float64)
+    hl2 = ((high + low) / 2).to_numpy()[:, None]
+    closes = np.broadcast_to(close.to_numpy(dtype=np.float64)[:, None], atr.shape)
+    _, _, _, direction = supertrend_kernel(closes, hl2 + factors * atr, hl2 - factors * atr)
+    columns = pd.MultiIndex.from_tuples(grid, names=['atr_period', 'factor'])
+    return pd.DataFrame(direction.astype(np.int8), index=close.index, columns=columns)
+
+
+def psar_signals(data, grid):
+    """PSAR `Trend` (1 up, -1 down) for (initial_af, max_af, step_af) triples."""
+    grid = [tuple(params) for params in grid]
+    params = np.array(grid, dtype=np.float64).reshape(-1, 3)
+    shape = (len(data['high']), len(grid))
+    high = np.broadcast_to(np.asarray(data['high'], dtype=np.float64)[:, None], shape)
+    low = np.broadcast_to(np.asarray(data['low'], dtype=np.float64)[:, None], shape)
+    _, trend, _, _ = psar_kernel(high, low, params[:, 0], params[:, 1], params[:, 2])
+    columns = pd.MultiIndex.from_tuples(grid, names=['initial_af', 'max_af', 'step_af'])
+    return pd.DataFrame(trend.astype(np.int8), index=data['high'].index, columns=columns)
+
+
+def fibobars_signals(data, grid):
+    """
+    Fibonacci Bars trend (1 up, -1 down, 0 warm-up) for (period, fibo_level) pairs.
+    `data` holds OHLC; the Heikin-Ashi candles are built once.
+    """
+    grid = [tuple(params) for params in grid]
+    ha = data if 'ha_close' in data else calculate_heikin_ashi(data)
+    parts = {}
+    for period in sorted({p[0] for p in grid}):
+        levels = np.array([p[1] for p in grid if p[0] == period], dtype=np.float64)
+        shape = (len(ha['ha_close']), len(levels))
+
+        def columns(values):
+            return np.broadcast_to(np.asarray(values, dtype=np.float64)[:, None], shape)
+
+        trend = fibobars_kernel(columns(ha['ha_high'].rolling(window=period).max()),
+                                columns(ha['ha_low'].rolling(window=period).min()),
+                                columns(ha['ha_close']), columns(ha['ha_open']), period, levels)
+        for j, level in enumerate(levels.tolist()):
+            parts[(period, level)] = trend[:, j]
+    trend = np.column_stack([parts[(params[0], float(params[1]))] for params in grid]).astype(np.int8)
+    columns = pd.MultiIndex.from_tuples(grid, names=['period', 'fibo_level'])
+    return pd.DataFrame(trend, index=ha['ha_close'].index, columns=columns)
+
+
+def macd_signals(data, grid):
+    """Long above the signal line, short below, for (short, long, signal) window triples."""
+    macd_line, signal_line = sweep_macd(data, grid)
+    return np.sign(macd_line - signal_line).fillna(0).astype(np.int8)
+
+
+SIGNALS = {
+    'supertrend': supertrend_signals,
+    'psar': psar_signals,
+    'fibobars': fibobars_signals,
+    'macd': macd_signals,
+}
+
+
+@profiled
+def backtest_grid(data, signals, grid, fee=0.0, slippage=0.0, periods_per_year=252, allow_short=True,
+                  keep_equity=False, max_bytes=1 << 29):
+    """
+    Backtests a strategy over a parameter grid, a memory-bounded batch at a time.
+
+    Signals for each batch of parameter tuples are built in one vectorized pass,
+    backtested, and released before the next batch, so a 10,000-combination sweep
+    needs memory for one batch only.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame
+        OHLC(V) bars; fills use its 'open'.
+    signals : str or callable
+        A key of `SIGNALS` ('supertrend', 'psar', 'fibobars', 'macd'), or a function
+        `(data, grid) -> DataFrame` of positions with one column per tuple.
+    grid : iterable of tuple
+        Parameter tuples, in the order the signal builder takes them.
+    fee, slippage, periods_per_year, allow_short
+        See `backtest`.
+    keep_equity : bool, optional
+        Also return every equity curve (time x combinations). Default is False.
+    max_bytes : int, optional
+        Approximate memory for one batch of signals and its temporaries. Default
+        is 512 MiB.
+
+    Returns:
+    -------
+    BacktestResult
+        Stats indexed by parameter tuple (and equity curves if requested).
+
+    Example Usage:
+    --------------
+    ```python
+    from itertools import product
+    grid = list(product(range(5, 55), np.round(np.arange(1.0, 5.0, 0.02), 2)))   # 10,000 pairs
+    result = backtest_grid(data, 'supertrend', grid, fee=0.0005, slippage=0.0002)
+    result.stats.sort_values('sharpe', ascending=False).head()
+    ```
+    """
+    builder = SIGNALS[signals] if isinstance(signals, str) else signals
+    grid = [tuple(params) for params in grid]
+    width = _columns_per(len(data), max_bytes // _CELL_BYTES)
+    stats, curves = [], []
+    for start in range(0, len(grid), width):
+        with span(f'signals.{getattr(builder, "__name__", "builder")}', data):
+            batch = builder(data, grid[start:start + width])
+        result = backtest(data['open'], batch, fee, slippage, periods_per_year, allow_short, keep_equity)
+        stats.append(result.stats)
+        if keep_equity:
+            curves.append(result.equity)
+        del batch
+    equity = pd.concat(curves, axis=1) if keep_equity else None
+    return BacktestResult(equity, pd.concat(stats))
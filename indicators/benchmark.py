@@ -0,0 +1,524 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from . import _SUBMODULES, values
+from .adx import calculate_adx
+from .backends import IMPLEMENTATIONS, check_parity
+from .calculate_aroon import calculate_aroon
+from .calculate_atr import calculate_atr
+from .calculate_bbp import calculate_bbp
+from .calculate_bollinger_bands import calculate_bollinger_bands
+from .calculate_coppock_curve import calculate_coppock_curve
+from .calculate_dirmov import calculate_dirmov
+from .calculate_donchian import calculate_donchian
+from .calculate_ema import calculate_ema
+from .calculate_ichimoku import calculate_ichimoku
+from .calculate_kairi_relative_index import kairi_relative_index
+from .calculate_kvo import calculate_kvo
+from .calculate_linreg_slope import rolling_linreg
+from .calculate_macd import calculate_macd
+from .calculate_mass_index import mass_index
+from .calculate_obv import calculate_obv
+from .calculate_psar import calculate_psar
+from .calculate_sma import calculate_sma
+from .fibobars import calculate_fibobars
+from .heikin_ashi import calculate_heikin_ashi
+from .hma import hma, wma
+from .kalman_filter import kalman_filter
+from .kernels import heikin_ashi_kernel
+from .panel import as_panel
+from .percentage_oscillator import calculate_percentage_oscillator
+from .rsi import calculate_rsi
+from .stochastic_oscillator import calculate_stochastic
+from .supertrend import calculate_supertrend
+from .thma import thma
+
+SIZES = (1_000, 100_000, 1_000_000, 10_000_000)
+PANEL_SYMBOLS = (1, 100, 5_000)
+PANEL_BARS = 1_000
+# Allowed wall time of a bare `import indicators` in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 0.05
+# Largest float32 arithmetic error allowed by `--accuracy`, scaled as in
+# `float32_accuracy`. Outputs that compare prices may instead be off by more on the
+# few bars where float32 rounding ties two prices or moves one across a band.
+FLOAT32_TOLERANCE = 5e-6
+PRICE_COMPARING = ('supertrend', 'psar', 'fibobars', 'obv', 'adx', 'dirmov', 'aroon')
+
+# name -> function of the data (a DataFrame or a panel) with the usual parameters
+CASES = {
+    'supertrend': lambda d: calculate_supertrend(d, 10, 3),
+    'psar': calculate_psar,
+    'fibobars': lambda d: calculate_fibobars(d, 14, 0.618),
+    'heikin_ashi': calculate_heikin_ashi,
+    'thma': lambda d: thma(d['close'], 14),
+    'hma': lambda d: hma(d['close'], 14),
+    'wma': lambda d: wma(d['close'], 14),
+    'kalman_filter': lambda d: kalman_filter(d, 'close'),
+    'adx': calculate_adx,
+    'aroon': calculate_aroon,
+    'atr': calculate_atr,
+    'bbp': calculate_bbp,
+    'bollinger_bands': calculate_bollinger_bands,
+    'coppock_curve': calculate_coppock_curve,
+    'dirmov': lambda d: calculate_dirmov(d['high'], d['low'], 14),
+    'donchian': lambda d: calculate_donchian(d, 20),
+    'ema': lambda d: calculate_ema(d, 'close', 20),
+    'ichimoku': lambda d: calculate_ichimoku(d, 9, 26, 52),
+    'kairi_relative_index': kairi_relative_index,
+    'kvo': calculate_kvo,
+    'linreg': lambda d: rolling_linreg(d['close'], 14),
+    'macd': calculate_macd,
+    'mass_index': mass_index,
+    'obv': calculate_obv,
+    'percentage_oscillator': calculate_percentage_oscillator,
+    'rsi': lambda d: calculate_rsi(d, 14),
+    'sma': calculate_sma,
+    'stochastic': lambda d: calculate_stochastic(d, 14, 3),
+}
+
+# name -> function of (data, dtype) over the values-only API, for the float32 accuracy report
+VALUES_CASES = {
+    'supertrend': lambda d, t: values.supertrend(d['high'], d['low'], d['close'], 10, 3, dtype=t),
+    'psar': lambda d, t: values.psar(d['high'], d['low'], dtype=t),
+    'fibobars': lambda d, t: values.fibobars(d['ha_open'], d['ha_high'], d['ha_low'], d['ha_close'], 14, 0.618,
+                                             dtype=t),
+    'heikin_ashi': lambda d, t: values.heikin_ashi(d['open'], d['high'], d['low'], d['close'], dtype=t),
+    'thma': lambda d, t: values.thma(d['close'], 14, dtype=t),
+    'hma': lambda d, t: values.hma(d['close'], 14, dtype=t),
+    'wma': lambda d, t: values.wma(d['close'], 14, dtype=t),
+    'kalman_filter': lambda d, t: values.kalman_filter(d['close'], dtype=t),
+    'adx': lambda d, t: values.adx(d['high'], d['low'], d['close'], dtype=t),
+    'aroon': lambda d, t: values.aroon(d['high'], d['low'], dtype=t),
+    'atr': lambda d, t: values.atr(d['high'], d['low'], d['close'], dtype=t),
+    'bbp': lambda d, t: values.bbp(d['high'], d['low'], d['close'], dtype=t),
+    'bollinger_bands': lambda d, t: values.bollinger_bands(d['close'], dtype=t),
+    'coppock_curve': lambda d, t: values.coppock_curve(d['close'], dtype=t),
+    'dirmov': lambda d, t: values.dirmov(d['high'], d['low'], 14, dtype=t),
+    'donchian': lambda d, t: values.donchian(d['high'], d['low'], 20, dtype=t),
+    'ema': lambda d, t: values.ema(d['close'], 20, dtype=t),
+    'ichimoku': lambda d, t: values.ichimoku(d['high'], d['low'], dtype=t),
+    'kairi_relative_index': lambda d, t: values.kairi_relative_index(d['ha_close'], dtype=t),
+    'kvo': lambda d, t: values.kvo(d['high'], d['low'], d['close'], d['volume'], dtype=t),
+    'macd': lambda d, t: values.macd(d['close'], dtype=t),
+    'mass_index': lambda d, t: values.mass_index(d['ha_high'], d['ha_low'], dtype=t),
+    'obv': lambda d, t: values.obv(d['close'], d['volume'], dtype=t),
+    'percentage_oscillator': lambda d, t: values.percentage_oscillator(d['close'], dtype=t),
+    'rsi': lambda d, t: values.rsi(d['close'], 14, dtype=t),
+    'sma': lambda d, t: values.sma(d['close'], dtype=t),
+    'stochastic': lambda d, t: values.stochastic(d['high'], d['low'], d['close'], 14, 3, dtype=t),
+}
+
+
+def synthetic_ohlcv(bars, symbols=1, seed=0):
+    """
+    Generates a deterministic random-walk OHLCV history, with Heikin-Ashi columns.
+
+    The same (bars, symbols, seed) always gives the same data, so timings and
+    outputs are comparable across runs and machines.
+
+    Parameters:
+    ----------
+    bars : int
+        Number of bars.
+    symbols : int, optional
+        Number of symbols. Default is 1.
+    seed : int, optional
+        Random seed. Default is 0.
+
+    Returns:
+    -------
+    pandas.DataFrame or dict
+        A DataFrame with 'open', 'high', 'low', 'close', 'volume' and 'ha_*' columns
+        for one symbol, otherwise a panel (field -> time x symbols DataFrame).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (bars, symbols)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, shape), axis=0))
+    open_ = close * np.exp(rng.normal(0, 0.003, shape))
+    high = np.maximum(open_, close) * (1 + rng.exponential(0.004, shape))
+    low = np.minimum(open_, close) * (1 - rng.exponential(0.004, shape))
+    volume = rng.lognormal(10, 1, shape).round()
+    fields = {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+
+    ha_open, ha_high, ha_low, ha_close = heikin_ashi_kernel(open_, high, low, close)
+    fields.update(ha_open=ha_open, ha_high=ha_high, ha_low=ha_low, ha_close=ha_close)
+
+    if symbols == 1:
+        return pd.DataFrame({field: values[:, 0] for field, values in fields.items()})
+    return as_panel(fields, columns=[f'S{i}' for i in range(symbols)])
+
+
+def _fresh(data):
+    # Indicators that add columns must not see the previous run's columns
+    return data.copy(deep=False) if isinstance(data, pd.DataFrame) else dict(data)
+
+
+def time_case(func, data, repeat=3, memory=True):
+    """
+    Times one indicator call on the given data.
+
+    Parameters:
+    ----------
+    func : callable
+        Called as `func(data)`.
+    data : pandas.DataFrame or dict
+        The input, shallow-copied before every call.
+    repeat : int, optional
+        Number of timed calls; the fastest is kept. Default is 3.
+    memory : bool, optional
+        Also run once under tracemalloc to measure the peak allocation. Default is True.
+
+    Returns:
+    -------
+    dict
+        'seconds' (best wall time) and 'peak_mb' (None if `memory` is False).
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        fresh = _fresh(data)
+        started = time.perf_counter()
+        func(fresh)
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if memory:
+        fresh = _fresh(data)
+        tracemalloc.start()
+        try:
+            func(fresh)
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return {'seconds': best, 'peak_mb': peak}
+
+
+def run_benchmarks(cases=None, sizes=SIZES, panel_symbols=PANEL_SYMBOLS, panel_bars=PANEL_BARS,
+                   repeat=3, memory=True, seed=0, log=None):
+    """
+    Times every case on single series of each size and on panels of each symbol count.
+
+    Parameters:
+    ----------
+    cases : iterable of str, optional
+        Names from `CASES`. Default is all of them.
+    sizes : iterable of int, optional
+        Bar counts for the single-symbol runs. Default is `SIZES`.
+    panel_symbols : iterable of int, optional
+        Symbol counts for the panel runs (1 runs as a one-column panel). Default is
+        `PANEL_SYMBOLS`.
+    panel_bars : int, optional
+        Bars per symbol in the panel runs. Default is `PANEL_BARS`.
+    repeat : int, optional
+        Timed calls per case; one for inputs of a million values or more. Default is 3.
+    memory : bool, optional
+        Measure peak memory. Default is True.
+    seed : int, optional
+        Seed of the synthetic data. Default is 0.
+    log : callable, optional
+        Called with a line of text after every case (e.g. `print`).
+
+    Returns:
+    -------
+    dict
+        {'meta': {...}, 'results': [{'case', 'bars', 'symbols', 'seconds',
+        'bars_per_second', 'peak_mb'}, ...]}, ready for `json.dump`.
+    """
+    cases = list(cases or CASES)
+    inputs = [(bars, 1, lambda bars=bars: synthetic_ohlcv(bars, 1, seed)) for bars in sizes]
+    inputs += [(panel_bars, symbols, lambda symbols=symbols: _as_panel(synthetic_ohlcv(panel_bars, symbols, seed)))
+               for symbols in panel_symbols]
+
+    results = []
+    for bars, symbols, make in inputs:
+        data = make()
+        count = bars * symbols
+        for name in cases:
+            timing = time_case(CASES[name], data, repeat if count < 1_000_000 else 1, memory)
+            row = {'case': name, 'bars': bars, 'symbols': symbols, 'seconds': timing['seconds'],
+                   'bars_per_second': count / timing['seconds'] if timing['seconds'] else None,
+                   'peak_mb': timing['peak_mb']}
+            results.append(row)
+            if log:
+                log(_format_row(row))
+        del data
+
+    meta = {'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': sys.version.split()[0], 'numpy': np.__version__, 'pandas': pd.__version__,
+            'platform': platform.platform(), 'seed': seed, 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def _as_panel(data):
+    # A single symbol still runs as a panel (one-column DataFrames) in the panel series
+    if isinstance(data, pd.DataFrame):
+        return {field: data[[field]].rename(columns={field: 'S0'}) for field in data}
+    return data
+
+
+def _key(row):
+    return row['case'], row['bars'], row['symbols']
+
+
+def _format_row(row):
+    peak = '' if row['peak_mb'] is None else f"{row['peak_mb']:10.1f} MB"
+    return (f"{row['case']:<22} {row['bars']:>10} x {row['symbols']:<5} {row['seconds'] * 1e3:12.2f} ms "
+            f"{row['bars_per_second'] or 0:14,.0f} bars/s {peak}")
+
+
+def float32_accuracy(cases=None, bars=100_000, symbols=1, seed=0):
+    """
+    Measures how far the float32 mode of the values-only API strays from float64.
+
+    Every case runs on the same synthetic data with `dtype=np.float64` and with
+    `dtype=np.float32`, and every output is compared element by element. Errors are
+    scaled by the largest magnitude of the float64 output, so that oscillators
+    crossing zero (MACD, KVO) are not judged by their relative error near zero.
+    Part of the error is only the rounding of the inputs to float32, which for KVO
+    grows with the sample (its money-flow multiplier divides by the bar's range, and
+    longer samples hold narrower bars); 'max_arithmetic_error' leaves it out by
+    comparing with float64 on the same rounded inputs, and does not grow with size.
+    State-machine outputs (Supertrend, PSAR, Fibobars) can take the other branch
+    when a float32 price lands on the other side of a band; `mismatched` counts those
+    bars.
+
+    Parameters:
+    ----------
+    cases : iterable of str, optional
+        Names from `VALUES_CASES`. Default is all of them.
+    bars : int, optional
+        Bars of synthetic data. Default is 100,000.
+    symbols : int, optional
+        Number of symbols (columns). Default is 1.
+    seed : int, optional
+        Seed of the synthetic data. Default is 0.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per case and output with 'max_abs_error', 'max_scaled_error',
+        'max_arithmetic_error' (scaled, against float64 on the float32-rounded
+        inputs), 'mismatched' (elements off by more than `FLOAT32_TOLERANCE` of the
+        scale, or NaN in only one of the two) and 'dtype' (that of the float32 output, as a check).
+    """
+    data = synthetic_ohlcv(bars, symbols, seed)
+    rounded = {field: data[field].astype(np.float32).astype(np.float64) for field in data}
+
+    def largest(error):
+        return np.nanmax(error) if np.isfinite(error).any() else 0.0
+
+    rows = []
+    for name in cases or VALUES_CASES:
+        reference = VALUES_CASES[name](data, np.float64)
+        exact = VALUES_CASES[name](rounded, np.float64)
+        result = VALUES_CASES[name](data, np.float32)
+        if not isinstance(reference, tuple):
+            reference, exact, result = (reference,), (exact,), (result,)
+        for k, (expected, same_inputs, actual) in enumerate(zip(reference, exact, result)):
+            error = np.abs(actual.astype(np.float64) - expected)
+            scale = np.nanmax(np.abs(expected)) if np.isfinite(expected).any() else 1.0
+            mismatched = (np.isnan(expected) != np.isnan(actual)) | (error > FLOAT32_TOLERANCE * scale)
+            rows.append({'case': name, 'output': k, 'max_abs_error': largest(error),
+                         'max_scaled_error': largest(error) / scale,
+                         'max_arithmetic_error': largest(np.abs(actual - same_inputs)) / scale,
+                         'mismatched': int(mismatched.sum()), 'dtype': str(actual.dtype)})
+    return pd.DataFrame(rows).set_index(['case', 'output'])
+
+
+def check_accuracy(report, bars, tolerance=FLOAT32_TOLERANCE):
+    """
+    Checks a `float32_accuracy` report against the documented float32 tolerance.
+
+    Parameters:
+    ----------
+    report : pandas.DataFrame
+        The output of `float32_accuracy`.
+    bars : int
+        Bars of data the report was made on.
+    tolerance : float, optional
+        Largest allowed 'max_arithmetic_error'; the outputs in `PRICE_COMPARING`
+        may instead be off by more on at most 0.1% of the bars. Default is
+        `FLOAT32_TOLERANCE`.
+
+    Returns:
+    -------
+    list of str
+        The problems found; empty if there are none.
+    """
+    problems = []
+    for (case, output), row in report.iterrows():
+        if case in PRICE_COMPARING:
+            # Price ties flipped by rounding; allowed on a few bars only
+            if row['mismatched'] > 1e-3 * bars:
+                problems.append(f"{case}[{output}] differs on {row['mismatched']} of {bars} bars")
+        elif row['max_arithmetic_error'] > tolerance:
+            problems.append(f"{case}[{output}] is off by {row['max_arithmetic_error']:.2e} "
+                            f"(tolerance {tolerance:.0e})")
+    return problems
+
+
+def import_times(modules=None, repeat=5):
+    """
+    Measures importing the package and its submodules, each in a fresh interpreter.
+
+    Parameters:
+    ----------
+    modules : iterable of str, optional
+        Module names. Default is the package followed by every submodule.
+    repeat : int, optional
+        Fresh interpreters per module; the fastest import is kept. Default is 5.
+
+    Returns:
+    -------
+    list of dict
+        'module', 'seconds', 'output' (anything written to stdout during the
+        import) and 'loaded' (which of numpy and pandas the import pulled in).
+    """
+    if modules is None:
+        modules = [__package__] + [f'{__package__}.{name}' for name in sorted(_SUBMODULES)]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    code = ("import json, sys, time\n"
+            "started = time.perf_counter()\n"
+            "import {module}\n"
+            "elapsed = time.perf_counter() - started\n"
+            "loaded = [name for name in ('numpy', 'pandas') if name in sys.modules]\n"
+            "sys.stderr.write(json.dumps([elapsed, loaded]))\n")
+    rows = []
+    for module in modules:
+        best, output, loaded = float('inf'), '', []
+        for _ in range(repeat):
+            done = subprocess.run([sys.executable, '-c', code.format(module=module)], env=env,
+                                  capture_output=True, text=True, check=True)
+            elapsed, loaded = json.loads(done.stderr.strip().splitlines()[-1])
+            best, output = min(best, elapsed), output or done.stdout
+        rows.append({'module': module, 'seconds': best, 'output': output, 'loaded': loaded})
+    return rows
+
+
+def check_imports(rows, budget=IMPORT_BUDGET_SECONDS):
+    """
+    Checks `import_times` results: the bare package import must fit the budget and
+    load neither numpy nor pandas, and no module may print while being imported.
+
+    Returns:
+    -------
+    list of str
+        The problems found; empty if there are none.
+    """
+    problems = []
+    for row in rows:
+        if row['output']:
+            problems.append(f"{row['module']} prints at import: {row['output'][:60]!r}")
+        if '.' not in row['module']:
+            if row['seconds'] > budget:
+                problems.append(f"{row['module']} takes {row['seconds'] * 1e3:.1f} ms to import "
+                                f"(budget {budget * 1e3:.1f} ms)")
+            if row['loaded']:
+                problems.append(f"{row['module']} loads {', '.join(row['loaded'])} at import")
+    return problems
+
+
+def compare(current, baseline, threshold=0.25):
+    """
+    Compares a benchmark run with a saved baseline.
+
+    Parameters:
+    ----------
+    current : dict
+        The output of `run_benchmarks`.
+    baseline : dict
+        A previous output of `run_benchmarks`.
+    threshold : float, optional
+        Allowed slowdown as a fraction of the baseline time. Default is 0.25 (25%).
+
+    Returns:
+    -------
+    list of dict
+        The cases that got slower than allowed, with 'baseline_seconds',
+        'seconds' and 'ratio'. Cases missing from the baseline are ignored.
+    """
+    reference = {_key(row): row for row in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        before = reference.get(_key(row))
+        if before and before['seconds'] and row['seconds'] > before['seconds'] * (1 + threshold):
+            regressions.append({'case': row['case'], 'bars': row['bars'], 'symbols': row['symbols'],
+                                'baseline_seconds': before['seconds'], 'seconds': row['seconds'],
+                                'ratio': row['seconds'] / before['seconds']})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the technical indicators.')
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), help='cases to run (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=float, default=SIZES, help='single-symbol bar counts')
+    parser.add_argument('--symbols', nargs='+', type=int, default=PANEL_SYMBOLS, help='panel symbol counts')
+    parser.add_argument('--panel-bars', type=int, default=PANEL_BARS, help='bars per symbol in panels')
+    parser.add_argument('--repeat', type=int, default=3, help='timed calls per case')
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak-memory measurement')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare against this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown vs. the baseline')
+    parser.add_argument('--accuracy', action='store_true',
+                        help='report the float32 deviation from float64 on the first size instead of timing')
+    parser.add_argument('--parity', action='store_true',
+                        help='check that the pandas, NumPy and Numba backends agree on the first size instead')
+    parser.add_argument('--imports', action='store_true',
+                        help='time the package and submodule imports and check the import budget instead')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET_SECONDS,
+                        help='allowed seconds for a bare package import')
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        rows = import_times(repeat=args.repeat)
+        for row in rows:
+            print(f"{row['module']:<45} {row['seconds'] * 1e3:9.1f} ms  {' '.join(row['loaded'])}")
+        problems = check_imports(rows, args.import_budget)
+        for problem in problems:
+            print(f'IMPORT {problem}')
+        return 1 if problems else 0
+
+    if args.accuracy:
+        cases = [name for name in args.cases or VALUES_CASES if name in VALUES_CASES]
+        report = float32_accuracy(cases, int(args.sizes[0]), seed=args.seed)
+        with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 120):
+            print(report)
+        problems = check_accuracy(report, int(args.sizes[0]))
+        for problem in problems:
+            print(f'ACCURACY {problem}')
+        return 1 if problems else 0
+
+    if args.parity:
+        report = check_parity(args.cases and [name for name in args.cases if name in IMPLEMENTATIONS],
+                              bars=int(args.sizes[0]), seed=args.seed)
+        with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 120):
+            print(report)
+        return 0 if report['ok'].all() else 1
+
+    results = run_benchmarks(args.cases, [int(size) for size in args.sizes], args.symbols, args.panel_bars,
+                             args.repeat, not args.no_memory, args.seed, log=print)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for row in regressions:
+            print(f"REGRESSION {row['case']} {row['bars']} x {row['symbols']}: "
+                  f"{row['baseline_seconds'] * 1e3:.2f} ms -> {row['seconds'] * 1e3:.2f} ms ({row['ratio']:.2f}x)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,19 @@
-import pandas_ta as ta
+from .profiling import profiled
+from .rolling_extremum import rolling_extremum
 
+@profiled
 def calculate_aroon(df, period=14):
     """
-    Calculates the Aroon Up and Aroon Down indicators for a given DataFrame using the pandas_ta library.
+    Calculates the Aroon Up and Aroon Down indicators for a given DataFrame.
 
     The Aroon indicator is a technical analysis tool that measures the time it takes for the 
     highest high or lowest low to occur within a specified period. It is used to identify 
     trends and assess their strength.
 
-    This implementation leverages the `pandas_ta` library for efficient computation.
+    The bars since the highest high and lowest low over the last `period + 1` bars come
+    from the O(n) rolling extremum engine, so the cost does not grow with `period`. When
+    the extreme is hit more than once in the window, the most recent bar counts (as in
+    pandas_ta). Panels (time x symbols DataFrames per field) are supported.
 
     Parameters:
     ----------
@@ -26,18 +31,11 @@ def calculate_aroon(df, period=14):
         - 'Aroon_Up': Strength of the upward trend (0 to 100).
         - 'Aroon_Down': Strength of the downward trend (0 to 100).
 
-    Requirements:
-    -------------
-    Install the `pandas_ta` library if not already installed:
-    ```
-    pip install pandas-ta
-    ```
-
     Example Usage:
     --------------
     ```python
     import pandas as pd
-    from your_script import calculate_aroon
+    from indicators.calculate_aroon import calculate_aroon
 
     # Example DataFrame
     data = pd.DataFrame({
@@ -46,18 +44,14 @@ def calculate_aroon(df, period=14):
     })
 
     # Calculate Aroon indicators
-    result = calculate_aroon(data, period=14)
+    result = calculate_aroon(data, period=3)
     print(result)
     ```
     """
-    # Calculate Aroon Up and Down using pandas_ta
-    aroon = ta.aroon(df['high'], df['low'], length=period)
-
-    # Debug: Print the Aroon values (optional)
-    print(aroon)
+    _, periods_from_hh = rolling_extremum(df['high'], period + 1, 'max', positions=True)
+    _, periods_from_ll = rolling_extremum(df['low'], period + 1, 'min', positions=True)
 
-    # Add Aroon Up and Down values to the DataFrame
-    df['Aroon_Up'] = aroon['AROONU_14']
-    df['Aroon_Down'] = aroon['AROOND_14']
+    df['Aroon_Up'] = 100 * (period - periods_from_hh) / period
+    df['Aroon_Down'] = 100 * (period - periods_from_ll) / period
 
     return df
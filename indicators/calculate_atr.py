@@ -0,0 +1,56 @@
+import numpy as np
+
+from .profiling import profiled
+
+@profiled
+def calculate_true_range(high, low, close):
+    """
+    Calculate the True Range (TR).
+
+    TR is the greatest of the current high-low range and the distances from the
+    previous close to the current high and low. On the first bar, where there is
+    no previous close, it is the high-low range.
+
+    Parameters:
+    ----------
+    high : pandas.Series or pandas.DataFrame
+        High prices (a DataFrame holds one column per symbol).
+    low : pandas.Series or pandas.DataFrame
+        Low prices.
+    close : pandas.Series or pandas.DataFrame
+        Close prices.
+
+    Returns:
+    -------
+    tr : pandas.Series or pandas.DataFrame
+        The True Range values.
+    """
+    prev_close = close.shift(1)
+    tr1 = high - low
+    tr2 = abs(high - prev_close)
+    tr3 = abs(low - prev_close)
+    return np.fmax(tr1, np.fmax(tr2, tr3))
+
+@profiled
+def calculate_atr(data, window=14):
+    """
+    Calculate the Average True Range (ATR).
+
+    ATR is a measure of market volatility.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame or dict
+        A DataFrame containing at least the 'high', 'low', and 'close' columns, or a
+        panel (see `panel.as_panel`) with one column per symbol in each field.
+    window : int, optional
+        The rolling window period for calculating the ATR. Default is 14.
+
+    Returns:
+    -------
+    atr : pandas.Series or pandas.DataFrame
+        The Average True Range values (one column per symbol for a panel).
+    """
+    tr = calculate_true_range(data['high'], data['low'], data['close'])
+    atr = tr.rolling(window).mean()
+    return atr
@@ -1,3 +1,6 @@
+from .profiling import profiled
+
+@profiled
 def calculate_bbp(data, bbp_length=50):
     """
     Calculates the Bullish-Bearish Power (BBP) indicator for a given DataFrame.
@@ -1,3 +1,6 @@
+from .profiling import profiled
+
+@profiled
 def calculate_bollinger_bands(data, window=20, num_sd=2):
     """
     Calculate Bollinger Bands for a given financial time series dataset.
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from .profiling import profiled
+
+@profiled
 def calculate_coppock_curve(data, short_roc=11, long_roc=14, wma_period=10):
     """
     Calculate the Coppock Curve indicator.
@@ -14,7 +17,7 @@ def calculate_coppock_curve(data, short_roc=11, long_roc=14, wma_period=10):
         pd.DataFrame: Original DataFrame with an added 'CoppockCurve' column.
     """
     # Ensure required column is present
-    if 'close' not in data.columns:
+    if 'close' not in data:
         raise ValueError("Data must contain a 'close' column.")
 
     # Calculate Rate of Change (ROC)
@@ -1,6 +1,7 @@
-import numpy as np
-import pandas as pd
+from .calculate_atr import calculate_true_range
+from .profiling import profiled
 
+@profiled
 def calculate_dirmov(high, low, length):
     """
     Calculate the Directional Movement (DM) and Directional Indicator (DI).
@@ -11,9 +12,9 @@ def calculate_dirmov(high, low, length):
 
     Parameters:
     ----------
-    high : pandas.Series
-        A series of high prices.
-    low : pandas.Series
+    high : pandas.Series or pandas.DataFrame
+        A series of high prices (a DataFrame holds one column per symbol).
+    low : pandas.Series or pandas.DataFrame
         A series of low prices.
     length : int
         The look-back period for calculating moving averages.
@@ -44,15 +45,15 @@ def calculate_dirmov(high, low, length):
     down = -low.diff()
 
     # Calculate the Positive and Negative Directional Movements
-    plusDM = np.where((up > down) & (up > 0), up, 0)
-    minusDM = np.where((down > up) & (down > 0), down, 0)
+    plusDM = up.where((up > down) & (up > 0), 0)
+    minusDM = down.where((down > up) & (down > 0), 0)
 
-    # Compute the True Range (TR) using a helper function (ensure it's implemented)
+    # Compute the True Range (TR); no close is passed in, so the high stands in for it
     tr = calculate_true_range(high, low, high).rolling(length).mean()
 
     # Calculate the Positive and Negative Directional Indicators
-    plusDI = 100 * pd.Series(plusDM).rolling(length).mean() / tr
-    minusDI = 100 * pd.Series(minusDM).rolling(length).mean() / tr
+    plusDI = 100 * plusDM.rolling(length).mean() / tr
+    minusDI = 100 * minusDM.rolling(length).mean() / tr
 
     # Fill missing values with 0
     plusDI = plusDI.fillna(0)
@@ -1,3 +1,7 @@
+from .profiling import profiled
+from .rolling_extremum import rolling_extremum
+
+@profiled
 def calculate_donchian(data, period):
     """
     Calculates the Donchian Channel midline for a given DataFrame.
@@ -22,4 +26,4 @@ def calculate_donchian(data, period):
     data['Donchian_Channel'] = donchian(data, period=20)
     ```
     """
-    return (data['low'].rolling(window=period).min() + data['high'].rolling(window=period).max()) / 2
+    return (rolling_extremum(data['low'], period, 'min') + rolling_extremum(data['high'], period, 'max')) / 2
@@ -1,3 +1,6 @@
+from .profiling import profiled
+
+@profiled
 def calculate_ema(data, column, period):
     """
     Calculates the Exponential Moving Average (EMA) for a specified column.
@@ -1,3 +1,7 @@
+from .calculate_donchian import calculate_donchian
+from .profiling import profiled
+
+@profiled
 def calculate_ichimoku(data, conversion_periods, base_periods, lagging_span2_periods):
     """
     Calculates the Ichimoku Kinko Hyo components.
@@ -39,18 +43,15 @@ def calculate_ichimoku(data, conversion_periods, base_periods, lagging_span2_per
     ```
     """
     # Conversion Line (Tenkan-sen)
-    conversion_line = donchian(data, conversion_periods)
+    conversion_line = calculate_donchian(data, conversion_periods)
 
     # Base Line (Kijun-sen)
-    base_line = donchian(data, base_periods)
+    base_line = calculate_donchian(data, base_periods)
 
     # Leading Span 1 (Senkou Span A)
     lead_line1 = (conversion_line + base_line) / 2
 
     # Leading Span 2 (Senkou Span B)
-    lead_line2 = (
-        data['low'].rolling(window=lagging_span2_periods).min() +
-        data['high'].rolling(window=lagging_span2_periods).max()
-    ) / 2
+    lead_line2 = calculate_donchian(data, lagging_span2_periods)
 
     return conversion_line, base_line, lead_line1, lead_line2
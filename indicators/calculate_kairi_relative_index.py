@@ -1,4 +1,6 @@
-import pandas_ta as ta
+from .profiling import profiled
+
+@profiled
 def kairi_relative_index(df, length=14):
     """
     Calculates the Kairi Relative Index (KRI) for a given DataFrame.
@@ -25,7 +27,7 @@ def kairi_relative_index(df, length=14):
     ```
     """
     # Calculate the moving average (SMA)
-    df['sma'] = ta.sma(df['ha_close'], length)
+    df['sma'] = df['ha_close'].rolling(window=length).mean()
 
     # Calculate the KRI
     df['kri'] = ((df['ha_close'] - df['sma']) / df['sma']) * 100
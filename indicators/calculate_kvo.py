@@ -1,5 +1,8 @@
 import pandas as pd
 
+from .profiling import profiled
+
+@profiled
 def calculate_kvo(data, short_period=34, long_period=55):
     """
     Calculate the Klinger Volume Oscillator (KVO).
@@ -13,7 +16,7 @@ def calculate_kvo(data, short_period=34, long_period=55):
         pd.DataFrame: Original DataFrame with an added 'KVO' column.
     """
     # Ensure required columns are present
-    if not {'high', 'low', 'close', 'volume'}.issubset(data.columns):
+    if not {'high', 'low', 'close', 'volume'}.issubset(data):
         raise ValueError("Data must contain 'high', 'low', 'close', and 'volume' columns.")
 
     # Calculate Money Flow Multiplier (MFM)
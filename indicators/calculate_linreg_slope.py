@@ -0,0 +1,104 @@
+import numpy as np
+
+from .kernels import window_sums_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def linreg_slope(series, length):
+    """
+    Calculates the slope of the linear regression line for a given series.
+
+    The slope is a measure of the rate of change of the series over a specified period.
+    It helps identify the direction and strength of the trend.
+
+    Parameters:
+    ----------
+    series : pd.Series
+        The input series (e.g., closing prices).
+    length : int
+        The lookback period for calculating the slope.
+
+    Returns:
+    -------
+    float
+        The slope of the linear regression line.
+
+    Example Usage:
+    --------------
+    ```python
+    slope = linreg_slope(data['close'], length=14)
+    ```
+    """
+    x = np.arange(len(series))
+    slope = np.polyfit(x[-length:], series[-length:], 1)[0]
+    return slope
+
+
+@profiled
+def rolling_linreg(series, length, outputs=('slope',), forecast_offset=1):
+    """
+    Calculates the linear regression over a rolling window for every bar.
+
+    Gives the same slope as `linreg_slope` (a least-squares fit against the bar
+    number) for each window of `length` bars, but from rolling sums, so the cost is
+    O(n) whatever `length` is. The sums are taken relative to a local reference
+    level in blocks, which keeps the results accurate on long price series. Works
+    on a Series, a 1-D array or a 2-D panel (time x symbols DataFrame or array).
+
+    Parameters:
+    ----------
+    series : pd.Series, pd.DataFrame or array-like
+        The input values (e.g., closing prices).
+    length : int
+        The number of bars in each regression window (at least 2).
+    outputs : tuple of str, optional
+        Any of 'slope', 'intercept', 'r2' and 'forecast'. Default is ('slope',).
+        - 'slope': change per bar of the fitted line.
+        - 'intercept': fitted value at the oldest bar of the window.
+        - 'r2': coefficient of determination of the fit (NaN for a flat window).
+        - 'forecast': fitted value `forecast_offset` bars after the current bar.
+    forecast_offset : int, optional
+        How far ahead 'forecast' projects. 0 gives the end point of the fitted
+        line (the classic linear regression curve). Default is 1.
+
+    Returns:
+    -------
+    same type as `series`, or tuple
+        One result per requested output, in the order given; a single output is
+        returned on its own. The first `length - 1` bars and windows with NaN are NaN.
+
+    Example Usage:
+    --------------
+    ```python
+    slope = rolling_linreg(data['close'], 14)
+    slope, r2 = rolling_linreg(data['close'], 50, outputs=('slope', 'r2'))
+    ```
+    """
+    if length < 2:
+        raise ValueError("length must be at least 2.")
+    unknown = set(outputs) - {'slope', 'intercept', 'r2', 'forecast'}
+    if unknown:
+        raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+
+    ref, sum_y, sum_ky, *rest = window_sums_kernel(series, length, squares='r2' in outputs)
+    sum_k = length * (length - 1) / 2
+    sum_kk = (length - 1) * length * (2 * length - 1) / 6
+    slope = (length * sum_ky - sum_k * sum_y) / (length * sum_kk - sum_k ** 2)
+
+    results = {'slope': slope}
+    if 'intercept' in outputs or 'forecast' in outputs:
+        intercept = ref + (sum_y - slope * sum_k) / length
+        results['intercept'] = intercept
+        results['forecast'] = intercept + slope * (length - 1 + forecast_offset)
+    if 'r2' in outputs:
+        total = rest[0] - sum_y ** 2 / length
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2 = slope ** 2 * (sum_kk - sum_k ** 2 / length) / total
+        results['r2'] = np.where(total > 0, np.minimum(r2, 1.0), np.nan)
+
+    if hasattr(series, 'index'):
+        results = {name: wrap_like(values, series) for name, values in results.items()}
+    if len(outputs) == 1:
+        return results[outputs[0]]
+    return tuple(results[name] for name in outputs)
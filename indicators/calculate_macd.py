@@ -1,3 +1,6 @@
+from .profiling import profiled
+
+@profiled
 def calculate_macd(data, short_window=12, long_window=26, signal_window=9):
     """
     Calculate the Moving Average Convergence Divergence (MACD) indicator.
@@ -1,3 +1,6 @@
+from .profiling import profiled
+
+@profiled
 def mass_index(data, period=9, ema_period=25):
     """
     Calculates the Mass Index for a given DataFrame.
@@ -0,0 +1,24 @@
+from .kernels import obv_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def calculate_obv(data):
+    """
+    Calculate the On-Balance Volume (OBV).
+
+    OBV is a momentum indicator that uses volume flow to predict changes in stock price.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame or dict
+        A DataFrame containing at least the 'close' and 'volume' columns, or a panel
+        (see `panel.as_panel`) with one column per symbol in each field.
+
+    Returns:
+    -------
+    obv : pandas.Series or pandas.DataFrame
+        The On-Balance Volume values (one column per symbol for a panel).
+    """
+    obv = obv_kernel(data['close'], data['volume'])
+    return wrap_like(obv, data['close'])
@@ -0,0 +1,31 @@
+from .kernels import psar_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def calculate_psar(data, initial_af=0.0, max_af=0.2, step_af=0.02):
+    """
+    Calculates the Parabolic SAR (PSAR) for a given DataFrame.
+
+    The Parabolic SAR (PSAR) is a trend-following indicator that helps identify potential reversal points in a market trend.
+    It is calculated using the high and low prices over a period, with an acceleration factor (AF) that adjusts dynamically.
+
+    Parameters:
+    data (pd.DataFrame or dict): DataFrame containing the 'high' and 'low' columns representing price data for the asset,
+                                 or a panel (see `panel.as_panel`) with one column per symbol in each field.
+    initial_af (float): Initial acceleration factor. Default is 0.0.
+    max_af (float): Maximum acceleration factor. Default is 0.2.
+    step_af (float): Step increment for adjusting the acceleration factor. Default is 0.02.
+
+    Returns:
+    pd.DataFrame: The original DataFrame with an added 'PSAR' column that contains the calculated Parabolic SAR values,
+                  and 'Trend', 'EP', and 'AF' columns used in the calculation.
+    """
+    psar, trend, ep, af = psar_kernel(data['high'], data['low'], initial_af, max_af, step_af)
+
+    data['PSAR'] = wrap_like(psar, data['low'])
+    data['Trend'] = wrap_like(trend, data['low'])  # 1 = Uptrend, -1 = Downtrend
+    data['EP'] = wrap_like(ep, data['low'])  # Extreme Price (EP)
+    data['AF'] = wrap_like(af, data['low'])  # Acceleration Factor (AF)
+
+    return data
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from .profiling import profiled
+
+@profiled
 def calculate_sma(data, column='close', period=14):
     """
     Calculate the Simple Moving Average (SMA).
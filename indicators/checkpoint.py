@@ -0,0 +1,198 @@
+import json
+import os
+import types
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .chunked import chunked
+from .profiling import profiled
+
+# A checkpoint is an .npz archive: a JSON header describing the chunked indicator
+# (its class, parameters and carried state) plus one array per carried column.
+# Nothing is pickled, and a checkpoint can only name the chunked classes and the
+# indicator functions of the package, so loading one runs no other code.
+_FORMAT = 1
+
+
+def _name_of(obj):
+    name = f'{obj.__module__}:{obj.__qualname__}'
+    if '<' in name:
+        raise TypeError(f"{name} cannot be checkpointed; use a module-level function.")
+    return name
+
+
+@lru_cache(maxsize=None)
+def _restorable():
+    # Name -> class or function, for everything a checkpoint may hold; names are
+    # looked up here only, never resolved through module attributes
+    from . import INDICATORS, get_indicator
+    from .chunked import RECURSIVE, Windowed, _Ewm, _Tail
+
+    allowed = [*RECURSIVE.values(), Windowed, _Ewm, _Tail] + [get_indicator(name) for name in INDICATORS]
+    return {_name_of(obj): obj for obj in allowed}
+
+
+def _encode(value, arrays):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, list):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, tuple):
+        return {'tuple': [_encode(item, arrays) for item in value]}
+    if isinstance(value, dict):
+        return {'dict': [[_encode(k, arrays), _encode(v, arrays)] for k, v in value.items()]}
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind not in 'biufcmM':
+            raise TypeError(f"Arrays of dtype {value.dtype} cannot be checkpointed.")
+        key = f'a{len(arrays)}'
+        arrays[key] = value
+        return {'array': key}
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        # Carried rows only lead the next chunk and are dropped from its output, so
+        # their index is kept only when it is numeric or datetime
+        index = value.index.to_numpy()
+        index = _encode(index, arrays) if index.dtype.kind in 'biufmM' else None
+        if isinstance(value, pd.Series):
+            return {'series': _encode(value.to_numpy(), arrays), 'name': _encode(value.name, arrays),
+                    'index': index}
+        return {'frame': [_encode(value.iloc[:, k].to_numpy(), arrays) for k in range(value.shape[1])],
+                'columns': _encode(list(value.columns), arrays), 'index': index}
+    if isinstance(value, type) and issubclass(value, np.generic):
+        return {'dtype': np.dtype(value).str}
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        if _restorable().get(_name_of(value)) is not value:
+            raise TypeError(f"{_name_of(value)} cannot be checkpointed; only {__package__}.INDICATORS functions can.")
+        return {'function': _name_of(value)}
+    if _restorable().get(_name_of(type(value))) is type(value):
+        return {'object': _name_of(type(value)), 'attributes': _encode(vars(value), arrays)}
+    raise TypeError(f"{type(value).__name__} cannot be checkpointed.")
+
+
+def _restore(name):
+    # A checkpoint must not name arbitrary callables
+    if not isinstance(name, str) or name not in _restorable():
+        raise ValueError(f"Refusing to restore {name} from a checkpoint.")
+    return _restorable()[name]
+
+
+def _decode(value, arrays):
+    if isinstance(value, list):
+        return [_decode(item, arrays) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if 'tuple' in value:
+        return tuple(_decode(item, arrays) for item in value['tuple'])
+    if 'dict' in value:
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in value['dict']}
+    if 'array' in value:
+        return arrays[value['array']]
+    if 'series' in value or 'frame' in value:
+        index = None if value['index'] is None else _decode(value['index'], arrays)
+        if 'series' in value:
+            return pd.Series(_decode(value['series'], arrays), index=index, name=_decode(value['name'], arrays))
+        columns = _decode(value['columns'], arrays)
+        frame = pd.DataFrame({k: _decode(column, arrays) for k, column in enumerate(value['frame'])}, index=index)
+        frame.columns = columns
+        return frame
+    if 'dtype' in value:
+        return np.dtype(value['dtype']).type
+    if 'function' in value:
+        return _restore(value['function'])
+    if 'object' in value:
+        cls = _restore(value['object'])
+        obj = cls.__new__(cls)
+        obj.__dict__.update(_decode(value['attributes'], arrays))
+        return obj
+    raise ValueError(f"Unrecognised checkpoint entry {sorted(value)}.")
+
+
+@profiled
+def save_checkpoint(indicator, path):
+    """
+    Writes the state a chunked indicator carries to a checkpoint file.
+
+    The checkpoint holds only what the next bar needs: a few numbers for the
+    recursive indicators (EMA, MACD, KVO, PSAR, Supertrend bands, Kalman estimate
+    and error, OBV total) and the last `lookback - 1` rows for the windowed ones.
+    It is written beside `path` and moved into place, so a crash never leaves a
+    half-written checkpoint.
+
+    Parameters:
+    ----------
+    indicator : ChunkedIndicator
+        From `chunked.chunked`, after it has been called on the history so far.
+    path : str
+        The checkpoint file (conventionally `.npz`).
+
+    Example Usage:
+    --------------
+    ```python
+    # Once: the full history
+    macd = chunked(calculate_macd, 12, 26, 9)
+    history_macd = macd(history)
+    save_checkpoint(macd, 'AAPL.macd.npz')
+
+    # Every night: only the new bars
+    macd = load_checkpoint('AAPL.macd.npz')
+    new_macd = macd(todays_bars)          # equals the last rows of a full rerun
+    save_checkpoint(macd, 'AAPL.macd.npz')
+    ```
+    """
+    arrays = {}
+    header = {'format': _FORMAT, 'indicator': _encode(indicator, arrays)}
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(f, header=np.array(json.dumps(header)), **arrays)
+    os.replace(tmp, path)
+
+
+@profiled
+def load_checkpoint(path):
+    """
+    Restores a chunked indicator from `save_checkpoint`, ready for the next chunk.
+
+    Parameters:
+    ----------
+    path : str
+        The checkpoint file.
+
+    Returns:
+    -------
+    ChunkedIndicator
+        Call it with the bars that follow the checkpointed ones.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        arrays = {key: archive[key] for key in archive.files}
+    header = json.loads(str(arrays.pop('header')))
+    if header['format'] != _FORMAT:
+        raise ValueError(f"Unsupported checkpoint format {header['format']}.")
+    return _decode(header['indicator'], arrays)
+
+
+def resume(path, func, *args, lookback=None, **kwargs):
+    """
+    Loads the checkpoint at `path`, or starts `chunked(func, *args, **kwargs)` if
+    there is none yet, so the same nightly job covers the first run and the rest.
+
+    Parameters:
+    ----------
+    path : str
+        The checkpoint file.
+    func : callable
+        The indicator function; see `chunked.chunked`.
+    *args, **kwargs
+        The indicator's parameters.
+    lookback : int, optional
+        See `chunked.chunked`.
+
+    Returns:
+    -------
+    ChunkedIndicator
+    """
+    if os.path.exists(path):
+        return load_checkpoint(path)
+    return chunked(func, *args, lookback=lookback, **kwargs)
@@ -0,0 +1,497 @@
+import inspect
+import math
+
+import numpy as np
+import pandas as pd
+
+from .adx import calculate_adx
+from .calculate_aroon import calculate_aroon
+from .calculate_atr import calculate_atr
+from .calculate_bbp import calculate_bbp
+from .calculate_bollinger_bands import calculate_bollinger_bands
+from .calculate_coppock_curve import calculate_coppock_curve
+from .calculate_donchian import calculate_donchian
+from .calculate_ema import calculate_ema
+from .calculate_ichimoku import calculate_ichimoku
+from .calculate_kairi_relative_index import kairi_relative_index
+from .calculate_kvo import calculate_kvo
+from .calculate_linreg_slope import rolling_linreg
+from .calculate_macd import calculate_macd
+from .calculate_mass_index import mass_index
+from .calculate_obv import calculate_obv
+from .calculate_psar import calculate_psar
+from .calculate_sma import calculate_sma
+from .hma import hma, wma
+from .kalman_filter import kalman_filter
+from .kernels import kalman_kernel, obv_kernel, psar_kernel, supertrend_flip_kernel, supertrend_kernel
+from .percentage_oscillator import calculate_percentage_oscillator
+from .profiling import profiled
+from .rsi import calculate_rsi
+from .stochastic_oscillator import calculate_stochastic
+from .supertrend import calculate_supertrend
+from .thma import thma
+
+# Lookback of the windowed indicators: the value at a bar depends only on that many
+# bars ending at it, so each chunk only needs the previous `lookback - 1` rows
+LOOKBACKS = {
+    calculate_sma: lambda p: p['period'],
+    calculate_donchian: lambda p: p['period'],
+    calculate_bollinger_bands: lambda p: p['window'],
+    wma: lambda p: p['period'],
+    hma: lambda p: p['period'] + int(p['period'] ** 0.5) - 1,
+    thma: lambda p: 3 * (p['period'] + int(p['period'] ** 0.5) - 2) + 1,
+    calculate_atr: lambda p: p['window'] + 1,
+    calculate_rsi: lambda p: p['length'] + 1,
+    calculate_stochastic: lambda p: p['length'] + p['smoothing'] - 1,
+    calculate_adx: lambda p: p['period'] + p['smoothing_period'],
+    calculate_aroon: lambda p: p['period'] + 1,
+    calculate_ichimoku: lambda p: max(p['conversion_periods'], p['base_periods'],
+                                      p['lagging_span2_periods']),
+    kairi_relative_index: lambda p: p['length'],
+    rolling_linreg: lambda p: p['length'],
+}
+
+
+def ema_horizon(span, tolerance=1e-6):
+    """
+    Bars a span EMA (adjust=False) needs for its seed to weigh at most `tolerance`.
+
+    An EMA started `h` bars back differs from the full-history one by
+    `(1 - alpha) ** h` times the gap between its first value and the full-history
+    average at that point, with `alpha = 2 / (span + 1)`.
+    """
+    decay = 1 - 2 / (span + 1)
+    if decay <= 0:
+        return 1
+    return max(1, math.ceil(math.log(tolerance) / math.log(decay)))
+
+
+# History the EMA-based indicators need for their last value to be within
+# `tolerance` (relative to the seed gap of each EMA) of the full-history one
+HORIZONS = {
+    calculate_ema: lambda p, tol: ema_horizon(p['period'], tol),
+    calculate_macd: lambda p, tol: (max(ema_horizon(p['short_window'], tol), ema_horizon(p['long_window'], tol))
+                                    + ema_horizon(p['signal_window'], tol) - 1),
+    calculate_kvo: lambda p, tol: max(ema_horizon(p['short_period'], tol), ema_horizon(p['long_period'], tol)),
+    calculate_bbp: lambda p, tol: ema_horizon(p['bbp_length'], tol),
+    calculate_percentage_oscillator: lambda p, tol: max(ema_horizon(p['short_length'], tol),
+                                                        ema_horizon(p['long_length'], tol)),
+    calculate_coppock_curve: lambda p, tol: (max(p['short_roc'], p['long_roc'])
+                                             + ema_horizon(p['wma_period'], tol)),
+    mass_index: lambda p, tol: 2 * ema_horizon(p['period'], tol) + p['ema_period'] - 2,
+}
+
+
+def lookback(func, *args, tolerance=1e-6, **kwargs):
+    """
+    Number of bars an indicator needs to compute its value at the last bar.
+
+    Windowed indicators (`LOOKBACKS`) give the exact value from that many bars.
+    EMA-based ones (`HORIZONS`) never forget their start; they get the bars after
+    which the start weighs at most `tolerance` (see `ema_horizon`).
+
+    Parameters:
+    ----------
+    func : callable
+        The indicator function, e.g. `calculate_rsi` or `calculate_macd`.
+    *args, **kwargs
+        The indicator's parameters, as for a direct call (without the data argument).
+    tolerance : float, optional
+        For EMA-based indicators. Default is 1e-6.
+
+    Returns:
+    -------
+    int
+        The number of bars; the last `n` values need `lookback + n - 1` bars.
+
+    Example Usage:
+    --------------
+    ```python
+    lookback(calculate_stochastic, 14, 3)         # 16
+    lookback(calculate_macd, 12, 26, 9)            # 241 (tolerance=1e-6)
+    ```
+    """
+    if func in LOOKBACKS:
+        return LOOKBACKS[func](_bind(func, args, kwargs))
+    if func in HORIZONS:
+        return HORIZONS[func](_bind(func, args, kwargs), tolerance)
+    raise ValueError(f"{func.__name__} depends on the whole history; it has no finite lookback.")
+
+
+def _bind(func, args, kwargs):
+    # Every parameter after the data argument, defaults included
+    bound = inspect.signature(func).bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    return dict(list(bound.arguments.items())[1:])
+
+
+def _drop_head(result, rows):
+    if isinstance(result, tuple):
+        return tuple(_drop_head(item, rows) for item in result)
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.iloc[rows:]
+    return result[rows:]
+
+
+class _Ewm:
+    # span EMA with adjust=False whose recursion continues across chunks. Prepending
+    # the last output (and the NaNs seen since the last observation) reproduces the
+    # full-series pandas recursion exactly.
+    def __init__(self, span):
+        self.span = span
+        self.state = {'last': None, 'gap': 0}
+
+    def __call__(self, series):
+        state = self.state
+        if state['last'] is None:
+            out = series.ewm(span=self.span, adjust=False).mean()
+        else:
+            head = [state['last']] + [np.nan] * state['gap']
+            values = pd.Series(np.concatenate([head, series.to_numpy(dtype=np.float64)]))
+            out = values.ewm(span=self.span, adjust=False).mean().iloc[len(head):]
+            out.index = series.index
+        observed = np.flatnonzero(series.notna().to_numpy())
+        if len(observed):
+            state['last'] = float(out.iloc[observed[-1]])
+            state['gap'] = len(series) - 1 - int(observed[-1])
+        elif state['last'] is not None:
+            state['gap'] += len(series)
+        return out
+
+
+class _Tail:
+    # The last `rows` rows seen, to lead the next chunk
+    def __init__(self, rows):
+        self.rows = rows
+        self.data = None
+
+    def extend(self, chunk):
+        data = chunk if self.data is None else pd.concat([self.data, chunk])
+        offset = len(data) - len(chunk)
+        self.data = data.iloc[max(len(data) - self.rows, 0):] if self.rows > 0 else data.iloc[:0]
+        return data, offset
+
+
+class ChunkedIndicator:
+    """
+    An indicator fed one chunk of a series at a time.
+
+    Call the object with consecutive chunks (DataFrames, or Series for functions that
+    take one). Each call returns what the wrapped function would have returned for
+    those rows had it been run on the whole series at once. Only the state the
+    indicator needs is kept between calls, so memory is bounded by the chunk size.
+    """
+
+    def __call__(self, chunk):
+        raise NotImplementedError
+
+
+class Windowed(ChunkedIndicator):
+    """
+    Runs a windowed function on each chunk led by the last `lookback - 1` rows of the
+    previous one, then drops the rows that belong to the previous chunk.
+    """
+
+    def __init__(self, func, lookback, *args, **kwargs):
+        self.func, self.args, self.kwargs = func, args, kwargs
+        self.lookback = lookback
+        self._tail = _Tail(lookback - 1)
+
+    def __call__(self, chunk):
+        data, offset = self._tail.extend(chunk)
+        result = self.func(data.copy(), *self.args, **self.kwargs)
+        return _drop_head(result, offset)
+
+
+class EMA(ChunkedIndicator):
+    """Chunked `calculate_ema`."""
+
+    def __init__(self, column, period):
+        self.column = column
+        self._ema = _Ewm(period)
+
+    def __call__(self, chunk):
+        return self._ema(chunk[self.column])
+
+
+class MACD(ChunkedIndicator):
+    """Chunked `calculate_macd`."""
+
+    def __init__(self, short_window=12, long_window=26, signal_window=9):
+        self._short, self._long, self._signal = _Ewm(short_window), _Ewm(long_window), _Ewm(signal_window)
+
+    def __call__(self, chunk):
+        macd_line = self._short(chunk['close']) - self._long(chunk['close'])
+        return macd_line, self._signal(macd_line)
+
+
+class KVO(ChunkedIndicator):
+    """Chunked `calculate_kvo`."""
+
+    def __init__(self, short_period=34, long_period=55):
+        self._short, self._long = _Ewm(short_period), _Ewm(long_period)
+
+    def __call__(self, chunk):
+        data = chunk.copy()
+        data['MFM'] = ((data['close'] - data['low']) - (data['high'] - data['close'])) / (data['high'] - data['low'])
+        data['MFV'] = data['MFM'] * data['volume']
+        data['KVO'] = self._short(data['MFV']) - self._long(data['MFV'])
+        return data
+
+
+class BBP(ChunkedIndicator):
+    """Chunked `calculate_bbp`."""
+
+    def __init__(self, bbp_length=50):
+        self._ema = _Ewm(bbp_length)
+
+    def __call__(self, chunk):
+        data = chunk.copy()
+        ema = self._ema(data['close'])
+        data['BullPower'] = data['high'] - ema
+        data['BearPower'] = data['low'] - ema
+        data['BBP'] = data['BullPower'] + data['BearPower']
+        return data
+
+
+class PercentageOscillator(ChunkedIndicator):
+    """Chunked `calculate_percentage_oscillator`."""
+
+    def __init__(self, short_length=10, long_length=21, source_col='close'):
+        self.source_col = source_col
+        self._short, self._long = _Ewm(short_length), _Ewm(long_length)
+
+    def __call__(self, chunk):
+        data = chunk.copy()
+        short_ema, long_ema = self._short(data[self.source_col]), self._long(data[self.source_col])
+        data['PO'] = (short_ema - long_ema) / long_ema * 100
+        return data
+
+
+class CoppockCurve(ChunkedIndicator):
+    """Chunked `calculate_coppock_curve`: the ROC shifts need the last closes, the smoothing its EMA state."""
+
+    def __init__(self, short_roc=11, long_roc=14, wma_period=10):
+        self.short_roc, self.long_roc = short_roc, long_roc
+        self._tail = _Tail(max(short_roc, long_roc))
+        self._ema = _Ewm(wma_period)
+
+    def __call__(self, chunk):
+        close, offset = self._tail.extend(chunk['close'])
+        data = chunk.copy()
+        roc_short = ((close - close.shift(self.short_roc)) / close.shift(self.short_roc)) * 100
+        roc_long = ((close - close.shift(self.long_roc)) / close.shift(self.long_roc)) * 100
+        data['ROC_Short'] = roc_short.iloc[offset:]
+        data['ROC_Long'] = roc_long.iloc[offset:]
+        data['ROC_Sum'] = data['ROC_Short'] + data['ROC_Long']
+        data['CoppockCurve'] = self._ema(data['ROC_Sum'])
+        return data
+
+
+class MassIndex(ChunkedIndicator):
+    """Chunked `mass_index`: two carried EMAs and the last `ema_period - 1` ratios."""
+
+    def __init__(self, period=9, ema_period=25):
+        self.ema_period = ema_period
+        self._ema1, self._ema2 = _Ewm(period), _Ewm(period)
+        self._tail = _Tail(ema_period - 1)
+
+    def __call__(self, chunk):
+        ema1 = self._ema1(chunk['ha_high'] - chunk['ha_low'])
+        ema2 = self._ema2(ema1)
+        ratio, offset = self._tail.extend(ema1 / ema2)
+        return ratio.rolling(window=self.ema_period).sum().iloc[offset:]
+
+
+class KalmanFilter(ChunkedIndicator):
+    """Chunked `kalman_filter` (the kernel carries the estimate and its error)."""
+
+    def __init__(self, column, process_variance=1e-1, measurement_variance=1):
+        self.column = column
+        self.process_variance, self.measurement_variance = process_variance, measurement_variance
+        self.state = {}
+
+    def __call__(self, chunk):
+        values = chunk[self.column]
+        smoothed = kalman_kernel(values, self.process_variance, self.measurement_variance, self.state)
+        return pd.Series(smoothed, index=values.index)
+
+
+class PSAR(ChunkedIndicator):
+    """Chunked `calculate_psar` (the kernel carries the SAR state and the last two bars)."""
+
+    def __init__(self, initial_af=0.0, max_af=0.2, step_af=0.02):
+        self.params = (initial_af, max_af, step_af)
+        self.state = {}
+
+    def __call__(self, chunk):
+        data = chunk.copy()
+        psar, trend, ep, af = psar_kernel(data['high'], data['low'], *self.params, state=self.state)
+        data['PSAR'], data['Trend'], data['EP'], data['AF'] = psar, trend, ep, af
+        return data
+
+
+class OBV(ChunkedIndicator):
+    """Chunked `calculate_obv` (the kernel carries the last close and the running total)."""
+
+    def __init__(self):
+        self.state = {}
+
+    def __call__(self, chunk):
+        obv = obv_kernel(chunk['close'], chunk['volume'], self.state)
+        return pd.Series(obv, index=chunk.index)
+
+
+class Supertrend(ChunkedIndicator):
+    """
+    Chunked `calculate_supertrend`: the last `atr_period` bars feed the ATR and the
+    kernel carries the final bands, the direction and the last close.
+    """
+
+    def __init__(self, atr_period, factor, ratchet=True):
+        self.atr_period, self.factor, self.ratchet = atr_period, factor, ratchet
+        self._tail = _Tail(atr_period)
+        self.state = {}
+
+    def __call__(self, chunk):
+        bars, offset = self._tail.extend(chunk[['high', 'low', 'close']])
+        high, low, close = bars['high'], bars['low'], bars['close']
+        prev_close = close.shift(1)
+        tr = np.maximum((high - low), np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+        df = chunk.copy()
+        df['prev_close'] = prev_close.iloc[offset:]
+        df['tr'] = tr.iloc[offset:]
+        df['ATR'] = tr.rolling(window=self.atr_period).mean().iloc[offset:]
+        df['hl2'] = (df['high'] + df['low']) / 2
+        df['upper_band'] = df['hl2'] + self.factor * df['ATR']
+        df['lower_band'] = df['hl2'] - self.factor * df['ATR']
+        if self.ratchet:
+            final_upper, final_lower, supertrend, direction = supertrend_kernel(
+                df['close'], df['upper_band'], df['lower_band'], self.state)
+            df['final_upper_band'], df['final_lower_band'] = final_upper, final_lower
+            df['supertrend_dir'] = direction
+        else:
+            supertrend = supertrend_flip_kernel(df['close'], df['upper_band'], df['lower_band'], self.state)
+        df['supertrend_l'] = supertrend
+        df['supertrend_s'] = df['supertrend_l']
+        return df
+
+
+# Indicators with unbounded memory, mapped to the class that carries their state
+RECURSIVE = {
+    calculate_ema: EMA,
+    calculate_macd: MACD,
+    calculate_kvo: KVO,
+    calculate_bbp: BBP,
+    calculate_percentage_oscillator: PercentageOscillator,
+    calculate_coppock_curve: CoppockCurve,
+    mass_index: MassIndex,
+    kalman_filter: KalmanFilter,
+    calculate_psar: PSAR,
+    calculate_obv: OBV,
+    calculate_supertrend: Supertrend,
+}
+
+
+def chunked(func, *args, lookback=None, **kwargs):
+    """
+    Builds the chunked form of an indicator function.
+
+    Recursive indicators get the class in `RECURSIVE` that carries their state;
+    windowed ones are wrapped in `Windowed` using the lookback declared in
+    `LOOKBACKS`. Any other windowed function can be run by passing its `lookback`.
+
+    Parameters:
+    ----------
+    func : callable
+        The indicator function, e.g. `calculate_ema` or `calculate_bollinger_bands`.
+    *args, **kwargs
+        The indicator's parameters, as for a direct call (without the data argument).
+    lookback : int, optional
+        Number of bars the value at a bar depends on, for functions without a
+        declared lookback.
+
+    Returns:
+    -------
+    ChunkedIndicator
+        Call it with each chunk in order.
+    """
+    if func in RECURSIVE:
+        return RECURSIVE[func](*args, **kwargs)
+    if lookback is None:
+        if func not in LOOKBACKS:
+            raise ValueError(f"{func.__name__} declares no lookback or state; pass lookback= for a windowed function.")
+        lookback = LOOKBACKS[func](_bind(func, args, kwargs))
+    return Windowed(func, lookback, *args, **kwargs)
+
+
+def run_chunked(chunks, func, *args, lookback=None, **kwargs):
+    """
+    Runs an indicator over an iterable of consecutive chunks, yielding one result per chunk.
+
+    Concatenating the results gives the output of a single run over the whole
+    series, while only one chunk plus the carried state is held in memory.
+
+    Parameters:
+    ----------
+    chunks : iterable
+        Consecutive DataFrames (or Series), e.g. `pd.read_csv(path, chunksize=1_000_000)`.
+    func : callable
+        The indicator function.
+    *args, **kwargs
+        The indicator's parameters; see `chunked`.
+    lookback : int, optional
+        See `chunked`.
+
+    Example Usage:
+    --------------
+    ```python
+    chunks = pd.read_csv('ticks.csv', chunksize=1_000_000)
+    for macd_line, signal_line in run_chunked(chunks, calculate_macd, 12, 26, 9):
+        ...
+    ```
+    """
+    indicator = chunked(func, *args, lookback=lookback, **kwargs)
+    for chunk in chunks:
+        yield indicator(chunk)
+
+
+@profiled
+def stream_csv(source, destination, func, *args, chunksize=1_000_000, read_csv_kwargs=None,
+               lookback=None, **kwargs):
+    """
+    Computes an indicator over a CSV file of any size and appends the results to another CSV.
+
+    Parameters:
+    ----------
+    source : str
+        The input CSV with the columns the indicator needs.
+    destination : str
+        The output CSV; overwritten.
+    func : callable
+        The indicator function.
+    *args, **kwargs
+        The indicator's parameters; see `chunked`.
+    chunksize : int, optional
+        Rows per chunk. Default is 1,000,000.
+    read_csv_kwargs : dict, optional
+        Passed to `pandas.read_csv`.
+    lookback : int, optional
+        See `chunked`.
+
+    Example Usage:
+    --------------
+    ```python
+    stream_csv('ticks.csv', 'ticks_psar.csv', calculate_psar, chunksize=500_000)
+    ```
+    """
+    chunks = pd.read_csv(source, chunksize=chunksize, **(read_csv_kwargs or {}))
+    header = True
+    for result in run_chunked(chunks, func, *args, lookback=lookback, **kwargs):
+        if isinstance(result, tuple):
+            result = pd.concat(result, axis=1, keys=[f'{func.__name__}_{i}' for i in range(len(result))])
+        elif isinstance(result, pd.Series):
+            result = result.to_frame(result.name or func.__name__)
+        result.to_csv(destination, mode='w' if header else 'a', header=header)
+        header = False
@@ -0,0 +1,594 @@
+import inspect
+
+import pandas as pd
+
+from .calculate_atr import calculate_true_range
+from .calculate_linreg_slope import rolling_linreg
+from .chunked import LOOKBACKS, ema_horizon
+from .kernels import (fibobars_kernel, hull_kernel, kalman_kernel, obv_kernel, psar_kernel,
+                     supertrend_flip_kernel, supertrend_kernel, wma_kernel)
+from .panel import wrap_like
+from .profiling import profiled, span
+from .hma import hma
+from .rolling_extremum import rolling_extremum
+from .thma import thma
+
+# A node is a hashable tuple (kind, *args). Arguments that are themselves nodes are
+# dependencies; anything else (periods, factors, helper functions) is a parameter.
+# Two features that need the same intermediate build the same tuple, so the
+# intermediate is computed once.
+_KINDS = {
+    'col': None,  # resolved against the input data
+    'shift': lambda x, periods: x.shift(periods),
+    'ema': lambda x, span: x.ewm(span=span, adjust=False).mean(),
+    'sma': lambda x, window: x.rolling(window=window).mean(),
+    'wma': lambda x, window: wrap_like(wma_kernel(x, window), x),
+    'std': lambda x, window: x.rolling(window=window).std(),
+    'rmax': lambda x, window: x.rolling(window=window).max(),
+    'rmin': lambda x, window: x.rolling(window=window).min(),
+    'rsum': lambda x, window: x.rolling(window=window).sum(),
+    'rext': lambda x, window, kind: rolling_extremum(x, window, kind, positions=True),
+    'tr': calculate_true_range,
+    'item': lambda x, i: x[i],
+    'apply': lambda fn, *args: fn(*args),
+}
+
+
+def _is_node(arg):
+    return type(arg) is tuple and len(arg) > 0 and isinstance(arg[0], str) and arg[0] in _KINDS
+
+
+def _span_name(node):
+    # 'features.ema', or 'features.apply(psar_kernel)' for a helper function
+    if node[0] == 'apply':
+        return f"features.apply({getattr(node[1], '__name__', node[1])})"
+    return f'features.{node[0]}'
+
+
+def _col(name):
+    return ('col', name)
+
+
+# Formula helpers. Each mirrors the exact expression of the module it stands in for,
+# so planned features are identical to calling the indicator functions directly.
+
+def _mid(a, b):
+    return (a + b) / 2
+
+
+def _sub(a, b):
+    return a - b
+
+
+def _add(a, b):
+    return a + b
+
+
+def _strict_tr(tr, close):
+    # `calculate_supertrend` and `calculate_adx` use np.maximum, so their first TR is NaN
+    return tr.where(close.shift(1).notna())
+
+
+def _gain(close):
+    delta = close.diff(1)
+    return delta.where(delta > 0, 0).where(close.notna())
+
+
+def _loss(close):
+    delta = close.diff(1)
+    return (-delta).where(delta < 0, 0).where(close.notna())
+
+
+def _rsi(avg_gain, avg_loss):
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def _bands(sma, rolling_std, num_sd, sign):
+    return sma + (rolling_std * num_sd) if sign > 0 else sma - (rolling_std * num_sd)
+
+
+def _atr_band(hl2, atr, factor, sign):
+    return hl2 + factor * atr if sign > 0 else hl2 - factor * atr
+
+
+def _supertrend(close, upper, lower, ratchet):
+    if ratchet:
+        _, _, line, direction = supertrend_kernel(close, upper, lower)
+        return wrap_like(line, close), wrap_like(direction, close)
+    line = supertrend_flip_kernel(close, upper, lower)
+    return wrap_like(line, close), None
+
+
+def _dm(move, opposite):
+    return move.clip(lower=0).where(move > opposite, 0)
+
+
+def _adx_di(dm_mean, tr_mean):
+    return 100 * (dm_mean / tr_mean)
+
+
+def _dx(di_plus, di_minus):
+    return 100 * abs(di_plus - di_minus) / (di_plus + di_minus)
+
+
+def _dirmov_di(dm_mean, tr_mean):
+    return (100 * dm_mean / tr_mean).fillna(0)
+
+
+def _aroon(periods_since, period):
+    return 100 * (period - periods_since) / period
+
+
+def _stoch_k(close, lowest_low, highest_high):
+    return 100 * (close - lowest_low) / (highest_high - lowest_low)
+
+
+def _po(short_ema, long_ema):
+    return (short_ema - long_ema) / long_ema * 100
+
+
+def _mfv(high, low, close, volume):
+    mfm = ((close - low) - (high - close)) / (high - low)
+    return mfm * volume
+
+
+def _roc(close, shifted):
+    return ((close - shifted) / shifted) * 100
+
+
+def _ratio(a, b):
+    return a / b
+
+
+def _kri(close, sma):
+    return ((close - sma) / sma) * 100
+
+
+def _position(close, lower, upper):
+    return (close - lower) / (upper - lower)
+
+
+def _hull(src, period, triple):
+    return wrap_like(hull_kernel(src, period, triple), src)
+
+
+def _obv(close, volume):
+    return wrap_like(obv_kernel(close, volume), close)
+
+
+def _psar(high, low, initial_af, max_af, step_af):
+    psar, trend, ep, af = psar_kernel(high, low, initial_af, max_af, step_af)
+    return wrap_like(psar, low), wrap_like(trend, low)
+
+
+def _fibobars(highest_high, lowest_low, close, open_price, period, fibo_level):
+    trend = fibobars_kernel(highest_high, lowest_low, close, open_price, period, fibo_level)
+    return wrap_like(trend, close)
+
+
+def _kalman(values, process_variance, measurement_variance):
+    return wrap_like(kalman_kernel(values, process_variance, measurement_variance), values)
+
+
+# Indicator definitions: keyword parameters (with the same defaults as the module
+# functions) -> {output name: node}
+
+def _true_range(close='close'):
+    return ('tr', _col('high'), _col('low'), _col(close))
+
+
+def _strict_true_range():
+    return ('apply', _strict_tr, _true_range(), _col('close'))
+
+
+def _donchian_node(period):
+    return ('apply', _mid, ('rmin', _col('low'), period), ('rmax', _col('high'), period))
+
+
+def _sma_def(column='close', period=14):
+    return {'sma': ('sma', _col(column), period)}
+
+
+def _ema_def(column='close', period=14):
+    return {'ema': ('ema', _col(column), period)}
+
+
+def _rsi_def(length=14):
+    close = _col('close')
+    avg_gain = ('sma', ('apply', _gain, close), length)
+    avg_loss = ('sma', ('apply', _loss, close), length)
+    return {'rsi': ('apply', _rsi, avg_gain, avg_loss)}
+
+
+def _macd_def(short_window=12, long_window=26, signal_window=9):
+    close = _col('close')
+    line = ('apply', _sub, ('ema', close, short_window), ('ema', close, long_window))
+    return {'macd': line, 'signal': ('ema', line, signal_window)}
+
+
+def _bollinger_def(window=20, num_sd=2):
+    close = _col('close')
+    sma, rolling_std = ('sma', close, window), ('std', close, window)
+    return {'upper': ('apply', _bands, sma, rolling_std, num_sd, 1),
+            'lower': ('apply', _bands, sma, rolling_std, num_sd, -1)}
+
+
+def _bollinger_position_def(window=20, num_sd=2):
+    bands = _bollinger_def(window, num_sd)
+    return {'position': ('apply', _position, _col('close'), bands['lower'], bands['upper'])}
+
+
+def _atr_def(window=14):
+    return {'atr': ('sma', _true_range(), window)}
+
+
+def _supertrend_def(atr_period=10, factor=3, ratchet=True):
+    hl2 = ('apply', _mid, _col('high'), _col('low'))
+    atr = ('sma', _strict_true_range(), atr_period)
+    upper = ('apply', _atr_band, hl2, atr, factor, 1)
+    lower = ('apply', _atr_band, hl2, atr, factor, -1)
+    result = ('apply', _supertrend, _col('close'), upper, lower, ratchet)
+    outputs = {'supertrend': ('item', result, 0)}
+    if ratchet:
+        outputs['direction'] = ('item', result, 1)
+    return outputs
+
+
+def _adx_def(period=14, smoothing_period=14):
+    high, low = _col('high'), _col('low')
+    up = ('apply', _sub, high, ('shift', high, 1))
+    down = ('apply', _sub, ('shift', low, 1), low)
+    tr = ('sma', _strict_true_range(), period)
+    di_plus = ('apply', _adx_di, ('sma', ('apply', _dm, up, down), period), tr)
+    di_minus = ('apply', _adx_di, ('sma', ('apply', _dm, down, up), period), tr)
+    dx = ('apply', _dx, di_plus, di_minus)
+    return {'adx': ('sma', dx, smoothing_period), 'di_plus': di_plus, 'di_minus': di_minus}
+
+
+def _dirmov_def(length=14):
+    high, low = _col('high'), _col('low')
+    up = ('apply', _sub, high, ('shift', high, 1))
+    down = ('apply', _sub, ('shift', low, 1), low)
+    tr = ('sma', _true_range('high'), length)
+    return {'plus_di': ('apply', _dirmov_di, ('sma', ('apply', _dm, up, down), length), tr),
+            'minus_di': ('apply', _dirmov_di, ('sma', ('apply', _dm, down, up), length), tr)}
+
+
+def _donchian_def(period=20):
+    return {'donchian': _donchian_node(period)}
+
+
+def _aroon_def(period=14):
+    since_high = ('item', ('rext', _col('high'), period + 1, 'max'), 1)
+    since_low = ('item', ('rext', _col('low'), period + 1, 'min'), 1)
+    return {'aroon_up': ('apply', _aroon, since_high, period),
+            'aroon_down': ('apply', _aroon, since_low, period)}
+
+
+def _ichimoku_def(conversion_periods=9, base_periods=26, lagging_span2_periods=52):
+    conversion, base = _donchian_node(conversion_periods), _donchian_node(base_periods)
+    return {'conversion': conversion, 'base': base,
+            'lead1': ('apply', _mid, conversion, base),
+            'lead2': _donchian_node(lagging_span2_periods)}
+
+
+def _stochastic_def(length=14, smoothing=3):
+    stoch_k = ('apply', _stoch_k, _col('close'), ('rmin', _col('low'), length),
+               ('rmax', _col('high'), length))
+    return {'stoch_k': ('sma', stoch_k, smoothing)}
+
+
+def _fibobars_def(period=14, fibo_level=0.618):
+    return {'trend': ('apply', _fibobars, ('rmax', _col('ha_high'), period),
+                      ('rmin', _col('ha_low'), period), _col('ha_close'), _col('ha_open'),
+                      period, fibo_level)}
+
+
+def _percentage_oscillator_def(short_length=10, long_length=21, source_col='close'):
+    src = _col(source_col)
+    return {'po': ('apply', _po, ('ema', src, short_length), ('ema', src, long_length))}
+
+
+def _bbp_def(bbp_length=50):
+    ema = ('ema', _col('close'), bbp_length)
+    bull = ('apply', _sub, _col('high'), ema)
+    bear = ('apply', _sub, _col('low'), ema)
+    return {'bull_power': bull, 'bear_power': bear, 'bbp': ('apply', _add, bull, bear)}
+
+
+def _kvo_def(short_period=34, long_period=55):
+    mfv = ('apply', _mfv, _col('high'), _col('low'), _col('close'), _col('volume'))
+    return {'kvo': ('apply', _sub, ('ema', mfv, short_period), ('ema', mfv, long_period))}
+
+
+def _coppock_def(short_roc=11, long_roc=14, wma_period=10):
+    close = _col('close')
+    roc_sum = ('apply', _add, ('apply', _roc, close, ('shift', close, short_roc)),
+               ('apply', _roc, close, ('shift', close, long_roc)))
+    return {'coppock': ('ema', roc_sum, wma_period)}
+
+
+def _obv_def():
+    return {'obv': ('apply', _obv, _col('close'), _col('volume'))}
+
+
+def _psar_def(initial_af=0.0, max_af=0.2, step_af=0.02):
+    result = ('apply', _psar, _col('high'), _col('low'), initial_af, max_af, step_af)
+    return {'psar': ('item', result, 0), 'trend': ('item', result, 1)}
+
+
+def _kalman_def(column='close', process_variance=1e-1, measurement_variance=1):
+    return {'kalman': ('apply', _kalman, _col(column), process_variance, measurement_variance)}
+
+
+def _wma_def(period=14, column='close'):
+    return {'wma': ('wma', _col(column), period)}
+
+
+def _hma_def(period=14, column='close'):
+    return {'hma': ('apply', _hull, _col(column), period, False)}
+
+
+def _thma_def(period=14, column='close'):
+    return {'thma': ('apply', _hull, _col(column), period, True)}
+
+
+def _mass_index_def(period=9, ema_period=25):
+    ema1 = ('ema', ('apply', _sub, _col('ha_high'), _col('ha_low')), period)
+    ema2 = ('ema', ema1, period)
+    return {'mass_index': ('rsum', ('apply', _ratio, ema1, ema2), ema_period)}
+
+
+def _kairi_def(length=14):
+    close = _col('ha_close')
+    return {'kri': ('apply', _kri, close, ('sma', close, length))}
+
+
+def _linreg_def(length=14, column='close'):
+    fit = ('apply', rolling_linreg, _col(column), length, ('slope', 'intercept', 'r2'))
+    return {'slope': ('item', fit, 0), 'intercept': ('item', fit, 1), 'r2': ('item', fit, 2)}
+
+
+INDICATORS = {
+    'sma': _sma_def,
+    'ema': _ema_def,
+    'rsi': _rsi_def,
+    'macd': _macd_def,
+    'bollinger_bands': _bollinger_def,
+    'bollinger_position': _bollinger_position_def,
+    'atr': _atr_def,
+    'supertrend': _supertrend_def,
+    'adx': _adx_def,
+    'dirmov': _dirmov_def,
+    'donchian': _donchian_def,
+    'aroon': _aroon_def,
+    'ichimoku': _ichimoku_def,
+    'stochastic': _stochastic_def,
+    'fibobars': _fibobars_def,
+    'percentage_oscillator': _percentage_oscillator_def,
+    'bbp': _bbp_def,
+    'kvo': _kvo_def,
+    'coppock_curve': _coppock_def,
+    'obv': _obv_def,
+    'psar': _psar_def,
+    'kalman_filter': _kalman_def,
+    'wma': _wma_def,
+    'hma': _hma_def,
+    'thma': _thma_def,
+    'mass_index': _mass_index_def,
+    'kairi_relative_index': _kairi_def,
+    'linreg': _linreg_def,
+}
+
+
+# Rows before a bar that each node kind reads on top of its inputs' own lookback
+_WINDOWS = {'sma', 'wma', 'std', 'rmax', 'rmin', 'rsum', 'rext'}
+# The same for 'apply' helpers, from their parameters. Helpers that carry state
+# through the whole history (Supertrend, PSAR, OBV, Kalman, Fibobars) are absent:
+# no finite number of rows reproduces them.
+_APPLY_LOOKBACKS = {
+    **dict.fromkeys((_mid, _sub, _add, _rsi, _bands, _atr_band, _dm, _adx_di, _dx, _dirmov_di, _aroon,
+                     _stoch_k, _po, _mfv, _roc, _ratio, _kri, _position), lambda *params: 0),
+    _gain: lambda: 1,
+    _loss: lambda: 1,
+    _strict_tr: lambda: 1,
+    _hull: lambda period, triple: LOOKBACKS[thma if triple else hma]({'period': period}) - 1,
+    rolling_linreg: lambda length, outputs: length - 1,
+}
+
+
+def _lookback(node, tolerance, memo):
+    # Rows needed for the node's value at the last bar; None if unbounded
+    if node in memo:
+        return memo[node]
+    kind, args = node[0], node[1:]
+    inputs = [_lookback(a, tolerance, memo) for a in args if _is_node(a)]
+    if None in inputs:
+        rows = None
+    elif kind == 'col':
+        rows = 1
+    elif kind in _WINDOWS:
+        rows = inputs[0] + args[1] - 1
+    elif kind == 'shift':
+        rows = inputs[0] + args[1]
+    elif kind == 'ema':
+        rows = inputs[0] + ema_horizon(args[1], tolerance) - 1
+    elif kind == 'tr':
+        rows = max(inputs) + 1
+    elif kind == 'item':
+        rows = inputs[0]
+    elif args[0] in _APPLY_LOOKBACKS:
+        rows = max(inputs) + _APPLY_LOOKBACKS[args[0]](*[a for a in args[1:] if not _is_node(a)])
+    else:
+        rows = None
+    memo[node] = rows
+    return rows
+
+
+class FeaturePlan:
+    """
+    A compiled feature set: the deduplicated intermediates in evaluation order and
+    the nodes backing each requested output.
+
+    Attributes:
+    ----------
+    outputs : dict
+        Feature name -> node.
+    order : list
+        Nodes in dependency order; each is computed exactly once.
+    """
+
+    def __init__(self, outputs, order, consumers):
+        self.outputs = outputs
+        self.order = order
+        self._consumers = consumers
+
+    def __len__(self):
+        return len(self.order)
+
+    def lookback(self, tolerance=1e-6):
+        """
+        Rows of history needed to compute every output at the last bar.
+
+        Windowed features are exact from that many rows; EMAs contribute the rows
+        after which their seed weighs at most `tolerance` (see `chunked.ema_horizon`).
+        Raises ValueError if an output depends on the whole history (e.g. OBV).
+        """
+        memo = {}
+        rows = {name: _lookback(node, tolerance, memo) for name, node in self.outputs.items()}
+        unbounded = [name for name, value in rows.items() if value is None]
+        if unbounded:
+            verb = 'depends' if len(unbounded) == 1 else 'depend'
+            raise ValueError(f"No finite lookback: {', '.join(unbounded)} {verb} on the whole history.")
+        return max(rows.values(), default=1)
+
+    def run(self, data):
+        """
+        Evaluate the plan on `data` (a DataFrame or a panel).
+
+        Intermediates are released as soon as their last consumer has run, so only
+        the requested outputs are kept. Returns a DataFrame of the features, or a
+        dict of DataFrames (one column per symbol) for a panel.
+        """
+        requested = set(self.outputs.values())
+        remaining = dict(self._consumers)
+        values = {}
+        for node in self.order:
+            if node[0] == 'col':
+                values[node] = data[node[1]]
+            else:
+                args = [values[a] if _is_node(a) else a for a in node[1:]]
+                with span(_span_name(node), args[0]):
+                    values[node] = _KINDS[node[0]](*args)
+            for dep in dict.fromkeys(a for a in node[1:] if _is_node(a)):
+                remaining[dep] -= 1
+                if remaining[dep] == 0 and dep not in requested:
+                    del values[dep]
+
+        result = {name: values[node] for name, node in self.outputs.items()}
+        if all(isinstance(v, pd.Series) for v in result.values()):
+            return pd.DataFrame(result)
+        return result
+
+
+def _feature_name(indicator, params):
+    return '_'.join([indicator] + [str(v) for v in params.values()])
+
+
+def plan_features(spec):
+    """
+    Compile a declarative feature spec into a deduplicated dependency graph.
+
+    Parameters:
+    ----------
+    spec : list
+        Each entry is `(indicator, params)` or a dict with keys 'indicator',
+        optional 'params', optional 'outputs' (subset of the indicator's outputs)
+        and optional 'name' (prefix for the feature names). The default prefix
+        joins the indicator and the given parameter values, e.g. 'rsi_14'; two
+        entries that would produce the same feature name raise ValueError. Indicator names are
+        the keys of `INDICATORS`; parameters use the same names and defaults as
+        the corresponding module functions.
+
+    Returns:
+    -------
+    FeaturePlan
+        The compiled plan; call `run(data)` to evaluate it.
+
+    Example Usage:
+    --------------
+    ```python
+    plan = plan_features([
+        ('atr', {'window': 14}),
+        ('supertrend', {'atr_period': 14, 'factor': 3}),
+        ('adx', {'period': 14}),
+        {'indicator': 'macd', 'outputs': ['macd'], 'name': 'macd'},
+        ('ichimoku', {'conversion_periods': 9, 'base_periods': 26, 'lagging_span2_periods': 52}),
+        ('donchian', {'period': 26}),
+    ])
+    features = plan.run(data)
+    ```
+    """
+    outputs = {}
+    for entry in spec:
+        if isinstance(entry, dict):
+            indicator = entry['indicator']
+            params = dict(entry.get('params', {}))
+            wanted, name = entry.get('outputs'), entry.get('name')
+        else:
+            indicator, params = entry
+            params, wanted, name = dict(params), None, None
+        if indicator not in INDICATORS:
+            raise ValueError(f"Unknown indicator '{indicator}'.")
+        definition = INDICATORS[indicator]
+        signature = inspect.signature(definition)
+        params = signature.bind(**params).arguments
+        nodes = definition(**params)
+        if name is None:
+            name = _feature_name(indicator, params)
+        for output, node in nodes.items():
+            if wanted is not None and output not in wanted:
+                continue
+            feature = name if len(nodes) == 1 or wanted == [output] else f'{name}_{output}'
+            if feature in outputs:
+                raise ValueError(f"Duplicate feature name '{feature}'; give one of the entries a 'name'.")
+            outputs[feature] = node
+
+    order, consumers = [], {}
+    visited = set()
+
+    def visit(node):
+        if node in visited:
+            return
+        visited.add(node)
+        for dep in dict.fromkeys(a for a in node[1:] if _is_node(a)):
+            visit(dep)
+            consumers[dep] = consumers.get(dep, 0) + 1
+        order.append(node)
+
+    for node in outputs.values():
+        visit(node)
+    return FeaturePlan(outputs, order, consumers)
+
+
+@profiled
+def compute_features(data, spec):
+    """
+    Compute a feature set, sharing common intermediates across indicators.
+
+    Shorthand for `plan_features(spec).run(data)`.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame or dict
+        OHLCV DataFrame (plus 'ha_*' columns for the Heikin-Ashi indicators), or a panel.
+    spec : list
+        Feature spec; see `plan_features`.
+
+    Returns:
+    -------
+    pandas.DataFrame or dict
+        The requested features.
+    """
+    return plan_features(spec).run(data)
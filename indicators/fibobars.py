@@ -0,0 +1,40 @@
+from .kernels import fibobars_kernel
+from .panel import wrap_like
+from .profiling import profiled
+from .rolling_extremum import rolling_extremum
+
+@profiled
+def calculate_fibobars(data, period, fibo_level):
+    """
+    Calculates the Fibonacci Bars indicator for a given DataFrame.
+
+    The Fibonacci Bars indicator uses Heikin-Ashi candle data to determine trends 
+    based on Fibonacci retracement levels.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame or dict
+        A DataFrame containing Heikin-Ashi columns ('ha_high', 'ha_low', 'ha_close', 'ha_open'),
+        or a panel (see `panel.as_panel`) with one column per symbol in each field.
+    period : int
+        The lookback period for calculating the highest high and lowest low.
+    fibo_level : float
+        The Fibonacci retracement level (e.g., 0.618 for 61.8%).
+
+    Returns:
+    -------
+    pd.Series or pd.DataFrame
+        A series representing the trend values (1 = uptrend, -1 = downtrend), one
+        column per symbol for a panel.
+
+    Example Usage:
+    --------------
+    ```python
+    data['Fibobars_Trend'] = calculate_fibobars(data, period=14, fibo_level=0.618)
+    ```
+    """
+    highest_high = rolling_extremum(data['ha_high'], period, 'max')
+    lowest_low = rolling_extremum(data['ha_low'], period, 'min')
+    trend = fibobars_kernel(highest_high, lowest_low, data['ha_close'], data['ha_open'],
+                            period, fibo_level)
+    return wrap_like(trend, data['ha_close'])
@@ -0,0 +1,45 @@
+from .kernels import heikin_ashi_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def calculate_heikin_ashi(data):
+    """
+    Calculates Heikin-Ashi candles for a given DataFrame.
+
+    Heikin-Ashi candles average each bar with the previous candle, which smooths
+    out price action:
+    - ha_close: Average of the bar's open, high, low and close.
+    - ha_open: Average of the previous candle's ha_open and ha_close (the first
+      candle opens at the average of its open and close).
+    - ha_high / ha_low: Extremes of the bar's high / low, ha_open and ha_close.
+
+    The result is a mapping with the 'ha_*' keys that `calculate_fibobars`,
+    `mass_index` and `kairi_relative_index` read, so it can be passed to them
+    directly.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame or dict
+        A DataFrame containing 'open', 'high', 'low' and 'close' columns, or a panel
+        (see `panel.as_panel`) with one column per symbol in each field.
+
+    Returns:
+    -------
+    dict
+        'ha_open', 'ha_high', 'ha_low' and 'ha_close' -> pd.Series, or DataFrames
+        with one column per symbol for a panel.
+
+    Example Usage:
+    --------------
+    ```python
+    ha = calculate_heikin_ashi(data)
+    trend = calculate_fibobars(ha, period=14, fibo_level=0.618)
+    mass = mass_index(ha)
+
+    data = data.assign(**ha)          # or keep the columns with the bars
+    ```
+    """
+    candles = heikin_ashi_kernel(data['open'], data['high'], data['low'], data['close'])
+    names = ('ha_open', 'ha_high', 'ha_low', 'ha_close')
+    return {name: wrap_like(values, data['close']) for name, values in zip(names, candles)}
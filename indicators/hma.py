@@ -0,0 +1,64 @@
+from .kernels import hull_kernel, wma_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def wma(src, period):
+    """
+    Calculates the Weighted Moving Average (WMA) for a given data series.
+
+    The WMA weights the last `period` values linearly, from 1 for the oldest to
+    `period` for the newest. It is computed from a running sum and a running
+    weighted sum, so the cost does not depend on `period`.
+
+    Parameters:
+    ----------
+    src : pd.Series or pd.DataFrame
+        The source data (e.g., closing prices), or a panel field with one column
+        per symbol.
+    period : int
+        The lookback period for the WMA.
+
+    Returns:
+    -------
+    pd.Series or pd.DataFrame
+        The WMA values, shaped like `src`.
+
+    Example Usage:
+    --------------
+    ```python
+    wma_result = wma(data['close'], period=14)
+    ```
+    """
+    return wrap_like(wma_kernel(src, period), src)
+
+
+@profiled
+def hma(src, period):
+    """
+    Calculates the Hull Moving Average (HMA) for a given data series.
+
+    The HMA is a weighted moving average that reduces lag while improving the smoothing. 
+    It is commonly used in technical analysis for identifying trends:
+    HMA = WMA(2 * WMA(src, period / 2) - WMA(src, period), sqrt(period)).
+
+    Parameters:
+    ----------
+    src : pd.Series or pd.DataFrame
+        The source data (e.g., closing prices), or a panel field with one column
+        per symbol.
+    period : int
+        The lookback period for the HMA (at least 2).
+
+    Returns:
+    -------
+    pd.Series or pd.DataFrame
+        A series representing the HMA values.
+
+    Example Usage:
+    --------------
+    ```python
+    hma_result = hma(data['close'], period=14)
+    ```
+    """
+    return wrap_like(hull_kernel(src, period), src)
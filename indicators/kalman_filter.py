@@ -0,0 +1,50 @@
+from .kernels import kalman_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def kalman_filter(data, column, process_variance=1e-1, measurement_variance=1, smooth=False):
+    """
+    Applies a Kalman Filter to smooth the given column of a DataFrame.
+
+    The Kalman Filter uses prediction and measurement updates to iteratively 
+    refine estimates of a system's state (e.g., smoothed price) in the presence 
+    of uncertainty or noise.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame
+        The input DataFrame containing the column to smooth.
+    column : str or list of str
+        The name of the column to apply the Kalman Filter on (e.g., 'close', 'open'),
+        or a list of columns, which are filtered together. In a panel (see
+        `panel.as_panel`) the field holds one column per symbol and all symbols are
+        filtered together.
+    process_variance : float, optional
+        The variance in the process (default is 1e-1).
+    measurement_variance : float, optional
+        The variance in the measurements (default is 1).
+    smooth : bool, optional
+        Run a Rauch-Tung-Striebel backward pass over the filtered values, so each
+        estimate also uses the observations after it. For offline research only, as
+        it looks ahead. Default is False.
+
+    Returns:
+    -------
+    pd.Series or pd.DataFrame
+        A Series containing the smoothed values for the specified column (one column
+        per symbol for a panel, or per column for a list of columns).
+
+    Example Usage:
+    --------------
+    ```python
+    data['smoothed_close'] = kalman_filter(data, 'close')
+    data[['smoothed_open', 'smoothed_close']] = kalman_filter(data, ['open', 'close'])
+    data['rts_close'] = kalman_filter(data, 'close', smooth=True)
+    ```
+    """
+    # The initial estimate is 0.0 with an uncertainty of 1.0; the gain sequence is
+    # shared by every column and settles within a few dozen bars, after which the
+    # filter runs as an EMA over all columns at once
+    smoothed_values = kalman_kernel(data[column], process_variance, measurement_variance, smooth=smooth)
+    return wrap_like(smoothed_values, data[column])
@@ -0,0 +1,901 @@
+import numpy as np
+import pandas as pd
+
+# Below this many columns, running the scalar loop once per column is cheaper than
+# the per-bar overhead of the vectorized (across columns) loop over time
+_MIN_VECTOR_COLUMNS = 64
+# From this many columns, an EMA is quicker as a loop over rows than through pandas
+_MIN_ROW_LOOP_COLUMNS = 512
+# Rows per block of the Heikin-Ashi scan, whose values are scaled by up to 2 ** this
+_HA_BLOCK_ROWS = 512
+_HA_POWERS = np.exp2(np.arange(_HA_BLOCK_ROWS + 1))
+_HA_INVERSE_POWERS = 1 / _HA_POWERS
+# Values per block of the fused Hull pipeline, small enough to stay in cache
+_HULL_BLOCK_CELLS = 1 << 14
+# Up to this window length, rolling sums are added up window by window; beyond it,
+# from cumulative sums (whose rounding no longer dominates the fitted slope)
+_DIRECT_SUM_LENGTH = 16
+
+
+def _by_column(kernel, arrays, *args):
+    results = [kernel(*(a[:, j] for a in arrays), *args) for j in range(arrays[0].shape[1])]
+    if isinstance(results[0], tuple):
+        return tuple(np.column_stack(out) for out in zip(*results))
+    return np.column_stack(results)
+
+
+def psar_kernel(high, low, initial_af=0.0, max_af=0.2, step_af=0.02, state=None):
+    """
+    Parabolic SAR state machine over contiguous NumPy arrays.
+
+    Produces exactly the values of the per-row loop in `calculate_psar`, but keeps
+    the state (PSAR, trend, extreme price, acceleration factor) in local variables
+    instead of reading and writing DataFrame cells on every bar. 2-D inputs
+    (time x symbols) are processed column-wise in a single pass over time; each
+    column starts at its first bar with a valid high and low.
+
+    Parameters:
+    ----------
+    high : array-like
+        High prices, 1-D or 2-D (time x symbols).
+    low : array-like
+        Low prices, same shape as `high`.
+    initial_af : float, optional
+        Initial acceleration factor. Default is 0.0.
+    max_af : float, optional
+        Maximum acceleration factor. Default is 0.2.
+    step_af : float, optional
+        Step increment for the acceleration factor. Default is 0.02. For 2-D inputs
+        the three factors may also be arrays with one value per column, e.g. to
+        run a parameter grid over copies of one series.
+    state : dict, optional
+        1-D only. Carries the recursion across consecutive chunks of one series: pass
+        an empty dict with the first chunk and the same dict with every following
+        chunk. The kernel reads it on entry and updates it in place.
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (psar, trend, ep, af) arrays of the same shape as the input. Bars before
+        the first valid one are NaN (trend 0).
+    """
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    if high.ndim == 2:
+        if state is not None:
+            raise ValueError("state is only supported for 1-D inputs.")
+        if high.shape[1] < _MIN_VECTOR_COLUMNS and np.ndim(initial_af) == np.ndim(max_af) == np.ndim(step_af) == 0:
+            return _by_column(psar_kernel, (high, low), initial_af, max_af, step_af)
+        return _psar_kernel_2d(high, low, initial_af, max_af, step_af)
+
+    n = len(high)
+    psar = np.full(n, np.nan)
+    trend = np.zeros(n, dtype=np.int64)
+    ep = np.full(n, np.nan)
+    af = np.full(n, np.nan)
+    if state:
+        # Continue from the previous chunk; its last (up to) two bars lead the lists
+        h = state['high'] + high.tolist()
+        l = state['low'] + low.tolist()
+        offset, start = len(state['high']), 0
+        cur_psar, cur_trend, cur_ep, cur_af = state['psar'], state['trend'], state['ep'], state['af']
+    else:
+        valid = np.flatnonzero(~(np.isnan(high) | np.isnan(low)))
+        if len(valid) == 0:
+            return psar, trend, ep, af
+        offset, start = 0, valid[0]
+        h = high.tolist()
+        l = low.tolist()
+        cur_psar, cur_trend, cur_ep, cur_af = l[start], 1, h[start], initial_af
+        psar[start], trend[start], ep[start], af[start] = cur_psar, cur_trend, cur_ep, cur_af
+
+    for i in range(max(start + 1, offset), offset + n):
+        sar = cur_psar + cur_af * (cur_ep - cur_psar)
+        if cur_trend == 1:
+            # PSAR may not exceed the prior two lows
+            sar = min(sar, l[i - 1], l[i - 2] if i > start + 1 else l[i - 1])
+            if l[i] < sar:
+                cur_trend, cur_psar, cur_ep, cur_af = -1, cur_ep, l[i], initial_af
+            else:
+                cur_psar = sar
+                if h[i] > cur_ep:
+                    cur_ep = h[i]
+                    cur_af = min(cur_af + step_af, max_af)
+        else:
+            # PSAR may not fall below the prior two highs
+            sar = max(sar, h[i - 1], h[i - 2] if i > start + 1 else h[i - 1])
+            if h[i] > sar:
+                cur_trend, cur_psar, cur_ep, cur_af = 1, cur_ep, h[i], initial_af
+            else:
+                cur_psar = sar
+                if l[i] < cur_ep:
+                    cur_ep = l[i]
+                    cur_af = min(cur_af + step_af, max_af)
+        psar[i - offset], trend[i - offset], ep[i - offset], af[i - offset] = cur_psar, cur_trend, cur_ep, cur_af
+
+    if state is not None:
+        keep = max(start, len(h) - 2)
+        state.update(psar=cur_psar, trend=cur_trend, ep=cur_ep, af=cur_af,
+                     high=h[keep:], low=l[keep:])
+    return psar, trend, ep, af
+
+
+def _psar_kernel_2d(high, low, initial_af, max_af, step_af):
+    n, m = high.shape
+    psar = np.full((n, m), np.nan)
+    trend = np.zeros((n, m), dtype=np.int64)
+    ep = np.full((n, m), np.nan)
+    af = np.full((n, m), np.nan)
+
+    cur_psar = np.full(m, np.nan)
+    cur_trend = np.zeros(m, dtype=np.int64)
+    cur_ep = np.full(m, np.nan)
+    cur_af = np.zeros(m) + initial_af
+    age = np.zeros(m, dtype=np.int64)  # bars since the column started
+
+    for i in range(n):
+        h, l = high[i], low[i]
+        active = age > 0
+        if active.any():
+            lo1, hi1 = low[i - 1], high[i - 1]
+            lo2 = np.where(age > 1, low[i - 2], lo1) if i > 1 else lo1
+            hi2 = np.where(age > 1, high[i - 2], hi1) if i > 1 else hi1
+            sar = cur_psar + cur_af * (cur_ep - cur_psar)
+            up = cur_trend == 1
+            sar = np.where(up, np.minimum(np.minimum(sar, lo1), lo2),
+                           np.maximum(np.maximum(sar, hi1), hi2))
+            rev_up = up & (l < sar)
+            rev_down = ~up & (h > sar)
+            reversed_ = rev_up | rev_down
+            extend_up = up & ~rev_up & (h > cur_ep)
+            extend_down = ~up & ~rev_down & (l < cur_ep)
+
+            new_psar = np.where(reversed_, cur_ep, sar)
+            new_ep = np.where(rev_up | extend_down, l, np.where(rev_down | extend_up, h, cur_ep))
+            new_af = np.where(reversed_, initial_af,
+                              np.where(extend_up | extend_down,
+                                       np.minimum(cur_af + step_af, max_af), cur_af))
+            new_trend = np.where(rev_up, -1, np.where(rev_down, 1, cur_trend))
+
+            cur_psar = np.where(active, new_psar, cur_psar)
+            cur_ep = np.where(active, new_ep, cur_ep)
+            cur_af = np.where(active, new_af, cur_af)
+            cur_trend = np.where(active, new_trend, cur_trend)
+
+        starting = ~active & ~(np.isnan(h) | np.isnan(l))
+        if starting.any():
+            cur_psar = np.where(starting, l, cur_psar)
+            cur_ep = np.where(starting, h, cur_ep)
+            cur_af = np.where(starting, initial_af, cur_af)
+            cur_trend = np.where(starting, 1, cur_trend)
+        age += active | starting
+
+        psar[i], trend[i], ep[i], af[i] = cur_psar, cur_trend, cur_ep, cur_af
+
+    return psar, trend, ep, af
+
+
+def supertrend_kernel(close, upper_band, lower_band, state=None):
+    """
+    Supertrend state machine with final-band carry-over (ratcheting).
+
+    The final lower band only rises while the previous close stays above it and the
+    final upper band only falls while the previous close stays below it. The trend
+    flips when the close crosses the previous final band on the opposite side.
+    Bars before the bands become available (ATR warm-up) are left as NaN. 2-D
+    inputs (time x symbols) are processed column-wise in a single pass over time.
+
+    Parameters:
+    ----------
+    close : array-like
+        Close prices, 1-D or 2-D (time x symbols).
+    upper_band : array-like
+        Basic upper band (hl2 + factor * ATR).
+    lower_band : array-like
+        Basic lower band (hl2 - factor * ATR).
+    state : dict, optional
+        1-D only. Carries the final bands, the direction and the last close across
+        consecutive chunks of one series; see `psar_kernel`.
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (final_upper, final_lower, supertrend, direction) where direction is
+        1 for an uptrend, -1 for a downtrend and 0 during warm-up.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    upper_band = np.ascontiguousarray(upper_band, dtype=np.float64)
+    lower_band = np.ascontiguousarray(lower_band, dtype=np.float64)
+    if close.ndim == 2:
+        if state is not None:
+            raise ValueError("state is only supported for 1-D inputs.")
+        if close.shape[1] < _MIN_VECTOR_COLUMNS:
+            return _by_column(supertrend_kernel, (close, upper_band, lower_band))
+        return _supertrend_kernel_2d(close, upper_band, lower_band)
+
+    n = len(close)
+    final_upper = np.full(n, np.nan)
+    final_lower = np.full(n, np.nan)
+    supertrend = np.full(n, np.nan)
+    direction = np.zeros(n, dtype=np.int64)
+
+    if state:
+        # Continue from the previous chunk, whose last close leads the lists
+        c = [state['close']] + close.tolist()
+        ub = [np.nan] + upper_band.tolist()
+        lb = [np.nan] + lower_band.tolist()
+        offset, start = 1, 0
+        fu, fl, d = state['final_upper'], state['final_lower'], state['direction']
+    else:
+        valid = np.flatnonzero(~(np.isnan(upper_band) | np.isnan(lower_band)))
+        if len(valid) == 0:
+            return final_upper, final_lower, supertrend, direction
+        offset, start = 0, valid[0]
+        c = close.tolist()
+        ub = upper_band.tolist()
+        lb = lower_band.tolist()
+        fu, fl, d = ub[start], lb[start], 1
+        final_upper[start], final_lower[start] = fu, fl
+        supertrend[start], direction[start] = fl, d
+
+    for i in range(start + 1, offset + n):
+        prev_fu, prev_fl = fu, fl
+        fu = min(ub[i], prev_fu) if c[i - 1] < prev_fu else ub[i]
+        fl = max(lb[i], prev_fl) if c[i - 1] > prev_fl else lb[i]
+        if d == -1 and c[i] > prev_fu:
+            d = 1
+        elif d == 1 and c[i] < prev_fl:
+            d = -1
+        final_upper[i - offset], final_lower[i - offset], direction[i - offset] = fu, fl, d
+        supertrend[i - offset] = fl if d == 1 else fu
+
+    if state is not None:
+        state.update(close=c[-1], final_upper=fu, final_lower=fl, direction=d)
+    return final_upper, final_lower, supertrend, direction
+
+
+def _supertrend_kernel_2d(close, upper_band, lower_band):
+    n, m = close.shape
+    final_upper = np.full((n, m), np.nan)
+    final_lower = np.full((n, m), np.nan)
+    supertrend = np.full((n, m), np.nan)
+    direction = np.zeros((n, m), dtype=np.int64)
+
+    fu = np.full(m, np.nan)
+    fl = np.full(m, np.nan)
+    d = np.zeros(m, dtype=np.int64)
+    all_active = False
+
+    for i in range(n):
+        ub, lb, c = upper_band[i], lower_band[i], close[i]
+        active = None if all_active else d != 0
+        if all_active or active.any():
+            prev_close = close[i - 1]
+            new_fu = np.where(prev_close < fu, np.minimum(ub, fu), ub)
+            new_fl = np.where(prev_close > fl, np.maximum(lb, fl), lb)
+            new_d = np.where((d == -1) & (c > fu), 1, np.where((d == 1) & (c < fl), -1, d))
+            if all_active:
+                fu, fl, d = new_fu, new_fl, new_d
+            else:
+                fu = np.where(active, new_fu, fu)
+                fl = np.where(active, new_fl, fl)
+                d = np.where(active, new_d, d)
+
+        if not all_active:
+            starting = ~active & ~(np.isnan(ub) | np.isnan(lb))
+            if starting.any():
+                fu = np.where(starting, ub, fu)
+                fl = np.where(starting, lb, fl)
+                d = np.where(starting, 1, d)
+            all_active = bool((d != 0).all())
+
+        final_upper[i], final_lower[i], direction[i] = fu, fl, d
+        supertrend[i] = np.where(d == 1, fl, np.where(d == -1, fu, np.nan))
+
+    return final_upper, final_lower, supertrend, direction
+
+
+def supertrend_flip_kernel(close, upper_band, lower_band, state=None):
+    """
+    Flip-only Supertrend loop used by the original `calculate_supertrend`.
+
+    Kept for results parity: the line takes the upper band whenever the close is
+    above the previous line value and the lower band otherwise, without carrying
+    the bands over between bars.
+
+    Parameters:
+    ----------
+    close : array-like
+        Close prices, 1-D or 2-D (time x symbols).
+    upper_band : array-like
+        Basic upper band.
+    lower_band : array-like
+        Basic lower band.
+    state : dict, optional
+        1-D only. Carries the last line value across consecutive chunks of one
+        series; see `psar_kernel`.
+
+    Returns:
+    -------
+    numpy.ndarray
+        The Supertrend line.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    upper_band = np.ascontiguousarray(upper_band, dtype=np.float64)
+    lower_band = np.ascontiguousarray(lower_band, dtype=np.float64)
+    n = len(close)
+    supertrend = np.empty(close.shape)
+    if n == 0:
+        return supertrend
+    if state is not None and close.ndim == 2:
+        raise ValueError("state is only supported for 1-D inputs.")
+
+    if close.ndim == 2 and close.shape[1] < _MIN_VECTOR_COLUMNS:
+        return _by_column(supertrend_flip_kernel, (close, upper_band, lower_band))
+    if close.ndim == 2:
+        supertrend[0] = upper_band[0]
+        for i in range(1, n):
+            supertrend[i] = np.where(close[i] > supertrend[i - 1], upper_band[i], lower_band[i])
+        return supertrend
+
+    c = close.tolist()
+    ub = upper_band.tolist()
+    lb = lower_band.tolist()
+    if state:
+        prev, start = state['line'], 0
+    else:
+        prev, start = ub[0], 1
+        supertrend[0] = prev
+    for i in range(start, n):
+        prev = ub[i] if c[i] > prev else lb[i]
+        supertrend[i] = prev
+    if state is not None:
+        state['line'] = prev
+    return supertrend
+
+
+def fibobars_kernel(highest_high, lowest_low, close, open_price, period, fibo_level):
+    """
+    Fibonacci Bars trend state machine over contiguous NumPy arrays.
+
+    Parameters:
+    ----------
+    highest_high : array-like
+        Rolling highest high over `period`, 1-D or 2-D (time x symbols).
+    lowest_low : array-like
+        Rolling lowest low over `period`.
+    close : array-like
+        Heikin-Ashi close prices.
+    open_price : array-like
+        Heikin-Ashi open prices.
+    period : int
+        The lookback period; the first `period` bars (counted from each column's
+        first valid close) are set to 0.
+    fibo_level : float or array-like
+        The Fibonacci retracement level; for 2-D inputs optionally one per column.
+
+    Returns:
+    -------
+    numpy.ndarray
+        Trend values (1 = uptrend, -1 = downtrend, 0 = warm-up).
+    """
+    highest_high = np.asarray(highest_high, dtype=np.float64)
+    lowest_low = np.asarray(lowest_low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    open_price = np.asarray(open_price, dtype=np.float64)
+    if close.ndim == 2 and close.shape[1] < _MIN_VECTOR_COLUMNS and np.ndim(fibo_level) == 0:
+        return _by_column(fibobars_kernel, (highest_high, lowest_low, close, open_price),
+                          period, fibo_level)
+    trend = np.zeros(close.shape, dtype=np.int64)
+
+    valid = ~np.isnan(close)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), len(close))
+
+    if close.ndim == 2:
+        prev = np.zeros(close.shape[1], dtype=np.int64)
+        for i in range(int(first.min()) + period, len(close)):
+            hh, ll, c = highest_high[i], lowest_low[i], close[i]
+            rng = (hh - ll) * fibo_level
+            trend1 = np.where((prev >= 0) & (rng < c - ll), 1, -1)
+            trend2 = np.where((prev <= 0) & (rng < hh - c), -1, 1)
+            prev = np.where(i >= first + period, np.where(open_price[i] > c, trend1, trend2), prev)
+            trend[i] = prev
+        return trend
+
+    hh = highest_high.tolist()
+    ll = lowest_low.tolist()
+    c = close.tolist()
+    o = open_price.tolist()
+    prev = 0
+    for i in range(int(first) + period, len(c)):
+        rng = (hh[i] - ll[i]) * fibo_level
+        if o[i] > c[i]:
+            prev = 1 if (prev >= 0 and rng < c[i] - ll[i]) else -1
+        else:
+            prev = -1 if (prev <= 0 and rng < hh[i] - c[i]) else 1
+        trend[i] = prev
+    return trend
+
+
+def heikin_ashi_kernel(open_price, high, low, close):
+    """
+    Heikin-Ashi candles over 1-D or 2-D (time x symbols) arrays.
+
+    `ha_open[t] = (ha_open[t-1] + ha_close[t-1]) / 2` is a linear recurrence whose
+    weights are powers of two, so it is solved without a row loop: scaled by
+    `2 ** t`, it becomes a cumulative sum, and scaling back is exact. The sum is
+    taken a block of `_HA_BLOCK_ROWS` rows at a time to keep the scale finite. Each
+    column starts at its first complete bar with `ha_open = (open + close) / 2`. A
+    bar with a NaN price is NaN in every output and is skipped: the next bar opens
+    from the last complete one.
+
+    Parameters:
+    ----------
+    open_price, high, low, close : array-like
+        Prices, 1-D or 2-D (time x symbols).
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (ha_open, ha_high, ha_low, ha_close)
+    """
+    open_price = np.asarray(open_price, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    ha_close = (open_price + high + low + close) / 4
+
+    columns = ha_close.reshape(len(ha_close), -1)
+    valid = ~np.isnan(columns)
+    # ha_open[t] = ha_open[t-1] / 2 + inputs[t] / 2 on complete bars, unchanged on
+    # the rest; inputs is the previous complete bar's ha_close, or open + close on
+    # each column's first bar
+    seeds = (open_price + close).reshape(columns.shape)
+    complete = bool(valid.all())
+    if complete:
+        inputs = np.vstack([seeds[:1], columns[:-1]])
+    else:
+        rows = np.arange(len(columns))[:, None]
+        last = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+        previous = np.vstack([np.full((1, columns.shape[1]), -1), last[:-1]])
+        inputs = np.take_along_axis(columns, np.maximum(previous, 0), axis=0)
+        inputs = np.where(valid & (previous < 0), seeds, inputs)
+        inputs = np.where(valid, inputs, 0.0)
+
+    ha_open = np.empty(columns.shape)
+    carry = np.zeros(columns.shape[1])
+    for start in range(0, len(columns), _HA_BLOCK_ROWS):
+        block = inputs[start:start + _HA_BLOCK_ROWS]
+        if complete:
+            halvings = np.arange(1, len(block) + 1)[:, None]
+        else:
+            halvings = np.cumsum(valid[start:start + _HA_BLOCK_ROWS], axis=0)
+        scaled = np.cumsum(block * _HA_POWERS[halvings - 1], axis=0)
+        block = (carry + scaled) * _HA_INVERSE_POWERS[halvings]
+        ha_open[start:start + len(block)] = block
+        carry = block[-1]
+    ha_open = np.where(valid, ha_open, np.nan).reshape(ha_close.shape)
+
+    ha_high = np.maximum(high, np.maximum(ha_open, ha_close))
+    ha_low = np.minimum(low, np.minimum(ha_open, ha_close))
+    return ha_open, ha_high, ha_low, ha_close
+
+
+def obv_kernel(close, volume, state=None):
+    """
+    On-Balance Volume as a signed cumulative sum.
+
+    Each bar adds its volume when the close rises, subtracts it when the close
+    falls and carries the running total otherwise, which is the same recursion as
+    the per-row loop but evaluated in a single vectorized pass (column-wise for
+    2-D inputs).
+
+    Parameters:
+    ----------
+    close : array-like
+        Close prices, 1-D or 2-D (time x symbols).
+    volume : array-like
+        Volumes, same shape as `close`.
+    state : dict, optional
+        1-D only. Carries the last close and running total across consecutive
+        chunks of one series; see `psar_kernel`.
+
+    Returns:
+    -------
+    numpy.ndarray
+        The On-Balance Volume values.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if state is not None and close.ndim == 2:
+        raise ValueError("state is only supported for 1-D inputs.")
+    carried = bool(state)
+    if carried:
+        # Lead with the previous chunk's last bar, whose flow is the running total
+        close = np.concatenate([[state['close']], close])
+        volume = np.concatenate([[0.0], volume])
+    flow = np.zeros(close.shape)
+    if len(close) > 1:
+        delta = close[1:] - close[:-1]
+        flow[1:] = np.where(delta > 0, volume[1:], np.where(delta < 0, -volume[1:], 0.0))
+    if carried:
+        flow[0] = state['obv']
+    obv = np.cumsum(flow, axis=0)
+    if state is not None and len(obv):
+        state.update(close=float(close[-1]), obv=float(obv[-1]))
+    return obv[1:] if carried else obv
+
+
+def _kalman_errors(count, error, process_variance, measurement_variance):
+    # Gains and posterior errors of the first `count` steps, cut short once the
+    # error reaches its fixed point, and the number of transient steps: from the
+    # step that reproduces its prior error on, every step uses the last gain. A run
+    # resumed from a carried error therefore switches at the same bar as a full run.
+    # Some variances never settle on one float but cycle through two or three
+    # neighbouring ones; the first repeat of a recent error ends the transient too.
+    gains, errors = [], []
+    for _ in range(count):
+        priori_error = error + process_variance
+        gain = priori_error / (priori_error + measurement_variance)
+        error = (1 - gain) * priori_error
+        repeated = error in errors[-8:]
+        gains.append(gain)
+        errors.append(error)
+        if repeated:
+            return np.array(gains), np.array(errors), len(gains) - 1
+    return np.array(gains), np.array(errors), len(gains)
+
+
+def _seeded_ema(seeds, alpha):
+    # EMA (adjust=False) down the rows; every column starts at its first non-NaN and
+    # has no NaN after that until its end (rows after the end are not meaningful)
+    if seeds.shape[1] < _MIN_ROW_LOOP_COLUMNS:
+        return pd.DataFrame(seeds, copy=False).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    ema = np.empty_like(seeds)
+    current = seeds[0].copy()
+    for i in range(len(seeds)):
+        value = seeds[i]
+        current = np.where(np.isnan(current), value, current + alpha * (value - current))
+        ema[i] = current
+    return ema
+
+
+def kalman_kernel(values, process_variance=1e-1, measurement_variance=1, state=None, smooth=False):
+    """
+    Scalar random-walk Kalman filter over 1-D or 2-D (time x series) arrays.
+
+    The gain sequence does not depend on the observations, so it is computed once
+    and shared by every column, only until the error covariance stops changing
+    (a few dozen steps for the default variances). Each column runs those
+    transient steps from its first non-NaN observation, vectorized across columns;
+    after them the gain is constant and the filter is an EMA with `alpha=gain`,
+    which runs as one `ewm` over all columns. A NaN after the start makes the rest
+    of its column NaN, as in the step-by-step filter.
+
+    With `smooth`, a Rauch-Tung-Striebel backward pass follows. Its gain
+    `error / (error + process_variance)` is also constant in the steady state, where
+    the pass is an EMA over the reversed estimates; the transient steps run
+    backwards across columns. Smoothed estimates use later observations, so they
+    are for offline research only.
+
+    Parameters:
+    ----------
+    values : array-like
+        Observations, 1-D or 2-D (time x series).
+    process_variance : float, optional
+        The variance in the process (default is 1e-1).
+    measurement_variance : float, optional
+        The variance in the measurements (default is 1).
+    state : dict, optional
+        1-D only. Carries the estimate, its error and whether a NaN has ended the
+        series across consecutive chunks of one series; see `psar_kernel`.
+    smooth : bool, optional
+        Return the RTS-smoothed estimates instead of the filtered ones. Default is
+        False. Not available with `state`.
+
+    Returns:
+    -------
+    numpy.ndarray
+        The filtered (or smoothed) estimates, same shape as `values`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if state is not None and (values.ndim == 2 or smooth):
+        raise ValueError("state is only supported for 1-D inputs, without smoothing.")
+    columns = values.reshape(len(values), -1)
+    n, m = columns.shape
+    estimates = np.full((n, m), np.nan)
+    if n == 0 or (state and state.get('stopped')):
+        # A NaN in an earlier chunk ended the series, as in a single run
+        return estimates.reshape(values.shape)
+
+    carried = bool(state)
+    gains, errors, steps = _kalman_errors(n, state['error'] if carried else 1.0,
+                                          process_variance, measurement_variance)
+    observed = ~np.isnan(columns)
+    rows = np.arange(n)[:, None]
+    if observed.all():
+        first, end, live = np.zeros(m, dtype=np.int64), np.full(m, n), True
+    else:
+        if carried:
+            first = np.zeros(m, dtype=np.int64)
+        else:
+            first = np.where(observed.any(axis=0), np.argmax(observed, axis=0), n)
+        # Rows from the first observation up to (not including) the first NaN after it
+        live = ~np.logical_or.accumulate(~observed & (rows >= first), axis=0) & (rows >= first)
+        end = live.sum(axis=0) + first
+
+    # Transient steps, one row per column at a time
+    estimate = np.full(m, state['estimate'] if carried else 0.0)
+    cols = np.arange(m)
+    for k in range(min(steps, n)):
+        row = first + k
+        active = row < end
+        if not active.any():
+            break
+        r, c = row[active], cols[active]
+        estimate[c] = estimate[c] + gains[k] * (columns[r, c] - estimate[c])
+        estimates[r, c] = estimate[c]
+
+    # Steady state: an EMA seeded with each column's last transient estimate
+    steady_start = first + steps
+    seeded = steady_start < end
+    if seeded.any() and live is True:
+        # Every column observed on every row: the steady rows are one slice
+        seeds = np.empty((n - steps + 1, m))
+        seeds[0] = estimate
+        seeds[1:] = columns[steps:]
+        estimates[steps:] = _seeded_ema(seeds, gains[-1])[1:]
+    elif seeded.any():
+        tail = live & (rows >= steady_start)
+        seeds = np.empty((n + 1, m))
+        seeds[0] = np.nan
+        np.copyto(seeds[1:], np.where(tail, columns, np.nan))
+        seeds[steady_start[seeded], cols[seeded]] = estimate[seeded]
+        estimates = np.where(tail, _seeded_ema(seeds, gains[-1])[1:], estimates)
+
+    if state is not None and end[0] > first[0]:
+        state.update(estimate=estimates[end[0] - 1, 0], error=errors[min(end[0] - first[0], len(errors)) - 1])
+    if state is not None and first[0] < n and end[0] < n:
+        state['stopped'] = True
+    if not smooth:
+        return estimates.reshape(values.shape)
+    return _rts_smooth(estimates, errors, steps, process_variance, live, first, end).reshape(values.shape)
+
+
+def _rts_smooth(estimates, errors, steps, process_variance, live, first, end):
+    n, m = estimates.shape
+    smoothed = np.full((n, m), np.nan)
+    rows = np.arange(n)[:, None]
+    ratios = errors / (errors + process_variance)
+
+    # Steady rows, backwards: smoothed[t] = ratio * smoothed[t + 1] + (1 - ratio) * estimates[t]
+    if live is True and steps < n:
+        smoothed[steps:] = _seeded_ema(estimates[steps:][::-1], 1 - ratios[-1])[::-1]
+    elif live is not True:
+        tail = live & (rows >= first + steps)
+        if tail.any():
+            reverse = np.where(tail, estimates, np.nan)[::-1]
+            smoothed = np.where(tail, _seeded_ema(reverse, 1 - ratios[-1])[::-1], smoothed)
+
+    cols = np.arange(m)
+    for k in range(min(steps, n) - 1, -1, -1):
+        row = first + k
+        active = row < end
+        if not active.any():
+            continue
+        r, c = row[active], cols[active]
+        last = r + 1 >= end[active]
+        following = np.where(last, estimates[r, c], smoothed[np.minimum(r + 1, n - 1), c])
+        smoothed[r, c] = estimates[r, c] + ratios[k] * (following - estimates[r, c])
+    return smoothed
+
+
+def window_sums_kernel(values, length, squares=False, block=None):
+    """
+    Rolling sums for fixed-length windows: sum(y), sum(k * y) and optionally sum(y ** 2),
+    where k = 0 .. length - 1 counts from the oldest bar of each window.
+
+    The sums come from differences of cumulative sums, so the cost does not depend
+    on `length`. To stay accurate on long series, the rows are processed in blocks
+    (overlapping by `length - 1` rows) with fresh cumulative sums and every value is
+    taken relative to a per-block, per-column reference, so the partial sums never
+    grow with the position in the series or with the price level. The sums are of
+    `values - ref`; callers add the reference back where it matters. Windows
+    containing NaN are NaN. Works along the first axis of 1-D or 2-D arrays.
+
+    The weighted cumulative sum carries a rounding error that grows with the
+    square of the block length, while a least-squares slope divides `sum_ky` by
+    roughly `length ** 4 / 12`. Windows of up to `_DIRECT_SUM_LENGTH` rows are
+    therefore summed directly, and longer ones use blocks of at most `64 * length`
+    rows, which keeps fitted slopes within about 1e-10 of the values' scale.
+
+    Parameters:
+    ----------
+    values : array-like
+        1-D or 2-D (time x symbols) values.
+    length : int
+        The window length.
+    squares : bool, optional
+        Also return the sum of squared deviations. Default is False.
+    block : int, optional
+        Output rows per block. Default is max(4096, 4 * length), capped at
+        64 * length for windows summed through cumulative sums.
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (ref, sum_y, sum_ky) or (ref, sum_y, sum_ky, sum_yy), each shaped like `values`
+        and NaN for the first `length - 1` rows.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    one_dim = values.ndim == 1
+    if one_dim:
+        values = values[:, None]
+    n, m = values.shape
+    if block is None:
+        block = max(4096, 4 * length)
+        if length > _DIRECT_SUM_LENGTH:
+            block = min(block, 64 * length)
+
+    outputs = [np.full((n, m), np.nan) for _ in range(4 if squares else 3)]
+    for start in range(length - 1, n, block):
+        stop = min(start + block, n)
+        segment = values[start - length + 1:stop]
+        missing = np.isnan(segment)
+        with np.errstate(invalid='ignore'):
+            ref = np.nanmean(np.where(missing.all(axis=0), 0.0, segment), axis=0)
+        dev = np.where(missing, 0.0, segment - ref)
+        head = np.zeros((1, m))
+        cn = np.concatenate([head, np.cumsum(missing, axis=0)])
+        valid = (cn[length:] - cn[:-length]) == 0
+        if length <= _DIRECT_SUM_LENGTH:
+            windows = [dev[j:len(dev) - length + 1 + j] for j in range(length)]
+            sum_y = sum(windows)
+            sum_ky = sum(j * window for j, window in enumerate(windows))
+            sum_yy = sum(window * window for window in windows) if squares else None
+        else:
+            k = np.arange(len(segment), dtype=np.float64)[:, None]
+            c0 = np.concatenate([head, np.cumsum(dev, axis=0)])
+            c1 = np.concatenate([head, np.cumsum(k * dev, axis=0)])
+            sum_y = c0[length:] - c0[:-length]
+            # Re-base the weights so k counts from each window's first row
+            sum_ky = c1[length:] - c1[:-length] - k[:len(sum_y)] * sum_y
+            if squares:
+                c2 = np.concatenate([head, np.cumsum(dev * dev, axis=0)])
+                sum_yy = c2[length:] - c2[:-length]
+
+        rows = slice(start, stop)
+        outputs[0][rows] = np.where(valid, ref, np.nan)
+        outputs[1][rows] = np.where(valid, sum_y, np.nan)
+        outputs[2][rows] = np.where(valid, sum_ky, np.nan)
+        if squares:
+            outputs[3][rows] = np.where(valid, sum_yy, np.nan)
+
+    if one_dim:
+        outputs = [out[:, 0] for out in outputs]
+    return tuple(outputs)
+
+
+def wma_kernel(values, length, block=None):
+    """
+    Linearly weighted moving average (weights 1 .. `length`, newest heaviest) over
+    1-D or 2-D (time x symbols) arrays, in O(n) whatever `length` is.
+
+    Keeps a running sum and a running weighted sum: sliding the window one bar
+    adds `length * y` to the weighted sum and takes away the previous window's
+    sum, so both are cumulative sums of per-bar increments. As in
+    `window_sums_kernel`, the rows are processed in blocks with values taken
+    relative to a per-block, per-column reference, so the sums stay small and
+    accurate on long price series. Windows containing NaN are NaN.
+
+    Parameters:
+    ----------
+    values : array-like
+        1-D or 2-D (time x symbols) values.
+    length : int
+        The window length.
+    block : int, optional
+        Output rows per block. Default is max(4096, 4 * length).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The WMA, NaN for the first `length - 1` rows.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    block = block or max(4096, 4 * length)
+    weights = np.arange(1, length + 1, dtype=np.float64)
+
+    out = np.full(values.shape, np.nan)
+    for start in range(length - 1, n, block):
+        stop = min(start + block, n)
+        segment = values[start - length + 1:stop]
+        missing = np.isnan(segment)
+        gaps = missing.any()
+        if gaps:
+            with np.errstate(invalid='ignore'):
+                ref = np.nanmean(np.where(missing.all(axis=0), 0.0, segment), axis=0)
+            dev = np.where(missing, 0.0, segment - ref)
+        else:
+            ref = segment.mean(axis=0)
+            dev = segment - ref
+
+        # sums[i]: the window ending at output row i; weighted[i] follows from
+        # weighted[i - 1] + length * (newest value) - sums[i - 1]
+        c0 = np.cumsum(dev, axis=0)
+        sums = c0[length - 1:].copy()
+        sums[1:] -= c0[:len(c0) - length]
+        weighted = np.empty_like(sums)
+        weighted[0] = weights @ dev[:length]
+        weighted[1:] = length * dev[length:] - sums[:-1]
+        np.cumsum(weighted, axis=0, out=weighted)
+        result = ref + weighted / weights.sum()
+        if gaps:
+            cn = np.cumsum(missing, axis=0)
+            counts = cn[length - 1:].copy()
+            counts[1:] -= cn[:len(cn) - length]
+            result = np.where(counts == 0, result, np.nan)
+        out[start:stop] = result
+
+    return out
+
+
+def hull_kernel(values, period, triple=False, out=None, block=None):
+    """
+    Hull moving average, or with `triple` the THMA `3 * (hma1 - hma2) + hma3` where
+    each HMA smooths the previous one, in a single pass over the rows.
+
+    HMA = WMA(2 * WMA(values, period // 2) - WMA(values, period), sqrt(period)).
+    Rather than running the WMAs one after another over the whole series, the rows
+    are taken a block at a time through every stage, each stage led by the last
+    rows of its own input from the previous block. Temporaries are block-sized and
+    the result is written into `out`.
+
+    Parameters:
+    ----------
+    values : array-like
+        1-D or 2-D (time x symbols) values. float32 input is computed in float64
+        one block at a time.
+    period : int
+        The HMA period (at least 2).
+    triple : bool, optional
+        Compute the THMA. Default is False.
+    out : numpy.ndarray, optional
+        Buffer shaped like `values` for the result. Default is a new float64 array.
+    block : int, optional
+        Rows per block. Default is about `_HULL_BLOCK_CELLS` values, and at least
+        4 * period rows.
+
+    Returns:
+    -------
+    numpy.ndarray
+        `out`, NaN until every window of the chain is full.
+    """
+    values = np.asarray(values)
+    half, root = int(period / 2), int(period ** 0.5)
+    if half < 1:
+        raise ValueError("period must be at least 2.")
+    if out is None:
+        out = np.empty(values.shape)
+    block = block or max(4 * period, _HULL_BLOCK_CELLS // max(values[:1].size, 1))
+
+    # Per HMA in the chain: the last rows of its input and of its 2 * WMA - WMA line
+    hmas = 3 if triple else 1
+    tail = values.shape[1:]
+    inputs = [np.full((period - 1,) + tail, np.nan) for _ in range(hmas)]
+    diffs = [np.full((root - 1,) + tail, np.nan) for _ in range(hmas)]
+    for start in range(0, len(values), block):
+        x = values[start:start + block].astype(np.float64)
+        stages = []
+        for k in range(hmas):
+            segment = np.concatenate([inputs[k], x])
+            inputs[k] = segment[len(segment) - period + 1:]
+            rows = len(segment)
+            diff = (2 * wma_kernel(segment, half, rows) - wma_kernel(segment, period, rows))[period - 1:]
+            segment = np.concatenate([diffs[k], diff])
+            diffs[k] = segment[len(segment) - root + 1:]
+            x = wma_kernel(segment, root, len(segment))[root - 1:]
+            stages.append(x)
+        out[start:start + len(x)] = 3 * (stages[0] - stages[1]) + stages[2] if triple else x
+    return out
@@ -0,0 +1,498 @@
+import asyncio
+import csv
+import math
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+from . import streaming
+from .profiling import span
+from .adx import calculate_adx
+from .calculate_aroon import calculate_aroon
+from .calculate_atr import calculate_atr
+from .calculate_bbp import calculate_bbp
+from .calculate_bollinger_bands import calculate_bollinger_bands
+from .calculate_coppock_curve import calculate_coppock_curve
+from .calculate_dirmov import calculate_dirmov
+from .calculate_donchian import calculate_donchian
+from .calculate_ema import calculate_ema
+from .calculate_ichimoku import calculate_ichimoku
+from .calculate_kairi_relative_index import kairi_relative_index
+from .calculate_kvo import calculate_kvo
+from .calculate_linreg_slope import rolling_linreg
+from .calculate_macd import calculate_macd
+from .calculate_mass_index import mass_index
+from .calculate_obv import calculate_obv
+from .calculate_psar import calculate_psar
+from .calculate_sma import calculate_sma
+from .fibobars import calculate_fibobars
+from .heikin_ashi import calculate_heikin_ashi
+from .hma import hma, wma
+from .kalman_filter import kalman_filter
+from .percentage_oscillator import calculate_percentage_oscillator
+from .rsi import calculate_rsi
+from .stochastic_oscillator import calculate_stochastic
+from .supertrend import calculate_supertrend
+from .thma import thma
+
+# Ticks flow through three stages joined by bounded asyncio queues:
+#   source -> [ticks] -> aggregator -> [bars] -> indicators -> [updates] -> consumer
+# A full queue suspends the stage feeding it, so a slow consumer slows the
+# indicators, then the aggregator, then the reads from the source (backpressure)
+# instead of buffering without limit. Indicators are the `streaming` classes, which
+# update in O(1) per closed bar from their carried state.
+
+# Indicator function -> its incremental counterpart, built with the same parameters
+STREAMING = {
+    calculate_sma: streaming.SMA,
+    calculate_ema: streaming.EMA,
+    wma: streaming.WMA,
+    calculate_macd: streaming.MACD,
+    calculate_rsi: streaming.RSI,
+    calculate_atr: streaming.ATR,
+    calculate_bollinger_bands: streaming.BollingerBands,
+    calculate_stochastic: streaming.Stochastic,
+    calculate_adx: streaming.ADX,
+    calculate_dirmov: streaming.DirMov,
+    calculate_donchian: streaming.Donchian,
+    calculate_aroon: streaming.Aroon,
+    calculate_ichimoku: streaming.Ichimoku,
+    calculate_kvo: streaming.KVO,
+    calculate_bbp: streaming.BBP,
+    calculate_percentage_oscillator: streaming.PercentageOscillator,
+    calculate_coppock_curve: streaming.CoppockCurve,
+    calculate_heikin_ashi: streaming.HeikinAshi,
+    mass_index: streaming.MassIndex,
+    kairi_relative_index: streaming.KairiRelativeIndex,
+    calculate_fibobars: streaming.Fibobars,
+    calculate_obv: streaming.OBV,
+    calculate_psar: streaming.PSAR,
+    calculate_supertrend: streaming.Supertrend,
+    kalman_filter: streaming.KalmanFilter,
+    hma: streaming.HMA,
+    thma: streaming.THMA,
+    rolling_linreg: streaming.RollingLinreg,
+}
+
+Tick = namedtuple('Tick', ['symbol', 'time', 'price', 'size'])
+# `time` is the start of the bar in epoch seconds; `values` maps subscription name
+# to the indicator's output for this bar
+BarUpdate = namedtuple('BarUpdate', ['symbol', 'time', 'bar', 'values'])
+
+_END = object()
+
+
+class _Failed:
+    # A stage's exception, forwarded to the consumer through the updates queue
+    def __init__(self, error):
+        self.error = error
+
+
+def parse_tick(line):
+    """
+    Parses a 'symbol,time,price[,size]' line; `time` is epoch seconds or ISO 8601.
+    """
+    symbol, stamp, price, *size = line if isinstance(line, list) else line.strip().split(',')
+    try:
+        stamp = float(stamp)
+    except ValueError:
+        stamp = datetime.fromisoformat(stamp).timestamp()
+    return Tick(symbol, stamp, float(price), float(size[0]) if size and size[0] else 0.0)
+
+
+class TickSource:
+    """
+    Base class for tick sources: an async iterator of `Tick`s in time order.
+    """
+
+    def __aiter__(self):
+        return self.ticks()
+
+    async def ticks(self):
+        raise NotImplementedError
+        yield
+
+
+class FileReplay(TickSource):
+    """
+    Replays ticks from a CSV file of 'symbol,time,price,size' rows.
+
+    Parameters:
+    ----------
+    path : str
+        The file; a header row is skipped.
+    speed : float, optional
+        Replay this many times faster than the ticks' own timestamps. Default is
+        None (as fast as the pipeline accepts them).
+    """
+
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = speed
+
+    async def ticks(self):
+        started, first = time.monotonic(), None
+        with open(self.path, newline='') as f:
+            for row in csv.reader(f):
+                try:
+                    tick = parse_tick(row)
+                except ValueError:
+                    continue
+                if self.speed:
+                    first = tick.time if first is None else first
+                    delay = (tick.time - first) / self.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                yield tick
+
+
+class SocketFeed(TickSource):
+    """
+    Reads newline-delimited 'symbol,time,price,size' ticks from a TCP socket.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+
+    async def ticks(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    yield parse_tick(line.decode())
+                except ValueError:
+                    continue
+        finally:
+            writer.close()
+
+
+async def serve_replay(path, host='127.0.0.1', port=0):
+    """
+    Serves the ticks of a CSV file to each client that connects, as a local
+    stand-in for a live feed (see `SocketFeed`).
+
+    Returns:
+    -------
+    asyncio.Server
+        Its `sockets[0].getsockname()` gives the bound address.
+    """
+    async def handle(reader, writer):
+        with open(path, 'rb') as f:
+            for line in f:
+                writer.write(line)
+                await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+class LatencyCounter:
+    """
+    Count, mean, max and percentiles of the seconds one pipeline stage takes,
+    percentiles over the last `window` samples.
+    """
+
+    def __init__(self, window=4096):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self._recent.append(seconds)
+
+    def stats(self):
+        recent = sorted(self._recent)
+
+        def percentile(q):
+            return recent[min(int(q * len(recent)), len(recent) - 1)] if recent else math.nan
+
+        return {'count': self.count, 'mean': self.total / self.count if self.count else math.nan,
+                'p50': percentile(0.5), 'p99': percentile(0.99), 'max': self.max}
+
+
+class BarAggregator:
+    """
+    Builds OHLCV bars per symbol from ticks and closes them on time boundaries.
+
+    A bar covers [start, start + interval) in tick time. It closes when the
+    watermark (the latest tick time seen on any symbol, or the clock) reaches its
+    end, so a symbol that stops trading still gets its bar closed. Ticks for a
+    bar that has already closed are dropped and counted in `late`.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.watermark = -math.inf
+        self.late = 0
+        self._bars = {}
+        self._ends = {}  # bar end -> symbols with an open bar ending then
+
+    def add(self, tick):
+        """Adds a tick; returns the bars it closes, as (symbol, time, bar) tuples."""
+        closed = self.advance(tick.time)
+        start = tick.time - tick.time % self.interval
+        if start + self.interval <= self.watermark:
+            # Late tick for a bar that has already closed
+            self.late += 1
+            return closed
+        bar = self._bars.get(tick.symbol)
+        if bar is None:
+            self._bars[tick.symbol] = {'time': start, 'open': tick.price, 'high': tick.price,
+                                       'low': tick.price, 'close': tick.price, 'volume': tick.size}
+            self._ends.setdefault(start + self.interval, set()).add(tick.symbol)
+        else:
+            if tick.price > bar['high']:
+                bar['high'] = tick.price
+            elif tick.price < bar['low']:
+                bar['low'] = tick.price
+            bar['close'] = tick.price
+            bar['volume'] += tick.size
+        return closed
+
+    def advance(self, now):
+        """Moves the watermark to `now` and returns the bars that closed."""
+        if now <= self.watermark:
+            return []
+        self.watermark = now
+        closed = []
+        for end in sorted(end for end in self._ends if end <= now):
+            for symbol in sorted(self._ends.pop(end)):
+                bar = self._bars.pop(symbol)
+                closed.append((symbol, bar.pop('time'), bar))
+        return closed
+
+    def flush(self):
+        """Closes every open bar."""
+        return self.advance(math.inf)
+
+
+class _Subscription:
+    def __init__(self, name, cls, args, kwargs, symbols):
+        self.name, self.cls, self.args, self.kwargs = name, cls, args, kwargs
+        self.symbols = None if symbols is None else set(symbols)
+        self.instances = {}
+
+    def indicator(self, symbol):
+        instance = self.instances.get(symbol)
+        if instance is None:
+            instance = self.instances[symbol] = self.cls(*self.args, **self.kwargs)
+        return instance
+
+
+class LivePipeline:
+    """
+    Ticks -> bars -> incrementally updated indicators, for many symbols at once.
+
+    Parameters:
+    ----------
+    source : TickSource
+        Where ticks come from, e.g. `FileReplay` or `SocketFeed`.
+    interval : float
+        Bar length in seconds.
+    queue_size : int, optional
+        Capacity of each queue between stages. Default is 10,000.
+    clock_grace : float, optional
+        For live feeds stamped with wall-clock time: also close bars once the wall
+        clock is this many seconds past their end, even if no later tick arrives.
+        Default is None (close on tick time only).
+
+    Example Usage:
+    --------------
+    ```python
+    pipeline = LivePipeline(SocketFeed('127.0.0.1', 9000), interval=60)
+    pipeline.subscribe(calculate_rsi, 14)
+    pipeline.subscribe(calculate_supertrend, 10, 3, name='supertrend')
+    pipeline.subscribe(calculate_macd, symbols=['AAPL', 'MSFT'])
+
+    async def main():
+        async for update in pipeline.updates():
+            rsi = update.values['calculate_rsi(14)']
+            line = update.values['supertrend']
+        print(pipeline.stats())
+
+    asyncio.run(main())
+    ```
+    """
+
+    def __init__(self, source, interval, queue_size=10_000, clock_grace=None):
+        self.source = source
+        self.aggregator = BarAggregator(interval)
+        self.queue_size = queue_size
+        self.clock_grace = clock_grace
+        self._subscriptions = []
+        self._heikin_ashi = None
+        self.latency = {stage: LatencyCounter() for stage in
+                        ('tick_queue', 'aggregate', 'bar_queue', 'indicators', 'update_queue', 'end_to_end')}
+        self.counts = {'ticks': 0, 'bars': 0, 'updates': 0}
+        self._queues = {}
+
+    def subscribe(self, func, *args, name=None, symbols=None, **kwargs):
+        """
+        Updates `func` on every closed bar of `symbols` (default: every symbol).
+
+        Parameters:
+        ----------
+        func : callable
+            An indicator function with an entry in `STREAMING`.
+        *args, **kwargs
+            Its parameters, as for a direct call (without the data).
+        name : str, optional
+            Key of the indicator in `BarUpdate.values`. Default is the function name
+            with its arguments, e.g. 'calculate_rsi(14)'.
+        symbols : iterable of str, optional
+            Restrict the subscription to these symbols.
+
+        Returns:
+        -------
+        str
+            The subscription's name.
+        """
+        if func not in STREAMING:
+            raise ValueError(f"{getattr(func, '__name__', func)} has no streaming counterpart.")
+        if name is None:
+            params = [repr(a) for a in args] + [f'{k}={v!r}' for k, v in kwargs.items()]
+            name = f"{func.__name__}({', '.join(params)})"
+        if any(sub.name == name for sub in self._subscriptions):
+            raise ValueError(f"A subscription named '{name}' already exists.")
+        cls = STREAMING[func]
+        self._subscriptions.append(_Subscription(name, cls, args, kwargs, symbols))
+        if any(field.startswith('ha_') for field in cls(*args, **kwargs).fields):
+            self._heikin_ashi = {}
+        return name
+
+    def warm_up(self, symbol, history):
+        """
+        Replays a DataFrame of past bars ('open', 'high', 'low', 'close', 'volume')
+        through the symbol's indicators, so live values continue from the history.
+        """
+        columns = [history[c].tolist() for c in ('open', 'high', 'low', 'close', 'volume')]
+        for values in zip(*columns):
+            self._compute(symbol, dict(zip(('open', 'high', 'low', 'close', 'volume'), values)))
+
+    def _compute(self, symbol, bar):
+        if self._heikin_ashi is not None:
+            candles = self._heikin_ashi.get(symbol)
+            if candles is None:
+                candles = self._heikin_ashi[symbol] = streaming.HeikinAshi()
+            bar = {**bar, **candles.update(bar)}
+        values = {}
+        for sub in self._subscriptions:
+            if sub.symbols is None or symbol in sub.symbols:
+                with span(f'live.{sub.name}'):
+                    values[sub.name] = sub.indicator(symbol).update(bar)
+        return values
+
+    async def _read(self, ticks):
+        async for tick in self.source:
+            await ticks.put((tick, time.perf_counter()))
+        await ticks.put(_END)
+
+    async def _clock(self, ticks):
+        while True:
+            await asyncio.sleep(min(self.aggregator.interval / 10, 1.0))
+            await ticks.put((time.time() - self.clock_grace, time.perf_counter()))
+
+    async def _aggregate(self, ticks, bars):
+        aggregator = self.aggregator
+        while True:
+            item = await ticks.get()
+            if item is _END:
+                break
+            tick, queued = item
+            received = time.perf_counter()
+            self.latency['tick_queue'].record(received - queued)
+            if isinstance(tick, Tick):
+                self.counts['ticks'] += 1
+                closed = aggregator.add(tick)
+            else:
+                closed = aggregator.advance(tick)
+            self.latency['aggregate'].record(time.perf_counter() - received)
+            for item in closed:
+                await bars.put((item, received, time.perf_counter()))
+        for item in aggregator.flush():
+            await bars.put((item, time.perf_counter(), time.perf_counter()))
+        await bars.put(_END)
+
+    async def _indicators(self, bars, updates):
+        while True:
+            item = await bars.get()
+            if item is _END:
+                break
+            (symbol, start, bar), triggered, queued = item
+            begun = time.perf_counter()
+            self.latency['bar_queue'].record(begun - queued)
+            values = self._compute(symbol, bar)
+            self.counts['bars'] += 1
+            done = time.perf_counter()
+            self.latency['indicators'].record(done - begun)
+            await updates.put((BarUpdate(symbol, start, bar, values), triggered, done))
+        await updates.put(_END)
+
+    async def _guard(self, stage, updates):
+        # A failing stage would leave the stages after it waiting forever; hand its
+        # exception to `updates`, which raises it in the consumer
+        try:
+            await stage
+        except Exception as error:
+            await updates.put(_Failed(error))
+
+    async def updates(self):
+        """
+        Runs the pipeline and yields a `BarUpdate` per closed bar and symbol, until
+        the source is exhausted. Leaving the loop early stops the pipeline. An
+        exception in any stage (the source, a malformed tick, an indicator update)
+        stops the pipeline and is raised here.
+        """
+        ticks, bars, updates = (asyncio.Queue(self.queue_size) for _ in range(3))
+        self._queues = {'ticks': ticks, 'bars': bars, 'updates': updates}
+        stages = [self._read(ticks), self._aggregate(ticks, bars), self._indicators(bars, updates)]
+        if self.clock_grace is not None:
+            stages.append(self._clock(ticks))
+        tasks = [asyncio.create_task(self._guard(stage, updates)) for stage in stages]
+        try:
+            while True:
+                item = await updates.get()
+                if item is _END:
+                    break
+                if isinstance(item, _Failed):
+                    raise item.error
+                update, triggered, queued = item
+                now = time.perf_counter()
+                self.latency['update_queue'].record(now - queued)
+                self.latency['end_to_end'].record(now - triggered)
+                self.counts['updates'] += 1
+                yield update
+            await asyncio.gather(*tasks[:3])
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self, on_update=None):
+        """
+        Runs the pipeline to the end of the source, calling `on_update(update)` (a
+        function or coroutine function) for each `BarUpdate`; returns `stats()`.
+        """
+        async for update in self.updates():
+            if on_update is not None:
+                result = on_update(update)
+                if asyncio.iscoroutine(result):
+                    await result
+        return self.stats()
+
+    def stats(self):
+        """
+        Per-stage latency (seconds), item counts and current queue depths.
+        """
+        return {'latency': {stage: counter.stats() for stage, counter in self.latency.items()},
+                'counts': dict(self.counts),
+                'queues': {name: queue.qsize() for name, queue in self._queues.items()}}
+
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled
+
+
+@profiled
+def as_panel(data, index=None, columns=None):
+    """
+    Converts an OHLCV dict of 2-D arrays into a panel the indicators accept.
+
+    A panel is a mapping of field name ('open', 'high', 'low', 'close', 'volume', ...)
+    to a DataFrame with one row per bar and one column per symbol. Every indicator
+    in the library accepts a panel wherever it accepts a single-symbol DataFrame and
+    computes all symbols in one vectorized pass. Float64 arrays are wrapped without
+    copying.
+
+    Parameters:
+    ----------
+    data : dict
+        Field name -> 2-D array (time x symbols) or DataFrame.
+    index : array-like, optional
+        Row labels for arrays that are not already DataFrames. Default is a RangeIndex.
+    columns : array-like, optional
+        Symbol labels for arrays that are not already DataFrames. Default is a RangeIndex.
+
+    Returns:
+    -------
+    dict
+        Field name -> pandas.DataFrame.
+
+    Example Usage:
+    --------------
+    ```python
+    panel = as_panel({'high': high, 'low': low, 'close': close}, columns=symbols)
+    rsi = calculate_rsi(panel, 14)            # DataFrame, one column per symbol
+    upper, lower = calculate_bollinger_bands(panel)
+    ```
+    """
+    panel = {}
+    for field, values in data.items():
+        if isinstance(values, pd.DataFrame):
+            panel[field] = values
+        else:
+            values = np.asarray(values)
+            if values.ndim != 2:
+                raise ValueError(f"Panel field '{field}' must be 2-D (time x symbols).")
+            panel[field] = pd.DataFrame(values, index=index, columns=columns, copy=False)
+    return panel
+
+
+def stack_symbols(frames, fields=('open', 'high', 'low', 'close', 'volume')):
+    """
+    Builds a panel from per-symbol OHLCV DataFrames.
+
+    Symbols are aligned on the union of their indexes; bars a symbol does not have
+    are NaN, and the path-dependent indicators start each column at its first
+    valid bar.
+
+    Parameters:
+    ----------
+    frames : dict
+        Symbol -> DataFrame with the OHLCV columns.
+    fields : tuple of str, optional
+        Columns to stack. Fields missing from every frame are skipped.
+
+    Returns:
+    -------
+    dict
+        Field name -> DataFrame (time x symbols).
+    """
+    panel = {}
+    for field in fields:
+        columns = {symbol: frame[field] for symbol, frame in frames.items() if field in frame}
+        if columns:
+            panel[field] = pd.concat(columns, axis=1)
+    return panel
+
+
+def wrap_like(values, like):
+    """
+    Wraps a kernel result in the pandas container of `like` (Series or DataFrame).
+    """
+    if values.ndim == 2:
+        return pd.DataFrame(values, index=like.index, columns=like.columns, copy=False)
+    return pd.Series(values, index=like.index, copy=False)
@@ -0,0 +1,250 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled
+
+# Per-process handles on the shared input blocks, set by `_attach_inputs`
+_INPUTS = {}
+
+
+def _attach_inputs(spec):
+    # Pool initializer: map every input field once per worker process
+    for field, (name, total) in spec['fields'].items():
+        shm = shared_memory.SharedMemory(name=name)
+        _INPUTS[field] = (shm, np.ndarray((total,), dtype=np.float64, buffer=shm.buf))
+    _INPUTS['__meta__'] = spec
+
+
+def _frame_for(inputs, position):
+    meta = inputs['__meta__']
+    start, length = meta['offsets'][position], meta['lengths'][position]
+    return pd.DataFrame({field: inputs[field][1][start:start + length] for field in meta['fields']})
+
+
+def _collect(result, func, fields, outputs=None):
+    # Normalizes whatever an indicator returns into (names, list of 1-D arrays)
+    if isinstance(result, pd.DataFrame):
+        names = list(outputs) if outputs else [c for c in result.columns if c not in fields]
+        return names, [result[name].to_numpy(dtype=np.float64) for name in names]
+    if isinstance(result, (tuple, list)):
+        names = list(outputs) if outputs else [f'{func.__name__}_{i}' for i in range(len(result))]
+        return names, [np.asarray(values, dtype=np.float64) for values in result]
+    name = getattr(result, 'name', None)
+    names = list(outputs) if outputs else [name if name and name not in fields else func.__name__]
+    return names, [np.asarray(result, dtype=np.float64)]
+
+
+def _run_chunk(task, inputs=None):
+    func, args, kwargs, outputs, out_name, positions = task
+    inputs = inputs or _INPUTS
+    meta = inputs['__meta__']
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        out = np.ndarray((len(outputs), meta['total']), dtype=np.float64, buffer=out_shm.buf)
+        started = time.perf_counter()
+        rows = 0
+        for position in positions:
+            start, length = meta['offsets'][position], meta['lengths'][position]
+            result = func(_frame_for(inputs, position), *args, **kwargs)
+            _, values = _collect(result, func, meta['fields'], outputs)
+            for k, column in enumerate(values):
+                out[k, start:start + length] = column
+            rows += length
+        elapsed = time.perf_counter() - started
+        del out
+    finally:
+        out_shm.close()
+    return os.getpid(), len(positions), rows, elapsed
+
+
+class SharedUniverse:
+    """
+    A universe of OHLCV histories placed in shared memory once, for running
+    indicators across symbols on a pool of worker processes.
+
+    Each field is stored as one contiguous float64 block holding every symbol back
+    to back. Workers map the blocks when they start, build each symbol's DataFrame
+    from the mapped arrays, call the indicator, and write its outputs into a shared
+    output block; only symbol positions and timing figures travel through pickling.
+    Any of the library functions that take a DataFrame (`calculate_supertrend`,
+    `calculate_adx`, `calculate_psar`, `calculate_rsi`, ...) can be run, whether
+    they return a DataFrame, a Series or a tuple of Series.
+
+    Parameters:
+    ----------
+    universe : dict
+        Symbol -> DataFrame (or dict of arrays) with the OHLCV columns. Symbols may
+        have different lengths.
+    fields : tuple of str, optional
+        Columns to share. Default is every one of 'open', 'high', 'low', 'close' and
+        'volume' found in the first symbol.
+    max_workers : int, optional
+        Size of the worker pool. Default is `os.cpu_count()`.
+
+    Example Usage:
+    --------------
+    ```python
+    with SharedUniverse(frames) as universe:
+        supertrend, stats = universe.run(calculate_supertrend, args=(10, 3),
+                                         outputs=('supertrend_l', 'supertrend_s'))
+        adx, _ = universe.run(calculate_adx)
+    print(stats)        # rows per second for every worker
+    ```
+    """
+
+    def __init__(self, universe, fields=None, max_workers=None):
+        self.symbols = list(universe)
+        self._indexes = []
+        first = universe[self.symbols[0]]
+        if fields is None:
+            fields = tuple(f for f in ('open', 'high', 'low', 'close', 'volume') if f in first)
+        self.fields = tuple(fields)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        lengths = [len(universe[symbol][self.fields[0]]) for symbol in self.symbols]
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(int).tolist()
+        total = int(sum(lengths))
+        self._blocks = []
+        self._pool = None
+        spec = {'fields': {}, 'offsets': offsets, 'lengths': lengths, 'total': total}
+        self._inputs = {'__meta__': spec}
+        try:
+            for field in self.fields:
+                shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+                self._blocks.append(shm)
+                block = np.ndarray((total,), dtype=np.float64, buffer=shm.buf)
+                for symbol, start, length in zip(self.symbols, offsets, lengths):
+                    block[start:start + length] = np.asarray(universe[symbol][field], dtype=np.float64)
+                spec['fields'][field] = (shm.name, total)
+                self._inputs[field] = (shm, block)
+        except BaseException:
+            self.close()
+            raise
+        for symbol in self.symbols:
+            frame = universe[symbol]
+            self._indexes.append(frame.index if isinstance(frame, pd.DataFrame) else None)
+        self._spec = spec
+
+    def _chunks(self, positions):
+        # Greedy split into roughly equal row counts, a few chunks per worker
+        count = min(len(positions), self.max_workers * 4)
+        chunks, loads = [[] for _ in range(count)], [0] * count
+        for position in sorted(positions, key=lambda p: -self._spec['lengths'][p]):
+            k = loads.index(min(loads))
+            chunks[k].append(position)
+            loads[k] += self._spec['lengths'][position]
+        return [chunk for chunk in chunks if chunk]
+
+    def run(self, func, args=(), kwargs=None, outputs=None):
+        """
+        Runs `func(frame, *args, **kwargs)` for every symbol across the worker pool.
+
+        The first symbol is computed in this process to discover the output names
+        (unless `outputs` is given) and the rest are spread over the workers.
+
+        Parameters:
+        ----------
+        func : callable
+            A module-level indicator function taking a DataFrame first.
+        args : tuple, optional
+            Extra positional arguments for `func`.
+        kwargs : dict, optional
+            Extra keyword arguments for `func`.
+        outputs : tuple of str, optional
+            Names of the results to keep: columns for functions that return a
+            DataFrame (default: the columns they add), labels for the elements of a
+            returned tuple, or the label of a returned Series.
+
+        Returns:
+        -------
+        results : dict
+            Symbol -> DataFrame of the outputs, indexed like the input.
+        stats : pandas.DataFrame
+            One row per process ('main' for the probe symbol) with symbols, rows,
+            seconds and rows_per_second. `stats.attrs['wall_seconds']` holds the
+            total elapsed time.
+        """
+        kwargs = kwargs or {}
+        spec = self._spec
+        wall = time.perf_counter()
+
+        started = time.perf_counter()
+        probe = func(_frame_for(self._inputs, 0), *args, **kwargs)
+        names, values = _collect(probe, func, self.fields, outputs)
+        records = [('main', 1, spec['lengths'][0], time.perf_counter() - started)]
+
+        out_shm = shared_memory.SharedMemory(create=True, size=max(len(names) * spec['total'], 1) * 8)
+        try:
+            out = np.ndarray((len(names), spec['total']), dtype=np.float64, buffer=out_shm.buf)
+            for k, column in enumerate(values):
+                out[k, :spec['lengths'][0]] = column
+
+            rest = list(range(1, len(self.symbols)))
+            if rest:
+                tasks = [(func, tuple(args), kwargs, names, out_shm.name, chunk)
+                         for chunk in self._chunks(rest)]
+                if self.max_workers == 1:
+                    records.extend(_run_chunk(task, self._inputs) for task in tasks)
+                else:
+                    if self._pool is None:
+                        self._pool = ProcessPoolExecutor(self.max_workers, initializer=_attach_inputs,
+                                                         initargs=(spec,))
+                    records.extend(self._pool.map(_run_chunk, tasks))
+            result_block = out.copy()
+            del out
+        finally:
+            out_shm.close()
+            out_shm.unlink()
+
+        results = {}
+        for position, symbol in enumerate(self.symbols):
+            start, length = spec['offsets'][position], spec['lengths'][position]
+            results[symbol] = pd.DataFrame(result_block[:, start:start + length].T,
+                                           index=self._indexes[position], columns=names)
+
+        stats = pd.DataFrame(records, columns=['worker', 'symbols', 'rows', 'seconds'])
+        stats = stats.groupby('worker', sort=False).sum()
+        stats['rows_per_second'] = stats['rows'] / stats['seconds']
+        stats.attrs['wall_seconds'] = time.perf_counter() - wall
+        return results, stats
+
+    def close(self):
+        """
+        Shuts down the worker pool and releases the shared memory.
+        """
+        if getattr(self, '_pool', None) is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._inputs = {}
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@profiled
+def run_parallel(universe, func, args=(), kwargs=None, outputs=None, max_workers=None):
+    """
+    One-shot helper: shares `universe`, runs `func` across a worker pool and cleans up.
+
+    See `SharedUniverse` and `SharedUniverse.run` for the parameters and return values.
+
+    Example Usage:
+    --------------
+    ```python
+    psar, stats = run_parallel(frames, calculate_psar, outputs=('PSAR', 'Trend'))
+    ```
+    """
+    with SharedUniverse(universe, max_workers=max_workers) as shared:
+        return shared.run(func, args=args, kwargs=kwargs, outputs=outputs)
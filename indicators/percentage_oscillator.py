@@ -1,3 +1,6 @@
+from .profiling import profiled
+
+@profiled
 def calculate_percentage_oscillator(data, short_length=10, long_length=21, source_col='close'):
     """
     Calculates the Percentage Oscillator (PO) for a given DataFrame.
@@ -0,0 +1,273 @@
+import contextlib
+import functools
+import json
+import threading
+import time
+import tracemalloc
+
+# Opt-in instrumentation. Every indicator and tool function is defined under
+# `@profiled`, which checks for an active `profile()` block and otherwise calls
+# straight through, so calls are recorded however the function was imported and
+# cost one global lookup outside a block. Code that dispatches through its own
+# tables (feature plan nodes, backend dispatch, backtest signal builders, live
+# subscriptions) times each step with `span()`. This module imports only the
+# standard library so that every indicator module can import it.
+
+_active = None
+_lock = threading.Lock()
+
+
+class CallRecord:
+    """
+    One indicator call: what ran, when, for how long and what it cost.
+
+    Attributes:
+    ----------
+    name : str
+        The function (or span) name.
+    start, duration : float
+        Seconds since the profile began, and wall time of the call.
+    nested : float
+        Part of `duration` spent in nested indicator calls and spans.
+    depth : int
+        Nesting level within the thread (0 for top-level calls).
+    thread : int
+        Thread identifier.
+    rows : int
+        Input rows (bars x symbols for a panel).
+    allocated : int
+        Peak bytes allocated during the call (with `memory=True`).
+    columns_added : int
+        Columns the call added to the DataFrame passed as its first argument.
+    """
+    __slots__ = ('name', 'start', 'duration', 'nested', 'depth', 'thread', 'rows', 'allocated', 'columns_added',
+                 '_peak')
+
+    def __init__(self, name, start, depth, thread, rows):
+        self.name, self.start, self.depth, self.thread, self.rows = name, start, depth, thread, rows
+        self.duration = self.nested = 0.0
+        self.allocated = self.columns_added = self._peak = 0
+
+
+def _rows(data):
+    if isinstance(data, dict):
+        data = next((v for v in data.values() if hasattr(v, 'shape')), None)
+        return int(data.size) if data is not None else 0
+    if hasattr(data, 'columns'):
+        return len(data)
+    return int(getattr(data, 'size', 0))
+
+
+def _width(data):
+    columns = getattr(data, 'columns', None)
+    return len(columns) if columns is not None else None
+
+
+def profiled(func):
+    """
+    Decorator recording each call of `func` made inside a `profile()` block.
+    Outside a block the wrapper calls `func` directly.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        return profiler._call(func, args, kwargs)
+    return wrapper
+
+
+class Profiler:
+    """
+    Records every indicator call made inside a `profile()` block.
+
+    Use `report()` for a flat per-function summary and `to_chrome_trace(path)` for a
+    timeline that opens in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name, rows):
+        stack = self._stack()
+        record = CallRecord(name, 0.0, len(stack), threading.get_ident(), rows)
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            record.allocated = tracemalloc.get_traced_memory()[0]
+        stack.append(record)
+        record.start = time.perf_counter() - self._origin
+        return record
+
+    def _exit(self, record):
+        record.duration = time.perf_counter() - self._origin - record.start
+        stack = self._stack()
+        stack.pop()
+        if stack:
+            stack[-1].nested += record.duration
+        if self.memory:
+            peak = max(tracemalloc.get_traced_memory()[1], record._peak)
+            record.allocated = max(peak - record.allocated, 0)
+            if stack:
+                # The parent's peak continues from this call's
+                stack[-1]._peak = max(stack[-1]._peak, peak)
+        self.records.append(record)
+
+    def _call(self, func, args, kwargs):
+        data = args[0] if args else None
+        width = _width(data)
+        record = self._enter(func.__name__, _rows(data) if args else 0)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if width is not None:
+                record.columns_added = max(_width(data) - width, 0)
+            self._exit(record)
+
+    def span(self, name):
+        """
+        Context manager timing a block of your own code as a step in the report and
+        trace, e.g. one stage of a feature job.
+        """
+        return _Span(self, name)
+
+    def report(self):
+        """
+        Flat per-function summary, slowest first.
+
+        Returns:
+        -------
+        pandas.DataFrame
+            Indexed by name: calls, total, mean and max wall seconds, self seconds
+            (excluding nested indicator calls), rows, peak allocated bytes (largest
+            call) and columns added.
+        """
+        import pandas as pd
+
+        rows = {}
+        for record in self.records:
+            row = rows.setdefault(record.name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'self_s': 0.0,
+                                                'rows': 0, 'allocated_bytes': 0, 'columns_added': 0})
+            row['calls'] += 1
+            row['total_s'] += record.duration
+            row['max_s'] = max(row['max_s'], record.duration)
+            row['self_s'] += record.duration - record.nested
+            row['rows'] += record.rows
+            row['allocated_bytes'] = max(row['allocated_bytes'], record.allocated)
+            row['columns_added'] += record.columns_added
+        columns = ['calls', 'total_s', 'mean_s', 'max_s', 'self_s', 'rows', 'allocated_bytes', 'columns_added']
+        report = pd.DataFrame.from_dict(rows, orient='index', columns=[c for c in columns if c != 'mean_s'])
+        report.insert(2, 'mean_s', report['total_s'] / report['calls'])
+        report.index.name = 'name'
+        return report.sort_values('total_s', ascending=False)
+
+    def chrome_trace(self):
+        """The records as a Chrome trace-event dict (complete 'X' events, microseconds)."""
+        events = [{'name': r.name, 'cat': 'indicator', 'ph': 'X', 'pid': 0, 'tid': r.thread,
+                   'ts': r.start * 1e6, 'dur': r.duration * 1e6,
+                   'args': {'rows': r.rows, 'allocated_bytes': r.allocated, 'columns_added': r.columns_added}}
+                  for r in self.records]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def to_chrome_trace(self, path):
+        """Writes `chrome_trace()` as JSON to `path`."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _Span:
+    def __init__(self, profiler, name, rows=0):
+        self.profiler, self.name, self.rows = profiler, name, rows
+
+    def __enter__(self):
+        self.record = self.profiler._enter(self.name, self.rows)
+        return self.record
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self.record)
+        return False
+
+
+def span(name, data=None):
+    """
+    Times a block as a step named `name` of the active `profile()`, with the rows
+    of `data`; does nothing (and costs one check) when no profile is active.
+    """
+    profiler = _active
+    if profiler is None:
+        return contextlib.nullcontext()
+    return _Span(profiler, name, _rows(data) if data is not None else 0)
+
+
+class profile:
+    """
+    Context manager that instruments every indicator call made inside it.
+
+    Each call to a function of `indicators.INDICATORS` or to a tool function
+    (`sweep_macd`, `backtest`, `compute`, ...) records its wall time, input rows
+    and the columns it adds to its input DataFrame; with `memory=True` also the
+    peak bytes it allocates, which includes any copies it makes. Feature plan
+    nodes, backend dispatch, backtest signal builders and live subscriptions are
+    recorded as spans.
+
+    Parameters:
+    ----------
+    memory : bool, optional
+        Track allocations through `tracemalloc`, which also sees NumPy buffers. It
+        traces every Python object too, so the bar-by-bar kernels (Supertrend, PSAR,
+        ...) run an order of magnitude slower while it is on. Default is False.
+
+    Example Usage:
+    --------------
+    ```python
+    from indicators.adx import calculate_adx
+    from indicators.calculate_coppock_curve import calculate_coppock_curve
+    from indicators.supertrend import calculate_supertrend
+
+    with profile(memory=True) as prof:
+        with prof.span('trend features'):
+            supertrend = calculate_supertrend(data, 10, 3)
+            adx = calculate_adx(data)
+        coppock = calculate_coppock_curve(data)
+
+    print(prof.report())
+    prof.to_chrome_trace('features.trace.json')
+    ```
+    """
+
+    def __init__(self, memory=False):
+        self.profiler = Profiler(memory=memory)
+        self._started_tracing = False
+
+    def __enter__(self):
+        global _active
+        with _lock:
+            if _active is not None:
+                raise RuntimeError('A profile() block is already active.')
+            _active = self.profiler
+        try:
+            if self.profiler.memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        except BaseException:
+            _active = None
+            raise
+        return self.profiler
+
+    def __exit__(self, *exc):
+        global _active
+        if self._started_tracing:
+            tracemalloc.stop()
+        _active = None
+        return False
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from .panel import wrap_like
+from .profiling import profiled
+
+
+def _block_extremum(x, window, positions=True):
+    # van Herk / Gil-Werman: split the series into blocks of `window` rows, take
+    # prefix maxima and suffix maxima inside each block, and combine one suffix
+    # with one prefix per window. Three comparisons per element whatever the window
+    # length. Positions follow the same scheme and resolve ties toward the most
+    # recent bar, like the front of a monotonic deque that pops on `<=`.
+    n, m = x.shape
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, m), -np.inf)
+    padded[:n] = x
+    padded = padded.reshape(blocks, window, m)
+    offset = (np.arange(blocks)[:, None] * window + np.arange(window))[:, :, None]
+
+    prefix = np.maximum.accumulate(padded, axis=1)
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1]
+    if not positions:
+        prefix = prefix.reshape(-1, m)[window - 1:n]
+        suffix = suffix.reshape(-1, m)[:n - window + 1]
+        return np.maximum(prefix, suffix), None
+
+    prefix_pos = np.maximum.accumulate(np.where(padded == prefix, offset, -1), axis=1)
+
+    reverse, running = padded[:, ::-1], suffix[:, ::-1]
+    new_max = np.ones(reverse.shape, dtype=bool)
+    new_max[:, 1:] = reverse[:, 1:] > running[:, :-1]
+    first = np.maximum.accumulate(np.where(new_max, np.arange(window)[None, :, None], -1), axis=1)
+    suffix_pos = offset[:, -1:] - first[:, ::-1]
+
+    prefix = prefix.reshape(-1, m)[window - 1:n]
+    prefix_pos = prefix_pos.reshape(-1, m)[window - 1:n]
+    suffix = suffix.reshape(-1, m)[:n - window + 1]
+    suffix_pos = suffix_pos.reshape(-1, m)[:n - window + 1]
+
+    take_prefix = prefix >= suffix
+    values = np.where(take_prefix, prefix, suffix)
+    positions = np.where(take_prefix, prefix_pos, suffix_pos)
+    return values, positions
+
+
+@profiled
+def rolling_extremum(x, window, kind='max', positions=False):
+    """
+    Rolling maximum or minimum in O(n), independent of the window length.
+
+    Works along the first axis of 1-D or 2-D (time x symbols) inputs and can also
+    return where the extreme sits in each window. A window containing a NaN yields
+    NaN, as with pandas `rolling(window).max()`.
+
+    Parameters:
+    ----------
+    x : array-like, pandas.Series or pandas.DataFrame
+        The input values.
+    window : int
+        The window length.
+    kind : str, optional
+        'max' (default) or 'min'.
+    positions : bool, optional
+        If True, also return the number of bars since the extreme (0 = current bar).
+        Ties resolve to the most recent bar. Default is False.
+
+    Returns:
+    -------
+    values : same type as `x`
+        The rolling extreme; NaN for the first `window - 1` bars.
+    bars_since : same type as `x`
+        Only if `positions` is True. Bars since the extreme (float, NaN where the
+        value is NaN).
+
+    Example Usage:
+    --------------
+    ```python
+    highest, bars_since_high = rolling_extremum(data['high'], 52, 'max', positions=True)
+    ```
+    """
+    if kind not in ('max', 'min'):
+        raise ValueError("kind must be 'max' or 'min'.")
+    like = x if isinstance(x, (pd.Series, pd.DataFrame)) else None
+    values = np.asarray(x, dtype=np.float64)
+    one_dim = values.ndim == 1
+    if one_dim:
+        values = values[:, None]
+    n, m = values.shape
+
+    result = np.full((n, m), np.nan)
+    bars_since = np.full((n, m), np.nan)
+    if n >= window:
+        missing = np.isnan(values)
+        signed = values if kind == 'max' else -values
+        extreme, pos = _block_extremum(np.where(missing, -np.inf, signed), window, positions)
+        if kind == 'min':
+            extreme = -extreme
+        counts = np.concatenate([np.zeros((1, m)), np.cumsum(missing, axis=0)])
+        valid = (counts[window:] - counts[:-window]) == 0
+        result[window - 1:] = np.where(valid, extreme, np.nan)
+        if positions:
+            bars_since[window - 1:] = np.where(valid, np.arange(window - 1, n)[:, None] - pos, np.nan)
+
+    outputs = [result, bars_since] if positions else [result]
+    if one_dim:
+        outputs = [out[:, 0] for out in outputs]
+    if like is not None:
+        outputs = [wrap_like(out, like) for out in outputs]
+    return tuple(outputs) if positions else outputs[0]
+
+
+def rolling_max(x, window):
+    """
+    Rolling maximum; see `rolling_extremum`.
+    """
+    return rolling_extremum(x, window, 'max')
+
+
+def rolling_min(x, window):
+    """
+    Rolling minimum; see `rolling_extremum`.
+    """
+    return rolling_extremum(x, window, 'min')
+
+
+def rolling_argmax(x, window):
+    """
+    Bars since the rolling maximum (0 = current bar); see `rolling_extremum`.
+    """
+    return rolling_extremum(x, window, 'max', positions=True)[1]
+
+
+def rolling_argmin(x, window):
+    """
+    Bars since the rolling minimum (0 = current bar); see `rolling_extremum`.
+    """
+    return rolling_extremum(x, window, 'min', positions=True)[1]
@@ -0,0 +1,30 @@
+from .profiling import profiled
+
+@profiled
+def calculate_rsi(df, length):
+    """
+    Calculate the Relative Strength Index (RSI) for a given dataset.
+
+    Parameters:
+    ----------
+    df : pandas.DataFrame or dict
+        DataFrame containing the 'close' prices column, or a panel (see
+        `panel.as_panel`) whose 'close' holds one column per symbol.
+    length : int
+        The lookback period for calculating RSI.
+
+    Returns:
+    -------
+    pandas.Series or pandas.DataFrame
+        The RSI values for the specified input data (one column per symbol for a panel).
+    """
+    close = df['close']
+    delta = close.diff(1)
+    # Bars without a close (e.g. before a symbol's first bar in a panel) stay missing
+    gain = delta.where(delta > 0, 0).where(close.notna())
+    loss = (-delta).where(delta < 0, 0).where(close.notna())
+    avg_gain = gain.rolling(window=length).mean()
+    avg_loss = loss.rolling(window=length).mean()
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
@@ -1,5 +1,7 @@
-import pandas as pd
+from .profiling import profiled
+from .rolling_extremum import rolling_extremum
 
+@profiled
 def calculate_stochastic(df, length, smoothing):
     """
     Calculate the Stochastic Oscillator (%K) for a given dataset.
@@ -18,8 +20,8 @@ def calculate_stochastic(df, length, smoothing):
     pandas.Series
         A Series containing the smoothed %K values of the Stochastic Oscillator.
     """
-    lowest_low = df['low'].rolling(window=length).min()
-    highest_high = df['high'].rolling(window=length).max()
+    lowest_low = rolling_extremum(df['low'], length, 'min')
+    highest_high = rolling_extremum(df['high'], length, 'max')
     stoch_k = 100 * (df['close'] - lowest_low) / (highest_high - lowest_low)
     stoch_k = stoch_k.rolling(window=smoothing).mean()  # Smoothing
     return stoch_k
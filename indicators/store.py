@@ -0,0 +1,270 @@
+import json
+import os
+from collections.abc import Mapping
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+_INDEX_FILE = 'index.json'
+
+
+def _file_name(name):
+    # Column and symbol names may contain '/', '+', spaces, ...
+    return quote(str(name), safe='') or '_'
+
+
+def _write_json(path, payload):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _as_stored(values):
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[ns]')
+    if values.dtype.kind not in 'biuf':
+        raise ValueError(f"Only numeric, boolean and datetime columns can be stored, got {values.dtype}.")
+    return values
+
+
+class ColumnStore(Mapping):
+    """
+    An on-disk columnar store of OHLCV histories that indicators read through np.memmap.
+
+    Every column of every symbol is one contiguous raw file. A small JSON index
+    records each symbol's length, dtypes and file names, and its DatetimeIndex if it
+    has one. `store[symbol]` returns a `SymbolView` whose columns are pandas Series
+    over the mapped files. Nothing is loaded until an indicator touches a page, so
+    a universe much larger than memory can be processed one symbol at a time. Columns
+    assigned to a view are appended to the store.
+
+    Parameters:
+    ----------
+    root : str
+        Directory of the store; created if it does not exist.
+
+    Example Usage:
+    --------------
+    ```python
+    store = ColumnStore('data/store')
+    for path in csv_files:
+        store.ingest_csv(path, symbol=os.path.basename(path)[:-4], index_col='date', parse_dates=True)
+
+    view = store['AAPL']
+    view['rsi_14'] = calculate_rsi(view, 14)     # computed from mapped buffers, saved to disk
+    calculate_psar(view)                         # PSAR, Trend, EP and AF go straight into the store
+    supertrend = calculate_supertrend(view, 10, 3)   # its copy() is a dict of mapped Series
+    ```
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        path = os.path.join(root, _INDEX_FILE)
+        if os.path.exists(path):
+            with open(path) as f:
+                self._meta = json.load(f)
+        else:
+            self._meta = {'version': 1, 'symbols': {}}
+            self._save()
+
+    def _save(self):
+        _write_json(os.path.join(self.root, _INDEX_FILE), self._meta)
+
+    def _path(self, symbol, file):
+        return os.path.join(self.root, self._meta['symbols'][symbol]['dir'], file)
+
+    def __getitem__(self, symbol):
+        if symbol not in self._meta['symbols']:
+            raise KeyError(symbol)
+        return SymbolView(self, symbol)
+
+    def __iter__(self):
+        return iter(self._meta['symbols'])
+
+    def __len__(self):
+        return len(self._meta['symbols'])
+
+    def _entry(self, symbol):
+        entries = self._meta['symbols']
+        if symbol not in entries:
+            directory = _file_name(symbol)
+            taken = {entry['dir'] for entry in entries.values()}
+            while directory in taken:
+                directory += '_'
+            os.makedirs(os.path.join(self.root, directory), exist_ok=True)
+            entries[symbol] = {'dir': directory, 'length': 0, 'index': None, 'columns': {}}
+        return entries[symbol]
+
+    def write(self, symbol, frame):
+        """
+        Stores a symbol's columns (and DatetimeIndex, if any), replacing what was there.
+
+        Parameters:
+        ----------
+        symbol : str
+            The symbol name.
+        frame : pandas.DataFrame
+            The columns to store.
+        """
+        entry = self._entry(symbol)
+        for column in list(entry['columns']):
+            os.remove(self._path(symbol, entry['columns'].pop(column)['file']))
+        if entry['index']:
+            os.remove(self._path(symbol, entry['index']['file']))
+        entry['length'], entry['index'] = 0, None
+        self.append(symbol, frame)
+
+    def append(self, symbol, frame):
+        """
+        Appends rows to a symbol, creating it if needed.
+
+        The frame must have exactly the symbol's columns. A stored column is widened
+        when the new rows need it (integers followed by prices with decimals, or by a
+        missing value). Existing views keep seeing the rows they were opened with.
+
+        Parameters:
+        ----------
+        symbol : str
+            The symbol name.
+        frame : pandas.DataFrame
+            The new rows.
+        """
+        entry = self._entry(symbol)
+        columns = [str(c) for c in frame.columns]
+        if entry['length'] and sorted(columns) != sorted(entry['columns']):
+            raise ValueError(f"Columns {columns} do not match the stored columns {list(entry['columns'])}.")
+        arrays = {str(c): _as_stored(frame[c].to_numpy()) for c in frame.columns}
+        if isinstance(frame.index, pd.DatetimeIndex):
+            arrays[None] = _as_stored(frame.index.to_numpy())
+        elif entry['index']:
+            raise ValueError(f"Symbol '{symbol}' is stored with a DatetimeIndex.")
+
+        for column, values in arrays.items():
+            if column is None:
+                if entry['length'] and entry['index'] is None:
+                    raise ValueError(f"Symbol '{symbol}' is stored without a DatetimeIndex.")
+                info = entry['index'] = entry['index'] or {'file': 'index.i8', 'dtype': 'datetime64[ns]'}
+            else:
+                info = entry['columns'].setdefault(column, {'file': _file_name(column) + '.bin',
+                                                            'dtype': values.dtype.str})
+                dtype = np.result_type(np.dtype(info['dtype']), values.dtype)
+                if dtype != np.dtype(info['dtype']):
+                    # e.g. a CSV whose first chunk held only whole prices, or no missing volume
+                    self._promote(symbol, info, dtype, entry['length'])
+                values = values.astype(dtype, copy=False)
+            with open(self._path(symbol, info['file']), 'ab') as f:
+                np.ascontiguousarray(values).tofile(f)
+        entry['length'] += len(frame)
+        self._save()
+
+    def ingest_csv(self, path, symbol, chunksize=1_000_000, **read_csv_kwargs):
+        """
+        Appends a CSV file to a symbol chunk by chunk, without loading it whole.
+
+        Parameters:
+        ----------
+        path : str
+            The CSV file.
+        symbol : str
+            The symbol name.
+        chunksize : int, optional
+            Rows read per chunk. Default is 1,000,000.
+        **read_csv_kwargs
+            Passed to `pandas.read_csv` (e.g. `index_col='date', parse_dates=True`).
+        """
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs):
+            self.append(symbol, chunk)
+
+    def _add_column(self, symbol, name, values):
+        entry = self._meta['symbols'][symbol]
+        values = _as_stored(values)
+        if len(values) != entry['length']:
+            raise ValueError(f"Column '{name}' has {len(values)} rows, symbol '{symbol}' has {entry['length']}.")
+        info = {'file': _file_name(name) + '.bin', 'dtype': values.dtype.str}
+        path = self._path(symbol, info['file'])
+        # Write beside and swap, so views already mapping the old file stay valid
+        np.ascontiguousarray(values).tofile(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        entry['columns'][name] = info
+        self._save()
+
+    def _promote(self, symbol, info, dtype, length, block=1 << 20):
+        # Rewrite a column in a wider dtype, beside the old file and swapped in, so
+        # views already mapping the old file stay valid
+        path = self._path(symbol, info['file'])
+        old = self._map(symbol, info, length)
+        with open(path + '.tmp', 'wb') as f:
+            for start in range(0, length, block):
+                old[start:start + block].astype(dtype).tofile(f)
+        del old
+        os.replace(path + '.tmp', path)
+        info['dtype'] = dtype.str
+
+    def _map(self, symbol, info, length):
+        dtype = np.dtype(info['dtype'])
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._path(symbol, info['file']), dtype=dtype, mode='r', shape=(length,))
+
+
+class SymbolView(Mapping):
+    """
+    The columns of one stored symbol, as zero-copy pandas Series over np.memmap.
+
+    A view can be passed to the indicators wherever a DataFrame is accepted.
+    `view[column]` maps the column file read-only. `view[name] = values` writes a new
+    column into the store. `view.copy()` returns a plain dict of the mapped Series,
+    so functions that work on a copy (`calculate_supertrend`, `calculate_adx`) keep
+    their intermediate columns in memory instead of writing them to disk.
+    """
+
+    def __init__(self, store, symbol):
+        self.store = store
+        self.symbol = symbol
+        # The rows the view was opened with; later appends are not seen
+        self._length = self._entry['length']
+        self._index = None
+
+    @property
+    def _entry(self):
+        return self.store._meta['symbols'][self.symbol]
+
+    @property
+    def index(self):
+        if self._index is None:
+            entry = self._entry
+            if entry['index']:
+                stamps = self.store._map(self.symbol, entry['index'], self._length)
+                self._index = pd.DatetimeIndex(np.asarray(stamps).view('datetime64[ns]'))
+            else:
+                self._index = pd.RangeIndex(self._length)
+        return self._index
+
+    def __getitem__(self, column):
+        entry = self._entry
+        if column not in entry['columns']:
+            raise KeyError(column)
+        values = self.store._map(self.symbol, entry['columns'][column], self._length)
+        return pd.Series(values, index=self.index, name=column, copy=False)
+
+    def __setitem__(self, column, values):
+        self.store._add_column(self.symbol, str(column), np.asarray(values))
+
+    def __iter__(self):
+        return iter(self._entry['columns'])
+
+    def __len__(self):
+        return len(self._entry['columns'])
+
+    def copy(self):
+        return {column: self[column] for column in self}
+
+    def to_frame(self, columns=None):
+        """
+        Materializes the view (or the given columns) as an in-memory DataFrame.
+        """
+        return pd.DataFrame({column: self[column] for column in (columns or list(self))}, index=self.index)
@@ -0,0 +1,929 @@
+import math
+from collections import deque
+from numbers import Number
+
+NAN = float('nan')
+
+
+def _field(bar, key):
+    # A bar is either a mapping of column -> value or a bare number for
+    # single-source indicators
+    if isinstance(bar, Number):
+        return float(bar)
+    return float(bar[key])
+
+
+def _div(a, b):
+    # IEEE division so streaming values match the vectorized (NumPy) results
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def _ewm_alpha(span=None, alpha=None):
+    # Same conversion pandas performs through the centre of mass, so that the
+    # recursion below reproduces `ewm(..., adjust=False)` to the last bit
+    com = (span - 1) / 2.0 if span is not None else 1.0 / alpha - 1.0
+    return 1.0 / (1.0 + com)
+
+
+class _Ewm:
+    """Exponentially weighted mean with pandas `adjust=False` semantics."""
+    __slots__ = ('alpha', 'value', '_old_wt')
+
+    def __init__(self, span=None, alpha=None):
+        self.alpha = _ewm_alpha(span, alpha)
+        self.value = NAN
+        self._old_wt = 1.0
+
+    def update(self, x):
+        w = self.value
+        if w == w:
+            self._old_wt *= 1.0 - self.alpha
+            if x == x:
+                if w != x:
+                    w = (self._old_wt * w + self.alpha * x) / (self._old_wt + self.alpha)
+                self._old_wt = 1.0
+        elif x == x:
+            w = x
+        self.value = w
+        return w
+
+
+class _RollingSum:
+    """Compensated rolling sum over a ring buffer; NaN until the window is full."""
+    __slots__ = ('window', '_buf', '_pos', '_seen', '_nans', '_sum', '_comp')
+
+    def __init__(self, window):
+        self.window = window
+        self._buf = [0.0] * window
+        self._pos = 0
+        self._seen = 0
+        self._nans = 0
+        self._sum = 0.0
+        self._comp = 0.0
+
+    def _add(self, x):
+        s = self._sum
+        t = s + x
+        if abs(s) >= abs(x):
+            self._comp += (s - t) + x
+        else:
+            self._comp += (x - t) + s
+        self._sum = t
+
+    def update(self, x):
+        if self._seen >= self.window:
+            old = self._buf[self._pos]
+            if old != old:
+                self._nans -= 1
+            else:
+                self._add(-old)
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self._seen += 1
+        if x != x:
+            self._nans += 1
+        else:
+            self._add(x)
+        if self._seen < self.window or self._nans:
+            return NAN
+        return self._sum + self._comp
+
+
+class _RollingMean(_RollingSum):
+    __slots__ = ()
+
+    def update(self, x):
+        return _RollingSum.update(self, x) / self.window
+
+
+class _RollingWma:
+    """
+    Linearly weighted rolling mean (weights 1 .. window, newest heaviest) from a
+    running sum and a running weighted sum; NaN until the window is full.
+    """
+    __slots__ = ('window', '_buf', '_pos', '_seen', '_nans', '_sum', '_weighted')
+
+    def __init__(self, window):
+        self.window = window
+        self._buf = [0.0] * window
+        self._pos = 0
+        self._seen = 0
+        self._nans = 0
+        self._sum = 0.0
+        self._weighted = 0.0
+
+    def update(self, x):
+        window = self.window
+        old = self._buf[self._pos] if self._seen >= window else 0.0
+        if old != old:
+            self._nans -= 1
+            old = 0.0
+        if x != x:
+            self._nans += 1
+            value = 0.0
+        else:
+            value = x
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % window
+        self._seen += 1
+        # Sliding the window ages every value by one step of weight
+        self._weighted += window * value - self._sum
+        self._sum += value - old
+        if self._pos == 0:
+            # Re-sum once per window so rounding cannot build up over a long stream
+            values = [0.0 if v != v else v for v in self._buf]
+            self._sum = math.fsum(values)
+            self._weighted = math.fsum(v * (k + 1) for k, v in enumerate(values))
+        if self._seen < window or self._nans:
+            return NAN
+        return self._weighted / (window * (window + 1) / 2)
+
+
+class _RollingStd:
+    """Rolling sample standard deviation (ddof=1) using Welford add/remove."""
+    __slots__ = ('window', '_buf', '_pos', '_seen', '_nans', '_n', '_mean', '_m2')
+
+    def __init__(self, window):
+        self.window = window
+        self._buf = [0.0] * window
+        self._pos = 0
+        self._seen = 0
+        self._nans = 0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x):
+        if self._seen >= self.window:
+            old = self._buf[self._pos]
+            if old != old:
+                self._nans -= 1
+            else:
+                self._n -= 1
+                if self._n:
+                    delta = old - self._mean
+                    self._mean -= delta / self._n
+                    self._m2 -= delta * (old - self._mean)
+                else:
+                    self._mean = self._m2 = 0.0
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self._seen += 1
+        if x != x:
+            self._nans += 1
+        else:
+            self._n += 1
+            delta = x - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (x - self._mean)
+        if self._seen < self.window or self._nans or self._n < 2:
+            return NAN
+        return math.sqrt(max(self._m2, 0.0) / (self._n - 1))
+
+
+class _RollingExtremum:
+    """Rolling max (or min) via a monotonic deque, amortized O(1) per update."""
+    __slots__ = ('window', 'is_max', '_deque', '_i', '_last_nan')
+
+    def __init__(self, window, is_max=True):
+        self.window = window
+        self.is_max = is_max
+        self._deque = deque()
+        self._i = -1
+        self._last_nan = -window
+
+    def update(self, x):
+        self._i += 1
+        i, dq = self._i, self._deque
+        if x != x:
+            self._last_nan = i
+        elif self.is_max:
+            while dq and dq[-1][1] <= x:
+                dq.pop()
+            dq.append((i, x))
+        else:
+            while dq and dq[-1][1] >= x:
+                dq.pop()
+            dq.append((i, x))
+        while dq and dq[0][0] <= i - self.window:
+            dq.popleft()
+        if i < self.window - 1 or self._last_nan > i - self.window:
+            return NAN
+        return dq[0][1]
+
+    def bars_since(self):
+        # The deque front is the most recent occurrence of the extreme
+        if self._i < self.window - 1 or self._last_nan > self._i - self.window:
+            return NAN
+        return float(self._i - self._deque[0][0])
+
+
+class _Lag:
+    """Returns the value seen `periods` updates ago (NaN until available)."""
+    __slots__ = ('periods', '_buf')
+
+    def __init__(self, periods):
+        self.periods = periods
+        self._buf = deque(maxlen=periods + 1)
+
+    def update(self, x):
+        self._buf.append(x)
+        return self._buf[0] if len(self._buf) > self.periods else NAN
+
+
+class StreamingIndicator:
+    """
+    Base class for incremental indicators.
+
+    Subclasses keep only the recursive state or ring buffers they need, so
+    `update(bar)` costs O(1) regardless of how much history has been seen.
+    `bar` is a mapping with the columns listed in `fields` (a DataFrame row,
+    a dict, ...), or a bare number for single-source indicators.
+
+    Constructors take the batch function's parameters in its order, without the
+    data, so `SMA('close', 20)` mirrors `calculate_sma(data, 'close', 20)` and
+    `WMA(20)` mirrors `wma(data['close'], 20)`. Functions of a Series have no
+    column parameter; their classes take it as the keyword-only `column`.
+    """
+    __slots__ = ()
+    fields = ('close',)
+
+    @classmethod
+    def from_history(cls, data, *args, **kwargs):
+        """
+        Build the indicator and warm it up on a DataFrame of past bars.
+
+        The history is replayed through `update`, so the next value returned
+        continues exactly where the batch function would.
+        """
+        indicator = cls(*args, **kwargs)
+        fields = indicator.fields
+        columns = [data[f].tolist() for f in fields]
+        for values in zip(*columns):
+            indicator.update(dict(zip(fields, values)))
+        return indicator
+
+    def update(self, bar):
+        raise NotImplementedError
+
+
+class SMA(StreamingIndicator):
+    """Incremental counterpart of `calculate_sma`."""
+    __slots__ = ('column', '_mean')
+
+    def __init__(self, column='close', period=14):
+        self.column = column
+        self._mean = _RollingMean(period)
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def update(self, bar):
+        return self._mean.update(_field(bar, self.column))
+
+
+class EMA(StreamingIndicator):
+    """Incremental counterpart of `calculate_ema`."""
+    __slots__ = ('column', '_ema')
+
+    def __init__(self, column, period):
+        self.column = column
+        self._ema = _Ewm(span=period)
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def update(self, bar):
+        return self._ema.update(_field(bar, self.column))
+
+
+class WMA(StreamingIndicator):
+    """Incremental counterpart of `wma`; `update` takes a bar or a bare value."""
+    __slots__ = ('column', '_wma')
+
+    def __init__(self, period, *, column='close'):
+        self.column = column
+        self._wma = _RollingWma(period)
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def update(self, bar):
+        return self._wma.update(_field(bar, self.column))
+
+
+class MACD(StreamingIndicator):
+    """Incremental counterpart of `calculate_macd`; `update` returns (macd, signal)."""
+    __slots__ = ('_short', '_long', '_signal')
+
+    def __init__(self, short_window=12, long_window=26, signal_window=9):
+        self._short = _Ewm(span=short_window)
+        self._long = _Ewm(span=long_window)
+        self._signal = _Ewm(span=signal_window)
+
+    def update(self, bar):
+        close = _field(bar, 'close')
+        macd = self._short.update(close) - self._long.update(close)
+        return macd, self._signal.update(macd)
+
+
+class RSI(StreamingIndicator):
+    """Incremental counterpart of `calculate_rsi`."""
+    __slots__ = ('_prev', '_gain', '_loss')
+
+    def __init__(self, length):
+        self._prev = NAN
+        self._gain = _RollingMean(length)
+        self._loss = _RollingMean(length)
+
+    def update(self, bar):
+        close = _field(bar, 'close')
+        delta = close - self._prev
+        self._prev = close
+        avg_gain = self._gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self._loss.update(-delta if delta < 0 else 0.0)
+        return 100 - _div(100, 1 + _div(avg_gain, avg_loss))
+
+
+class ATR(StreamingIndicator):
+    """Incremental counterpart of `calculate_atr`."""
+    __slots__ = ('_prev_close', '_mean')
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, window=14):
+        self._prev_close = NAN
+        self._mean = _RollingMean(window)
+
+    def update(self, bar):
+        high, low, close = _field(bar, 'high'), _field(bar, 'low'), _field(bar, 'close')
+        tr = high - low
+        if self._prev_close == self._prev_close:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return self._mean.update(tr)
+
+
+class BollingerBands(StreamingIndicator):
+    """Incremental counterpart of `calculate_bollinger_bands`; returns (upper, lower)."""
+    __slots__ = ('num_sd', '_mean', '_std')
+
+    def __init__(self, window=20, num_sd=2):
+        self.num_sd = num_sd
+        self._mean = _RollingMean(window)
+        self._std = _RollingStd(window)
+
+    def update(self, bar):
+        close = _field(bar, 'close')
+        sma = self._mean.update(close)
+        std = self._std.update(close)
+        return sma + std * self.num_sd, sma - std * self.num_sd
+
+
+class Stochastic(StreamingIndicator):
+    """Incremental counterpart of `calculate_stochastic` (smoothed %K)."""
+    __slots__ = ('_low', '_high', '_smooth')
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, length, smoothing):
+        self._low = _RollingExtremum(length, is_max=False)
+        self._high = _RollingExtremum(length, is_max=True)
+        self._smooth = _RollingMean(smoothing)
+
+    def update(self, bar):
+        lowest = self._low.update(_field(bar, 'low'))
+        highest = self._high.update(_field(bar, 'high'))
+        k = _div(100 * (_field(bar, 'close') - lowest), highest - lowest)
+        return self._smooth.update(k)
+
+
+class ADX(StreamingIndicator):
+    """Incremental counterpart of `calculate_adx`; `update` returns the ADX value."""
+    __slots__ = ('_prev_high', '_prev_low', '_prev_close', '_tr', '_dm_plus', '_dm_minus', '_adx')
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, period=14, smoothing_period=14):
+        self._prev_high = self._prev_low = self._prev_close = NAN
+        self._tr = _RollingMean(period)
+        self._dm_plus = _RollingMean(period)
+        self._dm_minus = _RollingMean(period)
+        self._adx = _RollingMean(smoothing_period)
+
+    def update(self, bar):
+        high, low, close = _field(bar, 'high'), _field(bar, 'low'), _field(bar, 'close')
+        # np.maximum semantics: a missing previous close makes the first TR NaN
+        tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        if self._prev_close != self._prev_close:
+            tr = NAN
+        up = high - self._prev_high
+        down = self._prev_low - low
+        dm_plus = max(up, 0.0) if up > down else 0.0
+        dm_minus = max(down, 0.0) if down > up else 0.0
+        self._prev_high, self._prev_low, self._prev_close = high, low, close
+
+        tr = self._tr.update(tr)
+        di_plus = 100 * _div(self._dm_plus.update(dm_plus), tr)
+        di_minus = 100 * _div(self._dm_minus.update(dm_minus), tr)
+        dx = _div(100 * abs(di_plus - di_minus), di_plus + di_minus)
+        return self._adx.update(dx)
+
+
+class DirMov(StreamingIndicator):
+    """Incremental counterpart of `calculate_dirmov`; returns (plus_di, minus_di)."""
+    __slots__ = ('_prev_high', '_prev_low', '_tr', '_dm_plus', '_dm_minus')
+    fields = ('high', 'low')
+
+    def __init__(self, length):
+        self._prev_high = self._prev_low = NAN
+        self._tr = _RollingMean(length)
+        self._dm_plus = _RollingMean(length)
+        self._dm_minus = _RollingMean(length)
+
+    def update(self, bar):
+        high, low = _field(bar, 'high'), _field(bar, 'low')
+        # The high stands in for the close, and np.fmax skips the missing first one
+        tr = high - low
+        if self._prev_high == self._prev_high:
+            tr = max(tr, abs(high - self._prev_high), abs(low - self._prev_high))
+        up = high - self._prev_high
+        down = self._prev_low - low
+        dm_plus = up if up > down and up > 0 else 0.0
+        dm_minus = down if down > up and down > 0 else 0.0
+        self._prev_high, self._prev_low = high, low
+
+        tr = self._tr.update(tr)
+        plus_di = 100 * _div(self._dm_plus.update(dm_plus), tr)
+        minus_di = 100 * _div(self._dm_minus.update(dm_minus), tr)
+        # fillna(0) of the batch function
+        return (plus_di if plus_di == plus_di else 0.0,
+                minus_di if minus_di == minus_di else 0.0)
+
+
+class Donchian(StreamingIndicator):
+    """Incremental counterpart of `calculate_donchian` (channel midline)."""
+    __slots__ = ('_low', '_high')
+    fields = ('high', 'low')
+
+    def __init__(self, period):
+        self._low = _RollingExtremum(period, is_max=False)
+        self._high = _RollingExtremum(period, is_max=True)
+
+    def update(self, bar):
+        return (self._low.update(_field(bar, 'low')) + self._high.update(_field(bar, 'high'))) / 2
+
+
+class Aroon(StreamingIndicator):
+    """Incremental counterpart of `calculate_aroon`; returns (aroon_up, aroon_down)."""
+    __slots__ = ('period', '_high', '_low')
+    fields = ('high', 'low')
+
+    def __init__(self, period=14):
+        self.period = period
+        self._high = _RollingExtremum(period + 1, is_max=True)
+        self._low = _RollingExtremum(period + 1, is_max=False)
+
+    def update(self, bar):
+        self._high.update(_field(bar, 'high'))
+        self._low.update(_field(bar, 'low'))
+        period = self.period
+        return (100 * (period - self._high.bars_since()) / period,
+                100 * (period - self._low.bars_since()) / period)
+
+
+class Ichimoku(StreamingIndicator):
+    """Incremental counterpart of `calculate_ichimoku`; returns the four lines."""
+    __slots__ = ('_conversion', '_base', '_lead2')
+    fields = ('high', 'low')
+
+    def __init__(self, conversion_periods, base_periods, lagging_span2_periods):
+        self._conversion = Donchian(conversion_periods)
+        self._base = Donchian(base_periods)
+        self._lead2 = Donchian(lagging_span2_periods)
+
+    def update(self, bar):
+        conversion = self._conversion.update(bar)
+        base = self._base.update(bar)
+        return conversion, base, (conversion + base) / 2, self._lead2.update(bar)
+
+
+class KVO(StreamingIndicator):
+    """Incremental counterpart of `calculate_kvo`."""
+    __slots__ = ('_short', '_long')
+    fields = ('high', 'low', 'close', 'volume')
+
+    def __init__(self, short_period=34, long_period=55):
+        self._short = _Ewm(span=short_period)
+        self._long = _Ewm(span=long_period)
+
+    def update(self, bar):
+        high, low, close = _field(bar, 'high'), _field(bar, 'low'), _field(bar, 'close')
+        mfm = _div((close - low) - (high - close), high - low)
+        mfv = mfm * _field(bar, 'volume')
+        return self._short.update(mfv) - self._long.update(mfv)
+
+
+class BBP(StreamingIndicator):
+    """Incremental counterpart of `calculate_bbp`; `update` returns the BBP value."""
+    __slots__ = ('_ema',)
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, bbp_length=50):
+        self._ema = _Ewm(span=bbp_length)
+
+    def update(self, bar):
+        ema = self._ema.update(_field(bar, 'close'))
+        return (_field(bar, 'high') - ema) + (_field(bar, 'low') - ema)
+
+
+class PercentageOscillator(StreamingIndicator):
+    """Incremental counterpart of `calculate_percentage_oscillator`."""
+    __slots__ = ('source_col', '_short', '_long')
+
+    def __init__(self, short_length=10, long_length=21, source_col='close'):
+        self.source_col = source_col
+        self._short = _Ewm(span=short_length)
+        self._long = _Ewm(span=long_length)
+
+    @property
+    def fields(self):
+        return (self.source_col,)
+
+    def update(self, bar):
+        value = _field(bar, self.source_col)
+        long_ema = self._long.update(value)
+        return _div(self._short.update(value) - long_ema, long_ema) * 100
+
+
+class CoppockCurve(StreamingIndicator):
+    """Incremental counterpart of `calculate_coppock_curve`."""
+    __slots__ = ('_short_lag', '_long_lag', '_ema')
+
+    def __init__(self, short_roc=11, long_roc=14, wma_period=10):
+        self._short_lag = _Lag(short_roc)
+        self._long_lag = _Lag(long_roc)
+        self._ema = _Ewm(span=wma_period)
+
+    def update(self, bar):
+        close = _field(bar, 'close')
+        short_base = self._short_lag.update(close)
+        long_base = self._long_lag.update(close)
+        roc_sum = (_div(close - short_base, short_base) * 100
+                   + _div(close - long_base, long_base) * 100)
+        return self._ema.update(roc_sum)
+
+
+class HeikinAshi(StreamingIndicator):
+    """
+    Incremental counterpart of `calculate_heikin_ashi`; `update` returns a dict of
+    'ha_open', 'ha_high', 'ha_low' and 'ha_close', which the Heikin-Ashi indicators
+    below accept as their bar.
+    """
+    __slots__ = ('_open', '_close')
+    fields = ('open', 'high', 'low', 'close')
+
+    def __init__(self):
+        self._open = NAN
+        self._close = NAN
+
+    def update(self, bar):
+        open_price, high, low, close = (_field(bar, f) for f in self.fields)
+        ha_close = (open_price + high + low + close) / 4
+        if ha_close != ha_close:
+            # Incomplete bars are skipped; the next one opens from the last candle
+            return dict.fromkeys(('ha_open', 'ha_high', 'ha_low', 'ha_close'), NAN)
+        if self._open == self._open:
+            ha_open = (self._open + self._close) / 2
+        else:
+            ha_open = (open_price + close) / 2
+        self._open, self._close = ha_open, ha_close
+        return {'ha_open': ha_open, 'ha_high': max(high, ha_open, ha_close),
+                'ha_low': min(low, ha_open, ha_close), 'ha_close': ha_close}
+
+
+class MassIndex(StreamingIndicator):
+    """Incremental counterpart of `mass_index` (Heikin-Ashi high/low)."""
+    __slots__ = ('_ema1', '_ema2', '_sum')
+    fields = ('ha_high', 'ha_low')
+
+    def __init__(self, period=9, ema_period=25):
+        self._ema1 = _Ewm(span=period)
+        self._ema2 = _Ewm(span=period)
+        self._sum = _RollingSum(ema_period)
+
+    def update(self, bar):
+        ema1 = self._ema1.update(_field(bar, 'ha_high') - _field(bar, 'ha_low'))
+        ema2 = self._ema2.update(ema1)
+        return self._sum.update(_div(ema1, ema2))
+
+
+class KairiRelativeIndex(StreamingIndicator):
+    """Incremental counterpart of `kairi_relative_index` (Heikin-Ashi close)."""
+    __slots__ = ('_sma',)
+    fields = ('ha_close',)
+
+    def __init__(self, length=14):
+        self._sma = _RollingMean(length)
+
+    def update(self, bar):
+        close = _field(bar, 'ha_close')
+        sma = self._sma.update(close)
+        return _div(close - sma, sma) * 100
+
+
+class Fibobars(StreamingIndicator):
+    """Incremental counterpart of `calculate_fibobars`."""
+    __slots__ = ('period', 'fibo_level', '_high', '_low', '_seen', '_trend')
+    fields = ('ha_open', 'ha_high', 'ha_low', 'ha_close')
+
+    def __init__(self, period, fibo_level):
+        self.period = period
+        self.fibo_level = fibo_level
+        self._high = _RollingExtremum(period, is_max=True)
+        self._low = _RollingExtremum(period, is_max=False)
+        self._seen = 0
+        self._trend = 0
+
+    def update(self, bar):
+        hh = self._high.update(_field(bar, 'ha_high'))
+        ll = self._low.update(_field(bar, 'ha_low'))
+        self._seen += 1
+        if self._seen <= self.period:
+            return 0
+        close, open_price = _field(bar, 'ha_close'), _field(bar, 'ha_open')
+        rng = (hh - ll) * self.fibo_level
+        prev = self._trend
+        if open_price > close:
+            self._trend = 1 if (prev >= 0 and rng < close - ll) else -1
+        else:
+            self._trend = -1 if (prev <= 0 and rng < hh - close) else 1
+        return self._trend
+
+
+class OBV(StreamingIndicator):
+    """Incremental counterpart of `calculate_obv`."""
+    __slots__ = ('_prev', '_obv')
+    fields = ('close', 'volume')
+
+    def __init__(self):
+        self._prev = NAN
+        self._obv = 0.0
+
+    def update(self, bar):
+        close = _field(bar, 'close')
+        if close > self._prev:
+            self._obv += _field(bar, 'volume')
+        elif close < self._prev:
+            self._obv -= _field(bar, 'volume')
+        self._prev = close
+        return self._obv
+
+
+class PSAR(StreamingIndicator):
+    """Incremental counterpart of `calculate_psar`; `update` returns the PSAR value."""
+    __slots__ = ('initial_af', 'max_af', 'step_af', 'psar', 'trend', 'ep', 'af', '_lows', '_highs')
+    fields = ('high', 'low')
+
+    def __init__(self, initial_af=0.0, max_af=0.2, step_af=0.02):
+        self.initial_af = initial_af
+        self.max_af = max_af
+        self.step_af = step_af
+        self.psar = self.ep = NAN
+        self.trend = 1
+        self.af = initial_af
+        self._lows = deque(maxlen=2)
+        self._highs = deque(maxlen=2)
+
+    def update(self, bar):
+        high, low = _field(bar, 'high'), _field(bar, 'low')
+        lows, highs = self._lows, self._highs
+        if not lows:
+            self.psar, self.ep = low, high
+        else:
+            sar = self.psar + self.af * (self.ep - self.psar)
+            if self.trend == 1:
+                sar = min(sar, lows[-1], lows[0])
+                if low < sar:
+                    self.trend, self.psar, self.ep, self.af = -1, self.ep, low, self.initial_af
+                else:
+                    self.psar = sar
+                    if high > self.ep:
+                        self.ep = high
+                        self.af = min(self.af + self.step_af, self.max_af)
+            else:
+                sar = max(sar, highs[-1], highs[0])
+                if high > sar:
+                    self.trend, self.psar, self.ep, self.af = 1, self.ep, high, self.initial_af
+                else:
+                    self.psar = sar
+                    if low < self.ep:
+                        self.ep = low
+                        self.af = min(self.af + self.step_af, self.max_af)
+        lows.append(low)
+        highs.append(high)
+        return self.psar
+
+
+class Supertrend(StreamingIndicator):
+    """Incremental counterpart of `calculate_supertrend`; `update` returns the line value."""
+    __slots__ = ('factor', 'ratchet', 'direction', '_atr', '_prev_close',
+                 '_upper', '_lower', '_line', '_seen')
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, atr_period, factor, ratchet=True):
+        self.factor = factor
+        self.ratchet = ratchet
+        self.direction = 0
+        self._atr = _RollingMean(atr_period)
+        self._prev_close = NAN
+        self._upper = self._lower = self._line = NAN
+        self._seen = False
+
+    def update(self, bar):
+        high, low, close = _field(bar, 'high'), _field(bar, 'low'), _field(bar, 'close')
+        prev_close = self._prev_close
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        if prev_close != prev_close:
+            tr = NAN
+        atr = self._atr.update(tr)
+        hl2 = (high + low) / 2
+        upper, lower = hl2 + self.factor * atr, hl2 - self.factor * atr
+        self._prev_close = close
+
+        if not self.ratchet:
+            # Flip-only loop of the original implementation
+            self._line = upper if not self._seen or close > self._line else lower
+            self._seen = True
+            return self._line
+
+        if upper != upper or lower != lower:
+            return NAN
+        if self.direction == 0:
+            self._upper, self._lower, self.direction = upper, lower, 1
+        else:
+            prev_upper, prev_lower = self._upper, self._lower
+            self._upper = min(upper, prev_upper) if prev_close < prev_upper else upper
+            self._lower = max(lower, prev_lower) if prev_close > prev_lower else lower
+            if self.direction == -1 and close > prev_upper:
+                self.direction = 1
+            elif self.direction == 1 and close < prev_lower:
+                self.direction = -1
+        self._line = self._lower if self.direction == 1 else self._upper
+        return self._line
+
+
+class KalmanFilter(StreamingIndicator):
+    """
+    Incremental counterpart of `kalman_filter`. Like the batch filter it starts at
+    the first non-NaN value (NaN until then); a later NaN makes the rest NaN.
+    """
+    __slots__ = ('column', 'process_variance', 'measurement_variance', 'estimate', 'error', 'started')
+
+    def __init__(self, column, process_variance=1e-1, measurement_variance=1):
+        self.column = column
+        self.process_variance = process_variance
+        self.measurement_variance = measurement_variance
+        self.estimate = 0.0
+        self.error = 1.0
+        self.started = False
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def update(self, bar):
+        value = _field(bar, self.column)
+        if not self.started:
+            if value != value:
+                return NAN
+            self.started = True
+        priori_error = self.error + self.process_variance
+        gain = priori_error / (priori_error + self.measurement_variance)
+        self.estimate = self.estimate + gain * (value - self.estimate)
+        self.error = (1 - gain) * priori_error
+        return self.estimate
+
+
+class HMA(StreamingIndicator):
+    """Incremental counterpart of `hma`; `update` takes a bar or a bare value."""
+    __slots__ = ('column', '_half', '_full', '_smooth')
+
+    def __init__(self, period, *, column='close'):
+        self.column = column
+        self._half = _RollingWma(int(period / 2))
+        self._full = _RollingWma(period)
+        self._smooth = _RollingWma(int(period ** 0.5))
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def update(self, bar):
+        value = _field(bar, self.column)
+        return self._smooth.update(self._half.update(value) * 2 - self._full.update(value))
+
+
+class THMA(StreamingIndicator):
+    """Incremental counterpart of `thma`."""
+    __slots__ = ('column', '_hma1', '_hma2', '_hma3')
+
+    def __init__(self, period, *, column='close'):
+        self.column = column
+        self._hma1 = HMA(period)
+        self._hma2 = HMA(period)
+        self._hma3 = HMA(period)
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def update(self, bar):
+        ma1 = self._hma1.update(_field(bar, self.column))
+        ma2 = self._hma2.update(ma1)
+        ma3 = self._hma3.update(ma2)
+        return 3 * (ma1 - ma2) + ma3
+
+
+class RollingLinreg(StreamingIndicator):
+    """
+    Incremental counterpart of `rolling_linreg`. The window sums are slid in O(1)
+    relative to a reference level, which is reset and the sums re-taken once per
+    window so rounding cannot build up over a long stream.
+    """
+    __slots__ = ('length', 'outputs', 'forecast_offset', 'column', '_buf', '_pos', '_seen', '_nans',
+                 '_ref', '_sum', '_sum_k', '_sum_sq')
+
+    def __init__(self, length, outputs=('slope',), forecast_offset=1, *, column='close'):
+        if length < 2:
+            raise ValueError("length must be at least 2.")
+        unknown = set(outputs) - {'slope', 'intercept', 'r2', 'forecast'}
+        if unknown:
+            raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+        self.length = length
+        self.outputs = tuple(outputs)
+        self.forecast_offset = forecast_offset
+        self.column = column
+        self._buf = [NAN] * length
+        self._pos = 0
+        self._seen = 0
+        self._nans = 0
+        self._ref = self._sum = self._sum_k = self._sum_sq = 0.0
+
+    @property
+    def fields(self):
+        return (self.column,)
+
+    def _resum(self):
+        # Window oldest first, relative to its first valid value
+        window = self._buf[self._pos:] + self._buf[:self._pos]
+        self._ref = next((v for v in window if v == v), 0.0)
+        d = [v - self._ref if v == v else 0.0 for v in window]
+        self._sum = math.fsum(d)
+        self._sum_k = math.fsum(k * v for k, v in enumerate(d))
+        self._sum_sq = math.fsum(v * v for v in d)
+
+    def update(self, bar):
+        y = _field(bar, self.column)
+        length = self.length
+        old = self._buf[self._pos]
+        full = self._seen >= length
+        if full and old != old:
+            self._nans -= 1
+        if y != y:
+            self._nans += 1
+        self._buf[self._pos] = y
+        self._pos = (self._pos + 1) % length
+        self._seen += 1
+        if self._seen < length:
+            return self._result(NAN, NAN, NAN)
+        if not full or self._pos == 0:
+            self._resum()
+        else:
+            # Drop the oldest bar (k = 0), age the rest by one and add the new one at k = length - 1
+            d_old = old - self._ref if old == old else 0.0
+            d_new = y - self._ref if y == y else 0.0
+            self._sum_k += (length - 1) * d_new - (self._sum - d_old)
+            self._sum += d_new - d_old
+            self._sum_sq += d_new * d_new - d_old * d_old
+        if self._nans:
+            return self._result(NAN, NAN, NAN)
+        sum_k = length * (length - 1) / 2
+        sum_kk = (length - 1) * length * (2 * length - 1) / 6
+        slope = (length * self._sum_k - sum_k * self._sum) / (length * sum_kk - sum_k ** 2)
+        intercept = self._ref + (self._sum - slope * sum_k) / length
+        total = self._sum_sq - self._sum ** 2 / length
+        r2 = min(slope ** 2 * (sum_kk - sum_k ** 2 / length) / total, 1.0) if total > 0 else NAN
+        return self._result(slope, intercept, r2)
+
+    def _result(self, slope, intercept, r2):
+        forecast = intercept + slope * (self.length - 1 + self.forecast_offset)
+        results = {'slope': slope, 'intercept': intercept, 'r2': r2, 'forecast': forecast}
+        if len(self.outputs) == 1:
+            return results[self.outputs[0]]
+        return tuple(results[name] for name in self.outputs)
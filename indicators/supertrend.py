@@ -1,7 +1,12 @@
 import numpy as np
 import pandas as pd
 
-def calculate_supertrend(data, atr_period, factor):
+from .kernels import supertrend_flip_kernel, supertrend_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def calculate_supertrend(data, atr_period, factor, ratchet=True):
     """
     Calculate the Supertrend indicator for financial time series data.
 
@@ -10,12 +15,17 @@ def calculate_supertrend(data, atr_period, factor):
 
     Parameters:
     -----------
-    data : pandas.DataFrame
-        A DataFrame containing the time series data with columns: 'high', 'low', and 'close'.
+    data : pandas.DataFrame or dict
+        A DataFrame containing the time series data with columns: 'high', 'low', and 'close',
+        or a panel (see `panel.as_panel`) with one column per symbol in each field.
     atr_period : int
         The period for calculating the Average True Range (ATR).
     factor : float
         The multiplier for the ATR used to calculate the upper and lower bands.
+    ratchet : bool, optional
+        If True (default), carry the final upper/lower bands over between bars so the
+        line only tightens in the direction of the trend. If False, reproduce the
+        original flip-only loop (results parity with earlier versions).
 
     Returns:
     --------
@@ -29,6 +39,10 @@ def calculate_supertrend(data, atr_period, factor):
         - 'lower_band': Lower band of the Supertrend.
         - 'supertrend_l': Supertrend values for the trend direction.
         - 'supertrend_s': Smoothed Supertrend values.
+        With `ratchet=True` also:
+        - 'final_upper_band': Upper band after carry-over.
+        - 'final_lower_band': Lower band after carry-over.
+        - 'supertrend_dir': Trend direction (1 = up, -1 = down, 0 = warm-up).
 
     Example:
     --------
@@ -64,27 +78,17 @@ def calculate_supertrend(data, atr_period, factor):
     df['upper_band'] = df['hl2'] + factor * df['ATR']
     df['lower_band'] = df['hl2'] - factor * df['ATR']
 
-    # Initialize Supertrend columns
-    df['supertrend_l'] = 0.0
-
-    # Column index for faster computation
-    idx_supertrend = df.columns.get_loc('supertrend_l')
-    idx_upband = df.columns.get_loc('upper_band')
-    idx_lowband = df.columns.get_loc('lower_band')
-    idx_close = df.columns.get_loc('close')
-
-    # Set initial Supertrend value
-    df.iloc[0, idx_supertrend] = df['upper_band'].iloc[0]
-
-    # Calculate Supertrend values
-    for index in range(1, len(df)):
-        if df.iloc[index, idx_close] > df.iloc[index - 1, idx_supertrend]:
-            df.iloc[index, idx_supertrend] = df.iloc[index, idx_upband]
-        else:
-            df.iloc[index, idx_supertrend] = df.iloc[index, idx_lowband]
+    if ratchet:
+        final_upper, final_lower, supertrend, direction = supertrend_kernel(
+            close, df['upper_band'], df['lower_band'])
+        df['final_upper_band'] = wrap_like(final_upper, close)
+        df['final_lower_band'] = wrap_like(final_lower, close)
+        df['supertrend_dir'] = wrap_like(direction, close)
+    else:
+        supertrend = supertrend_flip_kernel(close, df['upper_band'], df['lower_band'])
+    df['supertrend_l'] = wrap_like(supertrend, close)
 
     # Add smoothed Supertrend column
     df['supertrend_s'] = df['supertrend_l']
 
     return df
- 
@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from .kernels import supertrend_flip_kernel, supertrend_kernel
+from .profiling import profiled
+from .rolling_extremum import rolling_extremum
+
+
+def _ema_cache(series, spans):
+    # One EMA per distinct span, shared by every grid point that uses it
+    return {span: series.ewm(span=span, adjust=False).mean() for span in sorted(set(spans))}
+
+
+@profiled
+def sweep_macd(data, grid):
+    """
+    Evaluate `calculate_macd` over a grid of (short, long, signal) windows in one pass.
+
+    Each distinct EMA span of the close is computed once and reused by every triple
+    that needs it, and all MACD lines sharing a signal window are smoothed together.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame
+        A DataFrame containing the 'close' column.
+    grid : iterable of tuple
+        (short_window, long_window, signal_window) triples.
+
+    Returns:
+    -------
+    macd_line : pandas.DataFrame
+        One column per triple (MultiIndex: short_window, long_window, signal_window).
+    signal_line : pandas.DataFrame
+        The matching signal lines.
+
+    Example Usage:
+    --------------
+    ```python
+    from itertools import product
+    grid = [(s, l, g) for s, l, g in product([8, 12], [21, 26], [9]) if s < l]
+    macd_line, signal_line = sweep_macd(data, grid)
+    macd_line[(12, 26, 9)]   # same values as calculate_macd(data, 12, 26, 9)[0]
+    ```
+    """
+    grid = [tuple(params) for params in grid]
+    close = data['close']
+    emas = _ema_cache(close, [p[0] for p in grid] + [p[1] for p in grid])
+
+    pairs = sorted({(short, long) for short, long, _ in grid})
+    lines = pd.DataFrame({pair: emas[pair[0]] - emas[pair[1]] for pair in pairs}, index=close.index)
+
+    signals = {}
+    for signal_window in sorted({p[2] for p in grid}):
+        needed = sorted({(s, l) for s, l, g in grid if g == signal_window})
+        smoothed = lines[needed].ewm(span=signal_window, adjust=False).mean()
+        for pair in needed:
+            signals[pair + (signal_window,)] = smoothed[pair]
+
+    columns = pd.MultiIndex.from_tuples(grid, names=['short_window', 'long_window', 'signal_window'])
+    macd_line = pd.DataFrame({params: lines[params[:2]] for params in grid}, index=close.index)
+    signal_line = pd.DataFrame({params: signals[params] for params in grid}, index=close.index)
+    macd_line.columns = columns
+    signal_line.columns = columns
+    return macd_line, signal_line
+
+
+@profiled
+def sweep_supertrend(data, atr_periods, factors, ratchet=True):
+    """
+    Evaluate `calculate_supertrend` over every (atr_period, factor) combination.
+
+    The true range is computed once, the ATR once per period, and for each period
+    all factors run through the Supertrend kernel together as columns of one
+    2-D band matrix.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame
+        A DataFrame with 'high', 'low', and 'close' columns.
+    atr_periods : iterable of int
+        ATR periods to evaluate.
+    factors : iterable of float
+        ATR multipliers to evaluate.
+    ratchet : bool, optional
+        Passed through to the Supertrend kernel; see `calculate_supertrend`.
+
+    Returns:
+    -------
+    supertrend : pandas.DataFrame
+        The Supertrend line, one column per (atr_period, factor).
+    direction : pandas.DataFrame
+        Trend direction (1 = up, -1 = down, 0 = warm-up); empty if `ratchet` is False.
+    """
+    high, low, close = data['high'], data['low'], data['close']
+    prev_close = close.shift(1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    hl2 = ((high + low) / 2).to_numpy()[:, None]
+    factors = np.asarray(list(factors), dtype=np.float64)
+
+    lines, directions, keys = [], [], []
+    for atr_period in atr_periods:
+        atr = tr.rolling(window=atr_period).mean().to_numpy()[:, None]
+        upper = hl2 + factors * atr
+        lower = hl2 - factors * atr
+        closes = np.broadcast_to(close.to_numpy()[:, None], upper.shape)
+        if ratchet:
+            _, _, line, direction = supertrend_kernel(closes, upper, lower)
+            directions.append(direction)
+        else:
+            line = supertrend_flip_kernel(closes, upper, lower)
+        lines.append(line)
+        keys.extend((atr_period, factor) for factor in factors.tolist())
+
+    columns = pd.MultiIndex.from_tuples(keys, names=['atr_period', 'factor'])
+    supertrend = pd.DataFrame(np.hstack(lines), index=close.index, columns=columns)
+    if ratchet:
+        direction = pd.DataFrame(np.hstack(directions), index=close.index, columns=columns)
+    else:
+        direction = pd.DataFrame(index=close.index)
+    return supertrend, direction
+
+
+@profiled
+def sweep_bollinger_bands(data, windows, num_sds):
+    """
+    Evaluate `calculate_bollinger_bands` over every (window, num_sd) combination.
+
+    The rolling mean and standard deviation are computed once per window and
+    reused for every `num_sd`.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame
+        A DataFrame containing the 'close' column.
+    windows : iterable of int
+        Rolling windows to evaluate.
+    num_sds : iterable of float
+        Band widths in standard deviations.
+
+    Returns:
+    -------
+    upper_band : pandas.DataFrame
+        One column per (window, num_sd).
+    lower_band : pandas.DataFrame
+        The matching lower bands.
+    """
+    close = data['close']
+    num_sds = list(num_sds)
+    upper, lower = {}, {}
+    for window in windows:
+        rolling = close.rolling(window)
+        sma = rolling.mean()
+        rolling_std = rolling.std()
+        for num_sd in num_sds:
+            upper[(window, num_sd)] = sma + (rolling_std * num_sd)
+            lower[(window, num_sd)] = sma - (rolling_std * num_sd)
+
+    upper_band = pd.DataFrame(upper, index=close.index)
+    lower_band = pd.DataFrame(lower, index=close.index)
+    upper_band.columns.names = lower_band.columns.names = ['window', 'num_sd']
+    return upper_band, lower_band
+
+
+@profiled
+def sweep_stochastic(data, lengths, smoothings):
+    """
+    Evaluate `calculate_stochastic` over every (length, smoothing) combination.
+
+    The raw %K is computed once per length (one `rolling_extremum` min and max
+    each, as in `calculate_stochastic`), then all raw %K lines sharing a smoothing
+    window are smoothed together.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame
+        A DataFrame with 'low', 'high', and 'close' columns.
+    lengths : iterable of int
+        Lookback periods for the lowest low and highest high.
+    smoothings : iterable of int
+        Smoothing windows for %K.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        Smoothed %K, one column per (length, smoothing).
+    """
+    close = data['close']
+    lengths = list(lengths)
+    raw = {}
+    for length in lengths:
+        lowest_low = rolling_extremum(data['low'], length, 'min')
+        highest_high = rolling_extremum(data['high'], length, 'max')
+        raw[length] = 100 * (close - lowest_low) / (highest_high - lowest_low)
+    raw = pd.DataFrame(raw, index=close.index)
+
+    smoothed = {}
+    for smoothing in smoothings:
+        stoch_k = raw.rolling(window=smoothing).mean()
+        for length in lengths:
+            smoothed[(length, smoothing)] = stoch_k[length]
+
+    result = pd.DataFrame(smoothed, index=close.index)
+    result.columns.names = ['length', 'smoothing']
+    return result
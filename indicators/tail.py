@@ -0,0 +1,135 @@
+import pandas as pd
+
+from .chunked import lookback as _lookback
+from .features import plan_features
+from .profiling import profiled
+
+# Tail-only evaluation. Windowed indicators only read their last `lookback` bars, and
+# EMA-based ones forget their start geometrically, so the latest values can be
+# computed from a short slice of history instead of the full series (see
+# `chunked.lookback` and `FeaturePlan.lookback`).
+
+
+def _last_rows(data, rows):
+    if isinstance(data, dict):
+        return {field: values.iloc[-rows:] for field, values in data.items()}
+    return data.iloc[-rows:].copy()
+
+
+@profiled
+def last_n(data, n, func, *args, tolerance=1e-6, lookback=None, **kwargs):
+    """
+    Computes only the last `n` values of an indicator, from the minimal slice of history.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame or dict
+        The indicator's input: a DataFrame, or a panel (see `panel.as_panel`).
+    n : int
+        Number of trailing bars to return.
+    func : callable
+        The indicator function.
+    *args, **kwargs
+        The indicator's parameters, as for a direct call (without the data argument).
+    tolerance : float, optional
+        Accuracy of the EMA-based indicators; see `chunked.lookback`. Default is 1e-6.
+    lookback : int, optional
+        Bars the value at a bar depends on, for functions without a declared one.
+
+    Returns:
+    -------
+    The indicator's result (Series, DataFrame, tuple or dict of them), restricted to
+    the last `n` bars.
+
+    Example Usage:
+    --------------
+    ```python
+    rsi = last_n(panel, 1, calculate_rsi, 14).iloc[-1]       # latest RSI per symbol
+    macd_line, signal_line = last_n(data, 5, calculate_macd)
+    ```
+    """
+    if lookback is None:
+        lookback = _lookback(func, *args, tolerance=tolerance, **kwargs)
+    result = func(_last_rows(data, lookback + n - 1), *args, **kwargs)
+    return _trailing(result, n)
+
+
+def _trailing(result, n):
+    if isinstance(result, tuple):
+        return tuple(_trailing(item, n) for item in result)
+    if isinstance(result, dict):
+        return {key: _trailing(value, n) for key, value in result.items()}
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.iloc[-n:]
+    return result[-n:]
+
+
+def latest(data, spec, tolerance=1e-6):
+    """
+    Evaluates a feature spec at the last bar only, reading just the history it needs.
+
+    Parameters:
+    ----------
+    data : pandas.DataFrame or dict
+        OHLCV DataFrame, or a panel with one column per symbol.
+    spec : list
+        Feature spec; see `features.plan_features`.
+    tolerance : float, optional
+        Accuracy of EMA-based features; see `FeaturePlan.lookback`. Default is 1e-6.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        One row per symbol (a single row for a DataFrame input), one column per feature.
+    """
+    plan = plan_features(spec)
+    features = plan.run(_last_rows(data, plan.lookback(tolerance)))
+    if isinstance(features, pd.DataFrame):
+        return features.iloc[[-1]]
+    return pd.DataFrame({name: values.iloc[-1] for name, values in features.items()})
+
+
+@profiled
+def screen(data, spec, condition, tolerance=1e-6):
+    """
+    Filters a universe on conditions over the latest indicator values.
+
+    All symbols of the panel are evaluated together: the features are computed on
+    the last `FeaturePlan.lookback` bars only, and `condition` is applied to the
+    resulting symbols x features table in one vectorized step.
+
+    Parameters:
+    ----------
+    data : dict
+        A panel (see `panel.as_panel`) with one column per symbol.
+    spec : list
+        Feature spec; see `features.plan_features`. Use 'name' to give the features
+        short names for the condition.
+    condition : callable or str
+        A function of the latest-values DataFrame returning a boolean Series, or a
+        `DataFrame.query` expression over the feature names.
+    tolerance : float, optional
+        Accuracy of EMA-based features. Default is 1e-6.
+
+    Returns:
+    -------
+    pandas.DataFrame
+        The latest values of the symbols that meet the condition.
+
+    Example Usage:
+    --------------
+    ```python
+    picks = screen(panel, [
+        {'indicator': 'rsi', 'params': {'length': 14}, 'name': 'rsi'},
+        {'indicator': 'stochastic', 'name': 'stoch'},
+        {'indicator': 'bollinger_position', 'name': 'bb_pos'},
+        {'indicator': 'macd', 'name': 'macd'},
+        {'indicator': 'adx', 'outputs': ['adx'], 'name': 'adx'},
+    ], 'rsi < 30 and stoch < 20 and bb_pos < 0 and macd_macd > macd_signal and adx > 25')
+    symbols = picks.index
+    ```
+    """
+    values = latest(data, spec, tolerance)
+    if isinstance(condition, str):
+        return values.query(condition)
+    return values[condition(values)]
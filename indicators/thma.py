@@ -0,0 +1,34 @@
+from .kernels import hull_kernel
+from .panel import wrap_like
+from .profiling import profiled
+
+@profiled
+def thma(src_col, period):
+    """
+    Calculates the Triple Hull Moving Average (THMA) for a given data series.
+
+    The THMA applies the HMA calculation three times to achieve greater smoothness and 
+    responsiveness, which makes it effective for identifying trends and momentum shifts:
+    THMA = 3 * (HMA1 - HMA2) + HMA3, where each HMA smooths the previous one. The
+    three HMAs are evaluated together in one pass over the data.
+
+    Parameters:
+    ----------
+    src_col : pd.Series or pd.DataFrame
+        The source data (e.g., closing prices), or a panel field with one column
+        per symbol.
+    period : int
+        The lookback period for the THMA (at least 2).
+
+    Returns:
+    -------
+    pd.Series or pd.DataFrame
+        A series representing the THMA values.
+
+    Example Usage:
+    --------------
+    ```python
+    thma_result = thma(data['close'], period=14)
+    ```
+    """
+    return wrap_like(hull_kernel(src_col, period, triple=True), src_col)
@@ -0,0 +1,393 @@
+import copy
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from .chunked import chunked
+from .profiling import profiled
+
+# Higher-timeframe bars are built from base bars with a DatetimeIndex. Timeframes
+# are fixed frequencies ('5min', '15min', '1h', '1D'): a base bar belongs to the
+# bucket `timestamp.floor(rule)`, and a higher-timeframe bar is labelled by the start
+# of its bucket. Because the base bars are sorted, every bucket is a contiguous run
+# of rows, and each field is aggregated in one vectorized `reduceat` pass.
+#
+# A higher-timeframe bar is known once its last base bar has closed, so its values
+# are aligned onto that base bar and carried forward from there; earlier base bars
+# in the bucket never see them (no look-ahead).
+AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def _buckets(index, rule):
+    labels = index.floor(rule)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    return labels[starts], starts
+
+
+def _aggregate(values, starts, how):
+    # `values` is 2-D (time x columns); NaNs are skipped as in pandas' resample
+    n = len(values)
+    valid = ~np.isnan(values)
+    if how == 'max':
+        return np.fmax.reduceat(values, starts, axis=0)
+    if how == 'min':
+        return np.fmin.reduceat(values, starts, axis=0)
+    if how == 'sum':
+        return np.add.reduceat(np.where(valid, values, 0.0), starts, axis=0)
+    rows = np.arange(n)[:, None]
+    if how == 'first':
+        pos = np.minimum.reduceat(np.where(valid, rows, n), starts, axis=0)
+    elif how == 'last':
+        pos = np.maximum.reduceat(np.where(valid, rows, -1), starts, axis=0)
+    else:
+        raise ValueError(f"Unknown aggregation '{how}'; use first, last, max, min or sum.")
+    found = (pos >= 0) & (pos < n)
+    return np.where(found, np.take_along_axis(values, np.clip(pos, 0, n - 1), axis=0), np.nan)
+
+
+def _base_step(index):
+    steps = np.diff(index.asi8)
+    return pd.Timedelta(int(steps[steps > 0].min())) if (steps > 0).any() else None
+
+
+def _last_complete(index, labels, rule, step):
+    # Buckets before the last are complete; the last one is once its final base
+    # bar (the one ending at or after the bucket's end) has arrived
+    if len(labels) == 0:
+        return 0
+    if step is not None and index[-1] + step >= labels[-1] + to_offset(rule):
+        return len(labels)
+    return len(labels) - 1
+
+
+@profiled
+def resample_bars(data, rule, how=None, partial=True):
+    """
+    Aggregates base OHLCV bars into bars of a higher timeframe.
+
+    Parameters:
+    ----------
+    data : pd.DataFrame or dict
+        Base bars with a sorted DatetimeIndex, or a panel (see `panel.as_panel`).
+    rule : str
+        A fixed frequency such as '5min', '15min', '1h' or '1D'.
+    how : dict, optional
+        Column -> 'first', 'last', 'max', 'min' or 'sum', added to (or overriding)
+        `AGGREGATIONS`. Columns without an aggregation are dropped.
+    partial : bool, optional
+        Keep the last bar even if its bucket is not complete yet. Default is True.
+
+    Returns:
+    -------
+    pd.DataFrame or dict
+        One row per bucket, labelled by the bucket's start; a panel for a panel.
+
+    Example Usage:
+    --------------
+    ```python
+    bars_15m = resample_bars(bars_1m, '15min')
+    rsi_15m = calculate_rsi(bars_15m, 14)
+    ```
+    """
+    how = {**AGGREGATIONS, **(how or {})}
+    frames = data if isinstance(data, dict) else {column: data[[column]] for column in data.columns}
+    frames = {field: frame for field, frame in frames.items() if field in how}
+    index = next(iter(frames.values())).index
+    labels, starts = _buckets(index, rule)
+    keep = len(labels) if partial else _last_complete(index, labels, rule, _base_step(index))
+
+    fields = {}
+    for field, frame in frames.items():
+        values = _aggregate(frame.to_numpy(dtype=np.float64), starts, how[field])[:keep]
+        fields[field] = pd.DataFrame(values, index=labels[:keep], columns=frame.columns)
+    if isinstance(data, dict):
+        return fields
+    return pd.DataFrame({field: frame.iloc[:, 0] for field, frame in fields.items()})
+
+
+def align(result, base_index, rule, step=None):
+    """
+    Aligns a higher-timeframe result onto the base bars without look-ahead.
+
+    Each higher-timeframe row becomes visible at the last base bar of its bucket
+    and is carried forward until the next one; base bars before that (and an
+    incomplete last bucket) see the previous completed bar's value.
+
+    Parameters:
+    ----------
+    result : pd.Series, pd.DataFrame or tuple
+        Indicator output on `resample_bars(..., rule)` bars.
+    base_index : pd.DatetimeIndex
+        The base bars' index.
+    rule : str
+        The timeframe the result was computed on.
+    step : pd.Timedelta, optional
+        Base bar length, used to tell whether the last bucket is complete. Default
+        is the smallest gap between base bars.
+
+    Returns:
+    -------
+    same type as `result`
+        Indexed like `base_index`; NaN before the first completed bar.
+
+    Example Usage:
+    --------------
+    ```python
+    data['rsi_1h'] = align(calculate_rsi(resample_bars(data, '1h'), 14), data.index, '1h')
+    ```
+    """
+    if isinstance(result, tuple):
+        return tuple(align(item, base_index, rule, step) for item in result)
+    labels, starts = _buckets(base_index, rule)
+    complete = _last_complete(base_index, labels, rule, step if step is not None else _base_step(base_index))
+    ends = np.r_[starts[1:], len(base_index)] - 1
+
+    # The base row at which each result row becomes known
+    buckets = pd.Index(labels[:complete]).get_indexer(result.index)
+    result = result.iloc[buckets >= 0]
+    known_at = ends[buckets[buckets >= 0]]
+    take = np.searchsorted(known_at, np.arange(len(base_index)), side='right') - 1
+    aligned = result.iloc[np.maximum(take, 0)].set_axis(base_index, axis=0)
+    visible = take >= 0
+    if isinstance(aligned, pd.DataFrame):
+        return aligned.where(pd.Series(visible, index=base_index), axis=0)
+    return aligned.where(visible)
+
+
+def _concat(parts):
+    if isinstance(parts[0], tuple):
+        return tuple(pd.concat(items) for items in zip(*parts))
+    return pd.concat(parts)
+
+
+class _Timeframe:
+    # Completed bars of one timeframe, the base rows of its open bucket, and the
+    # indicators computed on it
+    def __init__(self, rule):
+        self.rule = rule
+        self.parts = []
+        self.bars = None
+        self.pending = None
+        self.indicators = {}
+
+
+class _Indicator:
+    # One indicator on one timeframe: a chunked indicator fed the new completed
+    # bars, or (for functions that cannot be chunked) a rerun over all of them
+    def __init__(self, func, args, kwargs, lookback, source):
+        self.func, self.args, self.kwargs, self.source = func, args, kwargs, source
+        try:
+            self.chunked = chunked(func, *args, lookback=lookback, **kwargs)
+        except ValueError:
+            self.chunked = None
+        self.parts = []
+        self.result = None
+        self.result_rows = -1
+
+    def _input(self, bars):
+        return bars[self.source] if self.source is not None else bars.copy()
+
+    def feed(self, bars):
+        if self.chunked is not None and len(bars):
+            self.parts.append(self.chunked(self._input(bars)))
+            self.result = None
+
+    def value(self, bars):
+        # `bars`: every completed bar of the timeframe
+        if self.chunked is None:
+            if self.result_rows != len(bars):
+                self.result = self.func(self._input(bars), *self.args, **self.kwargs)
+                self.result_rows = len(bars)
+        elif self.result is None and self.parts:
+            self.result = _concat(self.parts)
+            self.parts = [self.result]
+        return self.result
+
+    def developing(self, bars, bar):
+        # The value for the open bucket, leaving the carried state untouched
+        if self.chunked is not None:
+            return copy.deepcopy(self.chunked)(self._input(bar))
+        return _last_row(self.func(self._input(pd.concat([bars, bar])), *self.args, **self.kwargs))
+
+
+class MultiTimeframe:
+    """
+    Higher-timeframe bars and indicators maintained incrementally from base bars.
+
+    Every timeframe keeps its completed bars and the base rows of its open bucket.
+    `update` aggregates only the new base bars (plus the open bucket's rows) and
+    feeds the newly completed bars to each indicator through `chunked.chunked`, so
+    recursive and windowed indicators continue from their carried state instead of
+    being recomputed; functions that cannot be chunked are rerun over the completed
+    bars when these change. Adding a timeframe costs one aggregation pass over the
+    base bars seen so far.
+
+    Parameters:
+    ----------
+    bars : pd.DataFrame, optional
+        Initial base bars with a sorted DatetimeIndex.
+    timeframes : iterable of str, optional
+        Timeframes to maintain, e.g. ('5min', '15min', '1h').
+    how : dict, optional
+        Extra column aggregations; see `resample_bars`.
+    step : pd.Timedelta, optional
+        Base bar length. Default is the smallest gap between the first base bars.
+
+    Example Usage:
+    --------------
+    ```python
+    mtf = MultiTimeframe(history_1m, timeframes=('5min', '15min', '1h'))
+    data['rsi_1h'] = mtf.aligned('1h', calculate_rsi, 14)
+
+    mtf.update(new_1m_bars)                          # only the new bars are processed
+    macd_15m, signal_15m = mtf.indicator('15min', calculate_macd, partial=True)
+    ```
+    """
+
+    def __init__(self, bars=None, timeframes=(), how=None, step=None):
+        self.how = {**AGGREGATIONS, **(how or {})}
+        self.step = step
+        self._base = []
+        self._frames = {}
+        if bars is not None:
+            self.update(bars)
+        for rule in timeframes:
+            self.add_timeframe(rule)
+
+    @property
+    def base(self):
+        """All base bars seen so far."""
+        if len(self._base) > 1:
+            self._base = [pd.concat(self._base)]
+        return self._base[0] if self._base else None
+
+    @property
+    def timeframes(self):
+        return list(self._frames)
+
+    def add_timeframe(self, rule):
+        """
+        Starts maintaining `rule`, aggregating the base bars seen so far once.
+        """
+        to_offset(rule)
+        if rule not in self._frames:
+            frame = self._frames[rule] = _Timeframe(rule)
+            if self._base:
+                self._advance(frame, self.base)
+        return self
+
+    def update(self, bars):
+        """
+        Appends new base bars (later than every bar seen so far) and advances every
+        timeframe and its indicators.
+        """
+        if not len(bars):
+            return self
+        if not bars.index.is_monotonic_increasing:
+            raise ValueError("Base bars must be sorted by time.")
+        if self._base and bars.index[0] <= self._base[-1].index[-1]:
+            raise ValueError("New base bars must come after the bars already seen.")
+        if self.step is None:
+            self.step = _base_step(bars.index)
+        self._base.append(bars)
+        for frame in self._frames.values():
+            self._advance(frame, bars)
+        return self
+
+    def _advance(self, frame, bars):
+        rows = bars if frame.pending is None else pd.concat([frame.pending, bars])
+        labels, starts = _buckets(rows.index, frame.rule)
+        if frame.parts and labels[0] <= frame.parts[-1].index[-1]:
+            raise ValueError(f"Base bars at {rows.index[0]} fall into a closed {frame.rule} bar.")
+        complete = _last_complete(rows.index, labels, frame.rule, self.step)
+        frame.pending = rows.iloc[starts[complete]:] if complete < len(labels) else None
+        if complete:
+            done = resample_bars(rows.iloc[:starts[complete]] if frame.pending is not None else rows,
+                                 frame.rule, self.how)
+            frame.parts.append(done)
+            frame.bars = None
+            for indicator in frame.indicators.values():
+                indicator.feed(done)
+
+    def bars(self, rule, partial=False):
+        """
+        The completed bars of `rule`, with the bar still forming as the last row
+        if `partial`.
+        """
+        frame = self._frames[rule] if rule in self._frames else self.add_timeframe(rule)._frames[rule]
+        if frame.bars is None:
+            frame.parts = [pd.concat(frame.parts)] if frame.parts else []
+            frame.bars = frame.parts[0] if frame.parts else pd.DataFrame(columns=list(self.how))
+        if partial and frame.pending is not None:
+            return pd.concat([frame.bars, resample_bars(frame.pending, rule, self.how)])
+        return frame.bars
+
+    def indicator(self, rule, func, *args, partial=False, lookback=None, source=None, **kwargs):
+        """
+        An indicator over the bars of `rule`, cached and extended as bars complete.
+
+        Parameters:
+        ----------
+        rule : str
+            The timeframe.
+        func : callable
+            Any indicator function of this package.
+        *args, **kwargs
+            The indicator's parameters, as for a direct call (without the data).
+        partial : bool, optional
+            Append the value for the bar still forming. Its state is not kept, so
+            the value is revised until the bar completes. Default is False.
+        lookback : int, optional
+            See `chunked.chunked`.
+        source : str, optional
+            Pass this column as a Series, for functions such as `hma` that take one.
+
+        Returns:
+        -------
+        pd.Series, pd.DataFrame or tuple
+            What `func` returns on the timeframe's bars, labelled by bar start.
+        """
+        bars = self.bars(rule)
+        frame = self._frames[rule]
+        key = (func, repr(args), repr(sorted(kwargs.items())), lookback, source)
+        if key not in frame.indicators:
+            indicator = frame.indicators[key] = _Indicator(func, args, kwargs, lookback, source)
+            indicator.feed(bars)
+        indicator = frame.indicators[key]
+        result = indicator.value(bars)
+        if partial and frame.pending is not None:
+            developing = indicator.developing(bars, resample_bars(frame.pending, rule, self.how))
+            result = _concat([result, developing]) if result is not None else developing
+        return result
+
+    def aligned(self, rule, func, *args, partial=False, lookback=None, source=None, **kwargs):
+        """
+        `indicator` aligned onto the base bars without look-ahead (see `align`).
+
+        With `partial`, the latest base bar also gets the value of the bar still
+        forming, which is what a live strategy sees at that moment; earlier base
+        bars keep the last completed value.
+        """
+        result = self.indicator(rule, func, *args, lookback=lookback, source=source, **kwargs)
+        base = self.base
+        aligned = align(result, base.index, rule, self.step)
+        frame = self._frames[rule]
+        if partial and frame.pending is not None:
+            last = self.indicator(rule, func, *args, partial=True, lookback=lookback, source=source, **kwargs)
+            aligned = _set_last(aligned, _last_row(last))
+        return aligned
+
+
+def _last_row(result):
+    if isinstance(result, tuple):
+        return tuple(_last_row(item) for item in result)
+    return result.iloc[-1:]
+
+
+def _set_last(aligned, row):
+    if isinstance(aligned, tuple):
+        return tuple(_set_last(item, value) for item, value in zip(aligned, row))
+    aligned = aligned.copy()
+    aligned.iloc[-1] = row.iloc[0]
+    return aligned
@@ -0,0 +1,524 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+from .kernels import (fibobars_kernel, heikin_ashi_kernel, hull_kernel, kalman_kernel, obv_kernel, psar_kernel,
+                     supertrend_flip_kernel, supertrend_kernel, wma_kernel)
+from .rolling_extremum import rolling_extremum
+
+# Values-only versions of the indicators. Each function takes the price arrays it
+# needs (1-D, or 2-D time x symbols) and returns NumPy arrays without copying or
+# modifying its inputs: float64 arrays, Series and DataFrames are read in place.
+# Only the requested outputs are returned, optionally written into caller-supplied
+# `out=` buffers (a tuple of buffers for functions with several outputs).
+# Intermediates such as the Supertrend bands or the ADX directional movement live
+# in temporaries and are handed back only with `intermediates=True`, as an extra
+# dict. Results equal those of the DataFrame functions.
+#
+# With `dtype=np.float32` inputs, temporaries and outputs stay float32. Rolling
+# sums, weighted sums and EMA recursions are accumulated in float64 a block of rows
+# at a time, and the path-dependent kernels (PSAR, Supertrend, Fibobars, Kalman gain
+# and error, OBV running total) keep their state in float64.
+# `python -m indicators.benchmark --accuracy` reports the deviation from the float64
+# path for every function, and fails when one exceeds the tolerance: whatever the
+# length of the series, the float32 arithmetic of continuous outputs stays within
+# 5e-6 of the float64 output's largest value. Rounding the inputs to float32 adds to
+# that, most for KVO, whose money-flow multiplier divides by the bar's range and so
+# is off by more on the narrowest bar of a longer series. Outputs that compare
+# prices (Supertrend, PSAR, Fibobars, OBV, ADX, Dirmov, Aroon) can differ on the few
+# bars where float32 rounding ties two prices or moves one across a band.
+_BLOCK_ROWS = 1 << 16
+
+
+def _quiet(func):
+    # Division by a zero range or average is expected; pandas stays silent about it too
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _arr(values, dtype=np.float64):
+    # Zero-copy when the input already has the requested dtype
+    return np.asarray(values, dtype=dtype)
+
+
+def _cast(values, dtype):
+    return values.astype(dtype) if values.dtype.kind == 'f' and values.dtype != dtype else values
+
+
+def _pd(values):
+    return pd.DataFrame(values, copy=False) if values.ndim == 2 else pd.Series(values, copy=False)
+
+
+def _rolling(values, window, method):
+    if values.dtype == np.float64:
+        return getattr(_pd(values).rolling(window=window), method)().to_numpy()
+    # float32: accumulate in float64 one block of rows at a time, each block led by
+    # the previous `window - 1` rows, so only a block is ever held in float64
+    out = np.empty(values.shape, dtype=values.dtype)
+    for start in range(0, len(values), _BLOCK_ROWS):
+        stop = min(start + _BLOCK_ROWS, len(values))
+        lead = min(start, window - 1)
+        block = values[start - lead:stop].astype(np.float64)
+        out[start:stop] = getattr(_pd(block).rolling(window=window), method)().to_numpy()[lead:]
+    return out
+
+
+def _rolling_mean(values, window):
+    return _rolling(values, window, 'mean')
+
+
+def _rolling_std(values, window):
+    return _rolling(values, window, 'std')
+
+
+def _rolling_sum(values, window):
+    return _rolling(values, window, 'sum')
+
+
+def _ewm(values, span):
+    if values.dtype == np.float64:
+        return _pd(values).ewm(span=span, adjust=False).mean().to_numpy()
+    # float32: run the recursion in float64 block by block. Each block is led by the
+    # previous output of every column, placed as many rows back as that column has
+    # trailing NaNs, which continues pandas' recursion (gaps are capped at a block).
+    out = np.empty(values.shape, dtype=values.dtype)
+    columns, out_columns = values.reshape(len(values), -1), out.reshape(len(values), -1)
+    width = columns.shape[1]
+    last, gap = np.full(width, np.nan), np.zeros(width, dtype=np.int64)
+    for start in range(0, len(values), _BLOCK_ROWS):
+        block = columns[start:start + _BLOCK_ROWS].astype(np.float64)
+        started = np.flatnonzero(~np.isnan(last))
+        height = int(gap[started].max()) + 1 if len(started) else 0
+        head = np.full((height, width), np.nan)
+        head[height - 1 - gap[started], started] = last[started]
+        result = pd.DataFrame(np.vstack([head, block]), copy=False).ewm(span=span, adjust=False).mean()
+        result = result.to_numpy()[height:]
+        out_columns[start:start + len(block)] = result
+
+        observed = ~np.isnan(block)
+        seen = observed.any(axis=0)
+        last_row = len(block) - 1 - np.argmax(observed[::-1], axis=0)
+        last = np.where(seen, result[last_row, np.arange(width)], last)
+        gap = np.minimum(np.where(seen, len(block) - 1 - last_row, gap + len(block)), _BLOCK_ROWS)
+    return out
+
+
+def _shift(values, periods=1):
+    shifted = np.full(values.shape, np.nan, dtype=values.dtype)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+
+def _emit(result, out):
+    # Copies the result(s) into the caller's buffers, if any
+    if out is None:
+        return result
+    if isinstance(result, tuple):
+        for buffer, values in zip(out, result):
+            np.copyto(buffer, values)
+        return tuple(out)
+    np.copyto(out, result)
+    return out
+
+
+def _finish(result, out, intermediates, extras):
+    result = _emit(result, out)
+    return (result, extras()) if intermediates else result
+
+
+def sma(values, period=14, dtype=np.float64, out=None):
+    """
+    Simple moving average (`calculate_sma`).
+    """
+    return _emit(_rolling_mean(_arr(values, dtype), period), out)
+
+
+def ema(values, period, dtype=np.float64, out=None):
+    """
+    Exponential moving average with `span=period`, adjust=False (`calculate_ema`).
+    """
+    return _emit(_ewm(_arr(values, dtype), period), out)
+
+
+def macd(close, short_window=12, long_window=26, signal_window=9, dtype=np.float64, out=None):
+    """
+    MACD line and signal line (`calculate_macd`).
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (macd_line, signal_line)
+    """
+    close = _arr(close, dtype)
+    macd_line = np.subtract(_ewm(close, short_window), _ewm(close, long_window),
+                            out=None if out is None else out[0])
+    signal_line = _emit(_ewm(macd_line, signal_window), None if out is None else out[1])
+    return macd_line, signal_line
+
+
+@_quiet
+def rsi(close, length=14, dtype=np.float64, out=None):
+    """
+    Relative Strength Index with simple-average smoothing (`calculate_rsi`).
+    """
+    close = _arr(close, dtype)
+    delta = close - _shift(close)
+    missing = np.isnan(close)
+    gain = np.where(missing, np.nan, np.where(delta > 0, delta, 0))
+    loss = np.where(missing, np.nan, np.where(delta < 0, -delta, 0))
+    rs = _rolling_mean(gain, length) / _rolling_mean(loss, length)
+    return _emit(100 - (100 / (1 + rs)), out)
+
+
+def true_range(high, low, close, dtype=np.float64, out=None):
+    """
+    True range; the first bar is its high - low (`calculate_true_range`).
+    """
+    high, low, close = _arr(high, dtype), _arr(low, dtype), _arr(close, dtype)
+    prev_close = _shift(close)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _emit(tr, out)
+
+
+def atr(high, low, close, window=14, dtype=np.float64, out=None):
+    """
+    Average True Range (`calculate_atr`).
+    """
+    return _emit(_rolling_mean(true_range(high, low, close, dtype), window), out)
+
+
+def bollinger_bands(close, window=20, num_sd=2, dtype=np.float64, out=None, intermediates=False):
+    """
+    Bollinger Bands (`calculate_bollinger_bands`).
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (upper_band, lower_band); with `intermediates`, also {'sma', 'std'}.
+    """
+    close = _arr(close, dtype)
+    mean = _rolling_mean(close, window)
+    rolling_std = _rolling_std(close, window)
+    width = rolling_std * num_sd
+    result = (mean + width, mean - width)
+    return _finish(result, out, intermediates, lambda: {'sma': mean, 'std': rolling_std})
+
+
+def supertrend(high, low, close, atr_period=10, factor=3, ratchet=True, dtype=np.float64, out=None, intermediates=False):
+    """
+    Supertrend line (`calculate_supertrend(...)['supertrend_l']`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The Supertrend line; with `intermediates`, also {'atr', 'upper_band',
+        'lower_band'} plus, when `ratchet` is True, {'final_upper_band',
+        'final_lower_band', 'direction'}.
+
+    Example Usage:
+    --------------
+    ```python
+    line = np.empty(len(close))
+    supertrend(high, low, close, 10, 3, out=line)
+    line, extra = supertrend(high, low, close, 10, 3, intermediates=True)
+    extra['direction']      # 1 = up, -1 = down
+    ```
+    """
+    high, low, close = _arr(high, dtype), _arr(low, dtype), _arr(close, dtype)
+    prev_close = _shift(close)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    average = _rolling_mean(tr, atr_period)
+    hl2 = (high + low) / 2
+    upper_band = hl2 + factor * average
+    lower_band = hl2 - factor * average
+    extras = {'atr': average, 'upper_band': upper_band, 'lower_band': lower_band}
+    if ratchet:
+        final_upper, final_lower, line, direction = supertrend_kernel(close, upper_band, lower_band)
+        extras.update(final_upper_band=_cast(final_upper, dtype), final_lower_band=_cast(final_lower, dtype),
+                      direction=direction)
+    else:
+        line = supertrend_flip_kernel(close, upper_band, lower_band)
+    line = _cast(line, dtype)
+    return _finish(line, out, intermediates, lambda: extras)
+
+
+@_quiet
+def adx(high, low, close, period=14, smoothing_period=14, dtype=np.float64, out=None, intermediates=False):
+    """
+    Average Directional Index (`calculate_adx(...)['ADX']`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The ADX; with `intermediates`, also {'tr', 'dm_plus', 'dm_minus', 'di_plus',
+        'di_minus', 'dx'} (the smoothed TR and DM, as in the DataFrame version).
+    """
+    high, low, close = _arr(high, dtype), _arr(low, dtype), _arr(close, dtype)
+    prev_close = _shift(close)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    up = high - _shift(high)
+    down = _shift(low) - low
+    tr = _rolling_mean(tr, period)
+    dm_plus = _rolling_mean(np.where(up > down, np.maximum(up, 0), 0), period)
+    dm_minus = _rolling_mean(np.where(down > up, np.maximum(down, 0), 0), period)
+    di_plus = 100 * (dm_plus / tr)
+    di_minus = 100 * (dm_minus / tr)
+    dx = 100 * np.abs(di_plus - di_minus) / (di_plus + di_minus)
+    result = _rolling_mean(dx, smoothing_period)
+    return _finish(result, out, intermediates,
+                   lambda: {'tr': tr, 'dm_plus': dm_plus, 'dm_minus': dm_minus,
+                            'di_plus': di_plus, 'di_minus': di_minus, 'dx': dx})
+
+
+@_quiet
+def dirmov(high, low, length=14, dtype=np.float64, out=None):
+    """
+    Directional movement indicators (`calculate_dirmov`).
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (plus_di, minus_di)
+    """
+    high, low = _arr(high, dtype), _arr(low, dtype)
+    up = high - _shift(high)
+    down = _shift(low) - low
+    plus_dm = np.where((up > down) & (up > 0), up, 0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0)
+    tr = _rolling_mean(true_range(high, low, high, dtype), length)
+    plus_di = 100 * _rolling_mean(plus_dm, length) / tr
+    minus_di = 100 * _rolling_mean(minus_dm, length) / tr
+    plus_di[np.isnan(plus_di)] = 0
+    minus_di[np.isnan(minus_di)] = 0
+    return _emit((plus_di, minus_di), out)
+
+
+def psar(high, low, initial_af=0.0, max_af=0.2, step_af=0.02, dtype=np.float64, out=None, intermediates=False):
+    """
+    Parabolic SAR (`calculate_psar(...)['PSAR']`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The SAR; with `intermediates`, also {'trend', 'ep', 'af'}.
+    """
+    line, trend, ep, af = psar_kernel(high, low, initial_af, max_af, step_af)
+    return _finish(_cast(line, dtype), out, intermediates,
+                   lambda: {'trend': trend, 'ep': _cast(ep, dtype), 'af': _cast(af, dtype)})
+
+
+@_quiet
+def kvo(high, low, close, volume, short_period=34, long_period=55, dtype=np.float64, out=None, intermediates=False):
+    """
+    Klinger Volume Oscillator (`calculate_kvo(...)['KVO']`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The KVO; with `intermediates`, also {'mfm', 'mfv'}.
+    """
+    high, low, close = _arr(high, dtype), _arr(low, dtype), _arr(close, dtype)
+    mfm = ((close - low) - (high - close)) / (high - low)
+    mfv = mfm * _arr(volume, dtype)
+    result = np.subtract(_ewm(mfv, short_period), _ewm(mfv, long_period), out=out)
+    return (result, {'mfm': mfm, 'mfv': mfv}) if intermediates else result
+
+
+@_quiet
+def bbp(high, low, close, bbp_length=50, dtype=np.float64, out=None, intermediates=False):
+    """
+    Bull and Bear Power (`calculate_bbp(...)['BBP']`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The BBP; with `intermediates`, also {'bull_power', 'bear_power'}.
+    """
+    average = _ewm(_arr(close, dtype), bbp_length)
+    bull_power = _arr(high, dtype) - average
+    bear_power = _arr(low, dtype) - average
+    result = np.add(bull_power, bear_power, out=out)
+    return (result, {'bull_power': bull_power, 'bear_power': bear_power}) if intermediates else result
+
+
+@_quiet
+def coppock_curve(close, short_roc=11, long_roc=14, wma_period=10, dtype=np.float64, out=None, intermediates=False):
+    """
+    Coppock Curve (`calculate_coppock_curve(...)['CoppockCurve']`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The curve; with `intermediates`, also {'roc_short', 'roc_long', 'roc_sum'}.
+    """
+    close = _arr(close, dtype)
+    shifted_short, shifted_long = _shift(close, short_roc), _shift(close, long_roc)
+    roc_short = ((close - shifted_short) / shifted_short) * 100
+    roc_long = ((close - shifted_long) / shifted_long) * 100
+    roc_sum = roc_short + roc_long
+    result = _ewm(roc_sum, wma_period)
+    return _finish(result, out, intermediates,
+                   lambda: {'roc_short': roc_short, 'roc_long': roc_long, 'roc_sum': roc_sum})
+
+
+@_quiet
+def percentage_oscillator(values, short_length=10, long_length=21, dtype=np.float64, out=None):
+    """
+    Percentage Price Oscillator (`calculate_percentage_oscillator(...)['PO']`).
+    """
+    values = _arr(values, dtype)
+    short_ema, long_ema = _ewm(values, short_length), _ewm(values, long_length)
+    return _emit((short_ema - long_ema) / long_ema * 100, out)
+
+
+@_quiet
+def kairi_relative_index(ha_close, length=14, dtype=np.float64, out=None, intermediates=False):
+    """
+    Kairi Relative Index (`kairi_relative_index`).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The KRI; with `intermediates`, also {'sma'}.
+    """
+    ha_close = _arr(ha_close, dtype)
+    mean = _rolling_mean(ha_close, length)
+    result = ((ha_close - mean) / mean) * 100
+    return _finish(result, out, intermediates, lambda: {'sma': mean})
+
+
+def obv(close, volume, dtype=np.float64, out=None):
+    """
+    On-Balance Volume (`calculate_obv`).
+    """
+    return _emit(_cast(obv_kernel(close, volume), dtype), out)
+
+
+def kalman_filter(values, process_variance=1e-1, measurement_variance=1, smooth=False, dtype=np.float64, out=None):
+    """
+    Random-walk Kalman filter estimates, RTS-smoothed with `smooth` (`kalman_filter`).
+    """
+    estimates = kalman_kernel(values, process_variance, measurement_variance, smooth=smooth)
+    return _emit(_cast(estimates, dtype), out)
+
+
+def donchian(high, low, period=20, dtype=np.float64, out=None):
+    """
+    Donchian channel midline (`calculate_donchian`).
+    """
+    lowest = _rolling(_arr(low, dtype), period, 'min')
+    highest = _rolling(_arr(high, dtype), period, 'max')
+    return _emit((lowest + highest) / 2, out)
+
+
+def ichimoku(high, low, conversion_periods=9, base_periods=26, lagging_span2_periods=52, dtype=np.float64, out=None):
+    """
+    Ichimoku lines (`calculate_ichimoku`).
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (conversion_line, base_line, lead_line1, lead_line2)
+    """
+    conversion_line = donchian(high, low, conversion_periods, dtype)
+    base_line = donchian(high, low, base_periods, dtype)
+    lead_line1 = (conversion_line + base_line) / 2
+    lead_line2 = donchian(high, low, lagging_span2_periods, dtype)
+    return _emit((conversion_line, base_line, lead_line1, lead_line2), out)
+
+
+@_quiet
+def stochastic(high, low, close, length=14, smoothing=3, dtype=np.float64, out=None):
+    """
+    Smoothed stochastic %K (`calculate_stochastic`).
+    """
+    lowest = _rolling(_arr(low, dtype), length, 'min')
+    highest = _rolling(_arr(high, dtype), length, 'max')
+    stoch_k = 100 * (_arr(close, dtype) - lowest) / (highest - lowest)
+    return _emit(_rolling_mean(stoch_k, smoothing), out)
+
+
+@_quiet
+def aroon(high, low, period=14, dtype=np.float64, out=None):
+    """
+    Aroon Up and Down (`calculate_aroon`).
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (aroon_up, aroon_down)
+    """
+    _, since_high = rolling_extremum(_arr(high, dtype), period + 1, 'max', positions=True)
+    _, since_low = rolling_extremum(_arr(low, dtype), period + 1, 'min', positions=True)
+    aroon_up, aroon_down = 100 * (period - since_high) / period, 100 * (period - since_low) / period
+    return _emit((_cast(aroon_up, dtype), _cast(aroon_down, dtype)), out)
+
+
+@_quiet
+def mass_index(ha_high, ha_low, period=9, ema_period=25, dtype=np.float64, out=None):
+    """
+    Mass Index (`mass_index`).
+    """
+    ema1 = _ewm(_arr(ha_high, dtype) - _arr(ha_low, dtype), period)
+    ema2 = _ewm(ema1, period)
+    return _emit(_rolling_sum(ema1 / ema2, ema_period), out)
+
+
+def wma(values, period, dtype=np.float64, out=None):
+    """
+    Weighted moving average (`wma`).
+    """
+    values = _arr(values, dtype)
+    if values.dtype == np.float64:
+        return _emit(wma_kernel(values, period), out)
+    # float32: one block of rows at a time in float64, led by the previous `period - 1` rows
+    result = np.empty(values.shape, dtype=values.dtype) if out is None else out
+    for start in range(0, len(values), _BLOCK_ROWS):
+        lead = min(start, period - 1)
+        block = wma_kernel(values[start - lead:start + _BLOCK_ROWS], period)
+        result[start:start + len(block) - lead] = block[lead:]
+    return result
+
+
+def hma(values, period, dtype=np.float64, out=None):
+    """
+    Hull moving average (`hma`).
+    """
+    values = _arr(values, dtype)
+    return hull_kernel(values, period, out=np.empty(values.shape, dtype) if out is None else out)
+
+
+def thma(values, period, dtype=np.float64, out=None):
+    """
+    Triple Hull moving average (`thma`), in one fused pass.
+    """
+    values = _arr(values, dtype)
+    return hull_kernel(values, period, triple=True, out=np.empty(values.shape, dtype) if out is None else out)
+
+
+def heikin_ashi(open_price, high, low, close, dtype=np.float64, out=None):
+    """
+    Heikin-Ashi candles (`calculate_heikin_ashi`), ready for `fibobars`,
+    `mass_index` and `kairi_relative_index`.
+
+    Returns:
+    -------
+    tuple of numpy.ndarray
+        (ha_open, ha_high, ha_low, ha_close)
+    """
+    candles = heikin_ashi_kernel(open_price, high, low, close)
+    return _emit(tuple(_cast(values, dtype) for values in candles), out)
+
+
+def fibobars(ha_open, ha_high, ha_low, ha_close, period=14, fibo_level=0.618, dtype=np.float64, out=None):
+    """
+    Fibonacci-bar trend state (`calculate_fibobars`).
+    """
+    highest = _rolling(_arr(ha_high, dtype), period, 'max')
+    lowest = _rolling(_arr(ha_low, dtype), period, 'min')
+    return _emit(_cast(fibobars_kernel(highest, lowest, ha_close, ha_open, period, fibo_level), dtype), out)
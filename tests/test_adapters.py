@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from indicators.adapters import as_fields
+from indicators.backends import compute
+from indicators.benchmark import synthetic_ohlcv
+
+pa = pytest.importorskip('pyarrow')
+
+
+def test_sliced_arrow_array():
+    fields = as_fields(pa.array(np.arange(10.0)).slice(3, 4))
+    np.testing.assert_array_equal(fields['close'], [3.0, 4.0, 5.0, 6.0])
+
+
+def test_sliced_arrow_table():
+    table = pa.table({'Close': np.arange(10.0), 'volume': np.arange(10)}).slice(2, 5)
+    fields = as_fields(table)
+    np.testing.assert_array_equal(fields['close'], np.arange(2.0, 7.0))
+    np.testing.assert_array_equal(fields['volume'], np.arange(2, 7))
+
+
+def test_compute_on_sliced_table_matches_dataframe():
+    data = synthetic_ohlcv(500)
+    table = pa.table({name: data[name].to_numpy() for name in ('high', 'low', 'close')})
+    expected = compute('rsi', data.iloc[100:400].reset_index(drop=True), 14, backend='numpy')
+    result = compute('rsi', table.slice(100, 300), 14, backend='numpy')
+    np.testing.assert_allclose(np.asarray(result), expected.to_numpy(), equal_nan=True)
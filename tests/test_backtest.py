@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.backtest import (_CELL_BYTES, backtest, backtest_grid, fibobars_signals, macd_signals,
+                                 psar_signals, supertrend_signals)
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_macd import calculate_macd
+from indicators.calculate_psar import calculate_psar
+from indicators.fibobars import calculate_fibobars
+from indicators.supertrend import calculate_supertrend
+
+
+def test_backtest_by_hand():
+    open_price = pd.Series([100.0, 110.0, 99.0, 99.0, 120.0])
+    signals = pd.DataFrame({'s': [1.0, 1.0, -1.0, np.nan, 0.0]})
+    result = backtest(open_price, signals, fee=0.001, slippage=0.0005)
+    # Held from the next open: flat, long, long, short, flat. Each unit traded costs
+    # 0.0015; the short at bar 3 reverses a long (2 units) and bar 4 covers it.
+    net = [0.0, (99 / 110 - 1) - 0.0015, 0.0, -(120 / 99 - 1) - 2 * 0.0015, -0.0015]
+    np.testing.assert_allclose(result.equity['s'], np.cumprod(1 + np.array(net)), rtol=1e-12)
+    stats = result.stats.loc['s']
+    assert stats['trades'] == 3
+    assert stats['total_return'] == pytest.approx(np.prod(1 + np.array(net)) - 1, rel=1e-12)
+    assert stats['max_drawdown'] == pytest.approx(1 - np.prod(1 + np.array(net)), rel=1e-12)
+    assert stats['turnover'] == pytest.approx(4 / 5 * 252)
+
+    long_only = backtest(open_price, signals, fee=0.001, slippage=0.0005, allow_short=False)
+    assert long_only.stats.loc['s', 'trades'] == 2
+    assert long_only.equity['s'].iloc[-1] == pytest.approx((1 - 0.1 - 0.0015) * (1 - 0.0015), rel=1e-12)
+
+
+def test_signal_builders_match_the_indicators():
+    data = synthetic_ohlcv(1500)
+    supertrend = supertrend_signals(data, [(10, 3.0), (7, 2.0)])
+    for period, factor in supertrend.columns:
+        expected = calculate_supertrend(data, period, factor)['supertrend_dir']
+        np.testing.assert_array_equal(supertrend[(period, factor)], expected)
+
+    grid = [(0.0, 0.2, 0.02), (0.02, 0.3, 0.01)]
+    psar = psar_signals(data, grid)
+    for params in grid:
+        np.testing.assert_array_equal(psar[params], calculate_psar(data.copy(), *params)['Trend'])
+
+    ohlc = data[['open', 'high', 'low', 'close', 'volume']]
+    for source in (data, ohlc):
+        fibobars = fibobars_signals(source, [(14, 0.618), (20, 0.5), (14, 0.5)])
+        for period, level in fibobars.columns:
+            np.testing.assert_array_equal(fibobars[(period, level)], calculate_fibobars(data, period, level))
+
+    macd = macd_signals(data, [(12, 26, 9), (5, 35, 5)])
+    for params in macd.columns:
+        macd_line, signal_line = calculate_macd(data.copy(), *params)
+        np.testing.assert_array_equal(macd[params], np.sign(macd_line - signal_line).fillna(0))
+
+
+@pytest.mark.parametrize('signals, grid', [
+    ('supertrend', [(p, f) for p in (5, 10, 14) for f in (1.5, 3.0)]),
+    ('psar', [(0.0, 0.2, 0.02), (0.02, 0.2, 0.02), (0.0, 0.3, 0.01)]),
+    ('macd', [(12, 26, 9), (5, 35, 5), (8, 21, 5)]),
+])
+def test_batches_do_not_change_the_stats(signals, grid):
+    data = synthetic_ohlcv(1000)
+    whole = backtest_grid(data, signals, grid, fee=0.0005, slippage=0.0002, keep_equity=True)
+    # One combination per batch
+    batched = backtest_grid(data, signals, grid, fee=0.0005, slippage=0.0002, keep_equity=True,
+                            max_bytes=len(data) * _CELL_BYTES)
+    pd.testing.assert_frame_equal(batched.stats, whole.stats)
+    pd.testing.assert_frame_equal(batched.equity, whole.equity)
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from indicators import benchmark, values
+from indicators.backends import check_parity
+
+
+def test_backends_agree_with_pandas():
+    report = check_parity()
+    assert report['ok'].all(), report[~report['ok']]
+
+
+def test_package_import_fits_the_budget():
+    rows = benchmark.import_times(['indicators'], repeat=3)
+    assert benchmark.check_imports(rows) == []
+
+
+def test_float32_within_tolerance():
+    # More than two float64 accumulation blocks
+    bars = 3 * values._BLOCK_ROWS
+    report = benchmark.float32_accuracy(bars=bars)
+    assert benchmark.check_accuracy(report, bars) == []
+
+
+def test_accuracy_exits_non_zero_on_breach(monkeypatch):
+    breach = pd.DataFrame([{'case': 'sma', 'output': 0, 'max_abs_error': 1.0, 'max_scaled_error': 1e-3,
+                            'max_arithmetic_error': 1e-3, 'mismatched': 0, 'dtype': 'float32'}])
+    breach = breach.set_index(['case', 'output'])
+    monkeypatch.setattr(benchmark, 'float32_accuracy', lambda *args, **kwargs: breach)
+    assert benchmark.main(['--accuracy', '--cases', 'sma', '--sizes', '1000']) == 1
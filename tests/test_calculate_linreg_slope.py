@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_linreg_slope import rolling_linreg
+
+
+def _polyfit_windows(values, length, forecast_offset):
+    # slope, intercept, r2 and forecast of a least-squares fit to every window
+    expected = np.full((4, len(values)), np.nan)
+    x = np.arange(length)
+    for t in range(length - 1, len(values)):
+        window = values[t - length + 1:t + 1]
+        if np.isnan(window).any():
+            continue
+        slope, intercept = np.polyfit(x, window, 1)
+        residual = window - (intercept + slope * x)
+        total = ((window - window.mean()) ** 2).sum()
+        r2 = 1 - (residual ** 2).sum() / total if total > 0 else np.nan
+        expected[:, t] = slope, intercept, r2, intercept + slope * (length - 1 + forecast_offset)
+    return expected
+
+
+@pytest.mark.parametrize('length', [2, 14, 17, 50])
+@pytest.mark.parametrize('level', [0.0, 1e4])
+def test_rolling_linreg_matches_polyfit(length, level):
+    close = synthetic_ohlcv(1500)['close'] + level
+    close.iloc[700] = np.nan
+    outputs = ('slope', 'intercept', 'r2', 'forecast')
+    result = rolling_linreg(close, length, outputs, forecast_offset=3)
+    expected = _polyfit_windows(close.to_numpy(), length, 3)
+    for name, values, reference in zip(outputs, result, expected):
+        # The window ending at the NaN and the length - 1 after it are NaN
+        assert np.isnan(values.iloc[700:700 + length]).all()
+        if name == 'r2' and length == 2:
+            continue  # two points always fit exactly; r2 is 1 up to rounding of a tiny variance
+        np.testing.assert_allclose(values, reference, rtol=1e-10, atol=1e-10, equal_nan=True,
+                                   err_msg=name)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_macd import calculate_macd
+from indicators.checkpoint import load_checkpoint, save_checkpoint
+from indicators.chunked import chunked
+from indicators.rsi import calculate_rsi
+
+
+def test_round_trip_matches_full_run(tmp_path):
+    data = synthetic_ohlcv(1000)
+    path = str(tmp_path / 'macd.npz')
+    macd = chunked(calculate_macd, 12, 26, 9)
+    macd(data.iloc[:600])
+    save_checkpoint(macd, path)
+    line, _ = load_checkpoint(path)(data.iloc[600:])
+    np.testing.assert_allclose(line.to_numpy(), calculate_macd(data)[0].iloc[600:].to_numpy())
+
+
+@pytest.mark.parametrize('payload', ['os:system', 'indicators.checkpoint:pd.DataFrame.to_csv',
+                                     'indicators.chunked:np.save', 'indicators.checkpoint:os.system',
+                                     'indicators.checkpoint:save_checkpoint'])
+def test_refuses_functions_outside_the_package(tmp_path, payload):
+    path = str(tmp_path / 'rsi.npz')
+    save_checkpoint(chunked(calculate_rsi, 14), path)
+    with np.load(path) as archive:
+        arrays = {key: archive[key] for key in archive.files}
+    header = str(arrays.pop('header')).replace('indicators.rsi:calculate_rsi', payload)
+    assert payload in header
+    np.savez(path, header=np.array(header), **arrays)
+    with pytest.raises(ValueError, match='Refusing'):
+        load_checkpoint(path)
+
+
+def test_refuses_objects_outside_the_package(tmp_path):
+    path = str(tmp_path / 'macd.npz')
+    save_checkpoint(chunked(calculate_macd, 12, 26, 9), path)
+    with np.load(path) as archive:
+        arrays = {key: archive[key] for key in archive.files}
+    header = str(arrays.pop('header')).replace('indicators.chunked:MACD', 'indicators.checkpoint:pd.DataFrame')
+    assert 'pd.DataFrame' in header
+    np.savez(path, header=np.array(header), **arrays)
+    with pytest.raises(ValueError, match='Refusing'):
+        load_checkpoint(path)
+
+
+def test_only_package_functions_are_saved(tmp_path):
+    with pytest.raises(TypeError):
+        save_checkpoint(chunked(np.cumsum, lookback=1), str(tmp_path / 'cumsum.npz'))
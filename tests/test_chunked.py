@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.chunked import run_chunked
+from indicators.kalman_filter import kalman_filter
+from indicators.percentage_oscillator import calculate_percentage_oscillator
+
+
+@pytest.mark.parametrize('gap', [slice(500, 504), slice(0, 30), slice(699, 701)])
+def test_kalman_chunks_match_a_full_run_across_nan(gap):
+    data = synthetic_ohlcv(3000)
+    data.loc[data.index[gap], 'close'] = np.nan
+    expected = kalman_filter(data, 'close')
+    chunks = [data.iloc[:700], data.iloc[700:3000]]
+    result = pd.concat(list(run_chunked(chunks, kalman_filter, 'close')))
+    assert result.isna().sum() == expected.isna().sum()
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+def test_percentage_oscillator_chunks_match_a_full_run():
+    data = synthetic_ohlcv(3000)
+    expected = calculate_percentage_oscillator(data.copy(), 10, 21)['PO']
+    chunks = [data.iloc[:1], data.iloc[1:700], data.iloc[700:3000]]
+    result = pd.concat(list(run_chunked(chunks, calculate_percentage_oscillator, 10, 21)))['PO']
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-12)
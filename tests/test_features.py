@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import api
+from indicators.benchmark import synthetic_ohlcv
+from indicators.features import compute_features, plan_features
+
+# Spec entry -> the same features from the module functions
+DIRECT = [
+    (('sma', {'period': 20}), lambda d: {'sma_20': api.calculate_sma(d.copy(), 'close', 20)['SMA_20']}),
+    (('ema', {'period': 20}), lambda d: {'ema_20': api.calculate_ema(d.copy(), 'close', 20)}),
+    (('rsi', {'length': 14}), lambda d: {'rsi_14': api.calculate_rsi(d.copy(), 14)}),
+    (('macd', {}), lambda d: dict(zip(['macd_macd', 'macd_signal'], api.calculate_macd(d.copy())))),
+    (('bollinger_bands', {'window': 20}),
+     lambda d: dict(zip(['bollinger_bands_20_upper', 'bollinger_bands_20_lower'],
+                        api.calculate_bollinger_bands(d.copy(), 20)))),
+    (('atr', {'window': 14}), lambda d: {'atr_14': api.calculate_atr(d.copy(), 14)}),
+    (('adx', {}), lambda d: (lambda r: {'adx_adx': r['ADX'], 'adx_di_plus': r['DI+'],
+                                        'adx_di_minus': r['DI-']})(api.calculate_adx(d.copy()))),
+    (('dirmov', {'length': 14}),
+     lambda d: dict(zip(['dirmov_14_plus_di', 'dirmov_14_minus_di'], api.calculate_dirmov(d['high'], d['low'], 14)))),
+    (('donchian', {'period': 20}), lambda d: {'donchian_20': api.calculate_donchian(d.copy(), 20)}),
+    (('aroon', {'period': 14}),
+     lambda d: (lambda r: {'aroon_14_aroon_up': r['Aroon_Up'],
+                           'aroon_14_aroon_down': r['Aroon_Down']})(api.calculate_aroon(d.copy(), 14))),
+    (('ichimoku', {'conversion_periods': 9, 'base_periods': 26, 'lagging_span2_periods': 52}),
+     lambda d: dict(zip([f'ichimoku_9_26_52_{o}' for o in ('conversion', 'base', 'lead1', 'lead2')],
+                        api.calculate_ichimoku(d.copy(), 9, 26, 52)))),
+    (('stochastic', {'length': 14, 'smoothing': 3}),
+     lambda d: {'stochastic_14_3': api.calculate_stochastic(d.copy(), 14, 3)}),
+    (('fibobars', {'period': 14, 'fibo_level': 0.618}),
+     lambda d: {'fibobars_14_0.618': api.calculate_fibobars(d.copy(), 14, 0.618)}),
+    (('percentage_oscillator', {}),
+     lambda d: {'percentage_oscillator': api.calculate_percentage_oscillator(d.copy())['PO']}),
+    (('bbp', {}), lambda d: (lambda r: {'bbp_bull_power': r['BullPower'], 'bbp_bear_power': r['BearPower'],
+                                        'bbp_bbp': r['BBP']})(api.calculate_bbp(d.copy()))),
+    (('kvo', {}), lambda d: {'kvo': api.calculate_kvo(d.copy())['KVO']}),
+    (('coppock_curve', {}), lambda d: {'coppock_curve': api.calculate_coppock_curve(d.copy())['CoppockCurve']}),
+    (('obv', {}), lambda d: {'obv': api.calculate_obv(d.copy())}),
+    (('psar', {}),
+     lambda d: (lambda r: {'psar_psar': r['PSAR'], 'psar_trend': r['Trend']})(api.calculate_psar(d.copy()))),
+    (('kalman_filter', {}), lambda d: {'kalman_filter': api.kalman_filter(d.copy(), 'close')}),
+    (('hma', {'period': 16}), lambda d: {'hma_16': api.hma(d['close'], 16)}),
+    (('thma', {'period': 16}), lambda d: {'thma_16': api.thma(d['close'], 16)}),
+    (('mass_index', {}), lambda d: {'mass_index': api.mass_index(d.copy())}),
+    (('kairi_relative_index', {}), lambda d: {'kairi_relative_index': api.kairi_relative_index(d.copy())}),
+    (('linreg', {'length': 20}),
+     lambda d: dict(zip(['linreg_20_slope', 'linreg_20_intercept', 'linreg_20_r2'],
+                        api.rolling_linreg(d['close'], 20, ('slope', 'intercept', 'r2'))))),
+]
+
+
+@pytest.mark.parametrize('entry, direct', DIRECT, ids=[entry[0] for entry, _ in DIRECT])
+def test_plan_matches_the_module_functions(entry, direct):
+    data = synthetic_ohlcv(1000)
+    features = compute_features(data, [entry])
+    expected = direct(data)
+    assert list(features.columns) == list(expected)
+    for name, values in expected.items():
+        np.testing.assert_allclose(features[name], np.asarray(values, dtype=float), rtol=1e-9, atol=1e-9,
+                                   equal_nan=True, err_msg=name)
+
+
+def test_shared_intermediates_match_separate_plans():
+    data = synthetic_ohlcv(1000)
+    spec = [entry for entry, _ in DIRECT]
+    together = compute_features(data, spec)
+    separate = pd.concat([compute_features(data, [entry]) for entry in spec], axis=1)
+    pd.testing.assert_frame_equal(together, separate)
+    assert len(plan_features(spec)) < sum(len(plan_features([entry])) for entry in spec)
+
+
+def test_duplicate_feature_names_raise():
+    with pytest.raises(ValueError, match='bollinger_bands_20_upper'):
+        plan_features([('bollinger_bands', {'window': 20}), ('bollinger_bands', {'num_sd': 20})])
+    plan = plan_features([('bollinger_bands', {'window': 20}),
+                          {'indicator': 'bollinger_bands', 'params': {'num_sd': 20}, 'name': 'wide'}])
+    assert {'bollinger_bands_20_upper', 'wide_upper'} <= set(plan.outputs)
+
+
+def test_unbounded_lookback_names_the_feature():
+    with pytest.raises(ValueError, match='obv depends on the whole history'):
+        plan_features([('obv', {}), ('rsi', {'length': 14})]).lookback()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_kairi_relative_index import kairi_relative_index
+from indicators.calculate_mass_index import mass_index
+from indicators.fibobars import calculate_fibobars
+from indicators.heikin_ashi import calculate_heikin_ashi
+
+
+def _heikin_ashi_loop(open_price, high, low, close):
+    # Bar by bar; a bar with a missing price is skipped and the next one opens from
+    # the last complete candle
+    candles = np.full((len(close), 4), np.nan)
+    previous = None
+    for t, bar in enumerate(zip(open_price, high, low, close)):
+        if np.isnan(bar).any():
+            continue
+        o, h, l, c = bar
+        ha_close = (o + h + l + c) / 4
+        ha_open = (o + c) / 2 if previous is None else (previous[0] + previous[1]) / 2
+        candles[t] = ha_open, max(h, ha_open, ha_close), min(l, ha_open, ha_close), ha_close
+        previous = ha_open, ha_close
+    return candles
+
+
+def _bars():
+    data = synthetic_ohlcv(5000)[['open', 'high', 'low', 'close', 'volume']]
+    data.iloc[:3] = np.nan
+    data.iloc[1200:1204] = np.nan
+    data.loc[data.index[2500], 'high'] = np.nan
+    return data
+
+
+def test_heikin_ashi_matches_the_loop():
+    data = _bars()
+    ha = calculate_heikin_ashi(data)
+    expected = _heikin_ashi_loop(*(data[c].to_numpy() for c in ('open', 'high', 'low', 'close')))
+    for k, name in enumerate(('ha_open', 'ha_high', 'ha_low', 'ha_close')):
+        assert ha[name].index.equals(data.index)
+        np.testing.assert_allclose(ha[name], expected[:, k], rtol=1e-12, equal_nan=True, err_msg=name)
+
+
+def test_heikin_ashi_feeds_the_ha_indicators_directly():
+    data = _bars()
+    ha = calculate_heikin_ashi(data)
+    frame = data.assign(**ha)
+    pd.testing.assert_series_equal(calculate_fibobars(ha, 14, 0.618), calculate_fibobars(frame, 14, 0.618))
+    pd.testing.assert_series_equal(mass_index(ha), mass_index(frame))
+    # Stored into a dict rather than a DataFrame column, the KRI Series keeps no name
+    pd.testing.assert_series_equal(kairi_relative_index(dict(ha)), kairi_relative_index(frame.copy()),
+                                   check_names=False)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.hma import hma, wma
+from indicators.kernels import hull_kernel
+from indicators.thma import thma
+
+
+def _wma(values, period):
+    # Linear weights, 1 for the oldest value of the window up to `period` for the newest
+    weights = np.arange(period, 0, -1, dtype=np.float64)
+    return np.r_[np.full(period - 1, np.nan), np.convolve(values, weights, 'valid') / weights.sum()]
+
+
+def _hma(values, period):
+    return _wma(2 * _wma(values, int(period / 2)) - _wma(values, period), int(period ** 0.5))
+
+
+def _close():
+    close = synthetic_ohlcv(3000)['close']
+    close.iloc[1000:1003] = np.nan
+    return close
+
+
+@pytest.mark.parametrize('period', [2, 9, 16, 25, 50])
+def test_hull_family_matches_the_definition(period):
+    close = _close()
+    values = close.to_numpy()
+    np.testing.assert_allclose(wma(close, period), _wma(values, period), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(hma(close, period), _hma(values, period), rtol=1e-10, equal_nan=True)
+    hma1 = _hma(values, period)
+    hma2 = _hma(hma1, period)
+    expected = 3 * (hma1 - hma2) + _hma(hma2, period)
+    np.testing.assert_allclose(thma(close, period), expected, rtol=1e-10, atol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize('triple', [False, True])
+def test_hull_blocks_do_not_change_the_result(triple):
+    values = _close().to_numpy()
+    whole = hull_kernel(values, 16, triple)
+    np.testing.assert_allclose(hull_kernel(values, 16, triple, block=64), whole, rtol=1e-10, equal_nan=True)
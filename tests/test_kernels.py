@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_obv import calculate_obv
+from indicators.calculate_psar import calculate_psar
+from indicators.fibobars import calculate_fibobars
+from indicators.kernels import _kalman_errors, kalman_kernel, supertrend_kernel
+from indicators.supertrend import calculate_supertrend
+
+
+def _kalman_loop(values, process_variance, measurement_variance):
+    # The step-by-step filter, started at the first observation
+    estimates = np.full(len(values), np.nan)
+    estimate, error, started = 0.0, 1.0, False
+    for i, value in enumerate(values):
+        if np.isnan(value):
+            if started:
+                break
+            continue
+        started = True
+        priori_error = error + process_variance
+        gain = priori_error / (priori_error + measurement_variance)
+        estimate += gain * (value - estimate)
+        error = (1 - gain) * priori_error
+        estimates[i] = estimate
+    return estimates
+
+
+@pytest.mark.parametrize('variances', [(0.1, 1), (0.1, 0.123), (3.3, 0.123)])
+def test_kalman_matches_the_loop_when_the_error_cycles(variances):
+    close = synthetic_ohlcv(20_000)['close'].to_numpy().copy()
+    close[:5] = np.nan
+    # The error settles on a fixed point or a short cycle within a few dozen steps
+    assert _kalman_errors(len(close), 1.0, *variances)[2] < 100
+    np.testing.assert_allclose(kalman_kernel(close, *variances), _kalman_loop(close, *variances), rtol=1e-12)
+
+
+# The per-row loops the kernels replaced, on plain lists
+
+def _supertrend_flip_loop(close, upper_band, lower_band):
+    supertrend = [upper_band[0]]
+    for i in range(1, len(close)):
+        supertrend.append(upper_band[i] if close[i] > supertrend[-1] else lower_band[i])
+    return supertrend
+
+
+def _psar_loop(high, low, initial_af=0.0, max_af=0.2, step_af=0.02):
+    psar, trend, ep, af = [low[0]], [1], [high[0]], [initial_af]
+    for i in range(1, len(high)):
+        value = psar[-1] + af[-1] * (ep[-1] - psar[-1])
+        if trend[-1] == 1:
+            value = min(value, low[i - 1], low[i - 2] if i > 1 else low[i - 1])
+            if low[i] < value:
+                psar.append(ep[-1]), trend.append(-1), ep.append(low[i]), af.append(initial_af)
+                continue
+            extreme = high[i] > ep[-1]
+            ep.append(high[i] if extreme else ep[-1])
+        else:
+            value = max(value, high[i - 1], high[i - 2] if i > 1 else high[i - 1])
+            if high[i] > value:
+                psar.append(ep[-1]), trend.append(1), ep.append(high[i]), af.append(initial_af)
+                continue
+            extreme = low[i] < ep[-1]
+            ep.append(low[i] if extreme else ep[-1])
+        psar.append(value), trend.append(trend[-1])
+        af.append(min(af[-1] + step_af, max_af) if extreme else af[-1])
+    return psar, trend, ep, af
+
+
+def _fibobars_loop(highest_high, lowest_low, close, open_price, period, fibo_level):
+    trend = []
+    for i in range(len(close)):
+        if i < period:
+            trend.append(0)
+            continue
+        span = highest_high[i] - lowest_low[i]
+        trend1 = 1 if trend[-1] >= 0 and span * fibo_level < close[i] - lowest_low[i] else -1
+        trend2 = -1 if trend[-1] <= 0 and span * fibo_level < highest_high[i] - close[i] else 1
+        trend.append(trend1 if open_price[i] > close[i] else trend2)
+    return trend
+
+
+def _obv_loop(close, volume):
+    obv = [0.0]
+    for i in range(1, len(close)):
+        if close[i] > close[i - 1]:
+            obv.append(obv[-1] + volume[i])
+        elif close[i] < close[i - 1]:
+            obv.append(obv[-1] - volume[i])
+        else:
+            obv.append(obv[-1])
+    return obv
+
+
+@pytest.fixture
+def gapped():
+    data = synthetic_ohlcv(2000)
+    for start, stop in ((300, 304), (1000, 1001), (1500, 1530)):
+        data.iloc[start:stop, :] = np.nan
+    return data
+
+
+def test_supertrend_flip_matches_the_loop(gapped):
+    result = calculate_supertrend(gapped, 10, 3, ratchet=False)
+    expected = _supertrend_flip_loop(*(result[c].tolist() for c in ('close', 'upper_band', 'lower_band')))
+    np.testing.assert_array_equal(result['supertrend_l'], expected)
+
+
+def test_psar_matches_the_loop(gapped):
+    # Python's min/max with NaN depend on argument order; the kernel follows the loop
+    data = gapped.iloc[:1000]
+    result = calculate_psar(data.copy())
+    expected = _psar_loop(data['high'].tolist(), data['low'].tolist())
+    for column, values in zip(('PSAR', 'Trend', 'EP', 'AF'), expected):
+        np.testing.assert_array_equal(result[column], values, err_msg=column)
+
+
+def test_fibobars_matches_the_loop(gapped):
+    highest_high = gapped['ha_high'].rolling(window=14).max()
+    lowest_low = gapped['ha_low'].rolling(window=14).min()
+    expected = _fibobars_loop(highest_high.tolist(), lowest_low.tolist(), gapped['ha_close'].tolist(),
+                              gapped['ha_open'].tolist(), 14, 0.618)
+    np.testing.assert_array_equal(calculate_fibobars(gapped, 14, 0.618), expected)
+
+
+def test_obv_matches_the_loop(gapped):
+    # A missing volume on a move carries NaN forward, as in the loop
+    for data in (gapped, gapped.fillna({'volume': 0.0})):
+        expected = _obv_loop(data['close'].tolist(), data['volume'].tolist())
+        np.testing.assert_array_equal(calculate_obv(data), expected)
+
+
+def test_supertrend_ratchet_by_hand():
+    close = [10.0, 10.0, 10.5, 10.0, 7.5, 12.5]
+    upper_band = [np.nan, 12.0, 11.0, 13.0, 12.0, 12.0]
+    lower_band = [np.nan, 8.0, 9.0, 7.0, 10.0, 10.0]
+    final_upper, final_lower, supertrend, direction = supertrend_kernel(close, upper_band, lower_band)
+    # The lower band holds at 9 when the basic band drops to 7; the close through it
+    # at bar 4 flips down onto the upper band, and the close above 11 flips back
+    np.testing.assert_array_equal(final_upper, [np.nan, 12, 11, 11, 11, 11])
+    np.testing.assert_array_equal(final_lower, [np.nan, 8, 9, 9, 10, 10])
+    np.testing.assert_array_equal(supertrend, [np.nan, 8, 9, 9, 11, 10])
+    np.testing.assert_array_equal(direction, [0, 1, 1, 1, -1, 1])
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from indicators.live import LivePipeline, Tick, TickSource
+from indicators.rsi import calculate_rsi
+from indicators.supertrend import calculate_supertrend
+
+
+class _Ticks(TickSource):
+    def __init__(self, count, fail=False):
+        self.count, self.fail = count, fail
+
+    async def ticks(self):
+        for i in range(self.count):
+            yield Tick('AAA', float(i), 100.0 + (i % 7), 1.0)
+        if self.fail:
+            raise ConnectionError('feed dropped')
+
+
+async def _collect(pipeline):
+    return [update async for update in pipeline.updates()]
+
+
+def test_runs_to_the_end_of_the_source():
+    pipeline = LivePipeline(_Ticks(100), interval=5)
+    pipeline.subscribe(calculate_rsi, 14)
+    pipeline.subscribe(calculate_supertrend, 3, 2, name='supertrend')
+    updates = asyncio.run(asyncio.wait_for(_collect(pipeline), 10))
+    assert len(updates) == 20
+    assert isinstance(updates[-1].values['supertrend'], float)
+
+
+def test_source_errors_reach_the_consumer():
+    pipeline = LivePipeline(_Ticks(100, fail=True), interval=5)
+    pipeline.subscribe(calculate_rsi, 14)
+    with pytest.raises(ConnectionError):
+        asyncio.run(asyncio.wait_for(_collect(pipeline), 10))
@@ -0,0 +1,26 @@
+import importlib
+import types
+
+import pytest
+
+import indicators
+from indicators import api
+
+
+def test_package_names_are_submodules_in_any_order():
+    assert isinstance(indicators.hma, types.ModuleType)
+    import indicators.calculate_macd as module
+    assert indicators.calculate_macd is module is importlib.import_module('indicators.calculate_macd')
+    from indicators import calculate_macd
+    assert calculate_macd is module
+
+
+def test_functions_are_in_api():
+    for name in indicators.INDICATORS:
+        assert getattr(api, name) is indicators.get_indicator(name)
+    for name in api.__all__:
+        assert callable(getattr(api, name))
+    assert api.hma is indicators.hma.hma
+    assert api.backtest is indicators.backtest.backtest
+    with pytest.raises(AttributeError, match='indicators.api'):
+        indicators.calculate_rsi
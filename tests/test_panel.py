@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.adx import calculate_adx
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_obv import calculate_obv
+from indicators.calculate_psar import calculate_psar
+from indicators.fibobars import calculate_fibobars
+from indicators.kalman_filter import kalman_filter
+from indicators.kernels import _MIN_VECTOR_COLUMNS
+from indicators.rsi import calculate_rsi
+from indicators.supertrend import calculate_supertrend
+
+# (func, args, output picked from the result)
+CASES = {
+    'supertrend': (calculate_supertrend, (10, 3), lambda r: r['supertrend_l']),
+    'supertrend_dir': (calculate_supertrend, (10, 3), lambda r: r['supertrend_dir']),
+    'supertrend_flip': (calculate_supertrend, (10, 3, False), lambda r: r['supertrend_l']),
+    'psar': (calculate_psar, (), lambda r: r['PSAR']),
+    'psar_trend': (calculate_psar, (0.02, 0.2, 0.02), lambda r: r['Trend']),
+    'fibobars': (calculate_fibobars, (14, 0.618), lambda r: r),
+    'obv': (calculate_obv, (), lambda r: r),
+    'kalman_filter': (kalman_filter, ('close',), lambda r: r),
+    'rsi': (calculate_rsi, (14,), lambda r: r),
+    'adx': (calculate_adx, (14, 14), lambda r: r['ADX']),
+}
+
+
+def _staggered(symbols):
+    panel = synthetic_ohlcv(800, symbols=symbols, seed=5)
+    # Symbol j starts trading at bar 7 * j
+    starts = 7 * np.arange(symbols)
+    missing = np.arange(800)[:, None] < starts
+    return {field: frame.mask(missing) for field, frame in panel.items()}
+
+
+@pytest.mark.parametrize('symbols', [10, 70])
+@pytest.mark.parametrize('case', CASES)
+def test_panel_matches_each_symbol(case, symbols):
+    # Fewer than _MIN_VECTOR_COLUMNS symbols run the 1-D kernels per column, more run
+    # the 2-D ones; both must give each symbol its own single-series result
+    assert 10 < _MIN_VECTOR_COLUMNS <= 70
+    panel = _staggered(symbols)
+    func, args, pick = CASES[case]
+    result = pick(func(dict(panel), *args))
+    assert list(result.columns) == list(panel['close'].columns)
+    for symbol in result.columns:
+        single = pd.DataFrame({field: frame[symbol] for field, frame in panel.items()})
+        expected = pick(func(single, *args))
+        np.testing.assert_allclose(result[symbol], expected, rtol=1e-12, atol=1e-12, equal_nan=True,
+                                   err_msg=f'{case} {symbol}')
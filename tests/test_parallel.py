@@ -0,0 +1,42 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.parallel import run_parallel
+from indicators.rsi import calculate_rsi
+from indicators.supertrend import calculate_supertrend
+
+
+def test_two_workers_match_a_serial_run_and_release_shared_memory(monkeypatch):
+    created = []
+
+    class Recording(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name=name, create=create, size=size)
+            if create:
+                created.append(self.name)
+
+    monkeypatch.setattr(shared_memory, 'SharedMemory', Recording)
+    fields = ['open', 'high', 'low', 'close', 'volume']
+    universe = {f'S{i}': synthetic_ohlcv(300 + 50 * i, seed=i)[fields] for i in range(6)}
+
+    outputs = ('supertrend_l', 'supertrend_dir')
+    results, stats = run_parallel(universe, calculate_supertrend, args=(10, 3), outputs=outputs, max_workers=2)
+    rsi, _ = run_parallel(universe, calculate_rsi, args=(14,), max_workers=2)
+    for symbol, frame in universe.items():
+        expected = calculate_supertrend(frame, 10, 3)
+        assert results[symbol].index.equals(frame.index)
+        for output in outputs:
+            np.testing.assert_array_equal(results[symbol][output], expected[output])
+        np.testing.assert_array_equal(rsi[symbol].iloc[:, 0], calculate_rsi(frame.copy(), 14))
+
+    assert stats['symbols'].sum() == len(universe)
+    assert stats['rows'].sum() == sum(len(frame) for frame in universe.values())
+    assert 'main' in stats.index and 1 <= len(stats) - 1 <= 2
+    # Inputs and outputs of both runs: five fields and one output block each
+    assert len(created) == 2 * (len(fields) + 1)
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1,56 @@
+import pytest
+
+from indicators import profiling
+from indicators.backends import compute
+from indicators.backtest import backtest_grid
+from indicators.benchmark import synthetic_ohlcv
+from indicators.features import plan_features
+from indicators.profiling import profile
+from indicators.supertrend import calculate_supertrend
+
+
+def test_feature_plan_nodes_are_recorded():
+    data = synthetic_ohlcv(500)
+    plan = plan_features([('rsi', {'length': 14}), ('adx', {}), ('macd', {})])
+    with profile() as prof:
+        plan.run(data)
+    names = set(prof.report().index)
+    assert 'features.tr' in names
+    assert 'features.ema' in names
+
+
+def test_backend_and_backtest_dispatch_are_recorded():
+    data = synthetic_ohlcv(500)
+    with profile() as prof:
+        compute('psar', data, backend='numpy')
+        backtest_grid(data, 'macd', [(12, 26, 9), (5, 35, 5)])
+    names = set(prof.report().index)
+    assert 'psar [numpy]' in names
+    assert 'signals.macd_signals' in names
+    assert {'backtest', 'sweep_macd'} <= names
+
+
+def test_directly_imported_functions_are_recorded():
+    data = synthetic_ohlcv(500)
+    with profile() as prof:
+        calculate_supertrend(data, 10, 3)
+    recorded = len(prof.records)
+    calculate_supertrend(data, 10, 3)
+    report = prof.report()
+    assert report.loc['calculate_supertrend', 'calls'] == 1
+    assert report.loc['calculate_supertrend', 'rows'] == 500
+    assert len(prof.records) == recorded
+
+
+def test_failed_enter_releases_the_profile(monkeypatch):
+    def fail():
+        raise RuntimeError('boom')
+    monkeypatch.setattr(profiling.tracemalloc, 'is_tracing', lambda: False)
+    monkeypatch.setattr(profiling.tracemalloc, 'start', fail)
+    with pytest.raises(RuntimeError):
+        with profile(memory=True):
+            pass
+    assert profiling._active is None
+    monkeypatch.undo()
+    with profile():
+        pass
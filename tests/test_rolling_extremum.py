@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_donchian import calculate_donchian
+from indicators.calculate_ichimoku import calculate_ichimoku
+from indicators.panel import as_panel
+from indicators.stochastic_oscillator import calculate_stochastic
+
+
+def _midline(data, period):
+    return (data['low'].rolling(period).min() + data['high'].rolling(period).max()) / 2
+
+
+@pytest.mark.parametrize('data', [synthetic_ohlcv(2_000), as_panel(synthetic_ohlcv(300, symbols=4))])
+def test_channels_match_pandas_rolling(data):
+    high = data['high'].copy()
+    high.iloc[100:103] = np.nan
+    data = dict(data, high=high)
+    for got, expected in [(calculate_donchian(data, 20), _midline(data, 20)),
+                          (calculate_ichimoku(data, 9, 26, 52)[3], _midline(data, 52))]:
+        assert np.array_equal(np.asarray(got), np.asarray(expected), equal_nan=True)
+
+    k = 100 * (data['close'] - data['low'].rolling(14).min()) / (
+        data['high'].rolling(14).max() - data['low'].rolling(14).min())
+    assert np.array_equal(np.asarray(calculate_stochastic(data, 14, 3)), np.asarray(k.rolling(3).mean()),
+                          equal_nan=True)
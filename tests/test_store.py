@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from indicators.store import ColumnStore
+
+
+def test_view_keeps_its_rows_after_append(tmp_path):
+    store = ColumnStore(str(tmp_path))
+    first = pd.DataFrame({'close': np.arange(500.0)})
+    store.write('AAA', first)
+    view = store['AAA']
+    store.append('AAA', pd.DataFrame({'close': np.arange(500.0, 510.0)}))
+    np.testing.assert_array_equal(view['close'].to_numpy(), first['close'].to_numpy())
+    assert len(view.index) == 500
+    assert len(store['AAA']['close']) == 510
+
+
+def test_columns_widen_for_later_chunks(tmp_path):
+    path = tmp_path / 'AAA.csv'
+    path.write_text('close,volume\n100,10\n101,11\n102,12\n103.5,13\n104.25,\n105,15\n')
+    store = ColumnStore(str(tmp_path / 'store'))
+    store.ingest_csv(str(path), 'AAA', chunksize=3)
+    view = store['AAA']
+    expected = pd.read_csv(path)
+    np.testing.assert_array_equal(view['close'].to_numpy(), expected['close'].to_numpy())
+    np.testing.assert_array_equal(view['volume'].to_numpy(), expected['volume'].to_numpy())
+    assert view['close'].dtype == np.float64
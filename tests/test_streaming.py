@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import streaming
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_dirmov import calculate_dirmov
+from indicators.calculate_linreg_slope import rolling_linreg
+from indicators.kalman_filter import kalman_filter
+
+
+def _replay(indicator, data):
+    fields = indicator.fields
+    return [indicator.update(dict(zip(fields, values))) for values in zip(*(data[f].tolist() for f in fields))]
+
+
+def test_dirmov_matches_batch():
+    data = synthetic_ohlcv(500)
+    plus_di, minus_di = calculate_dirmov(data['high'], data['low'], 14)
+    plus, minus = zip(*_replay(streaming.DirMov(14), data))
+    np.testing.assert_allclose(plus, plus_di, rtol=1e-10)
+    np.testing.assert_allclose(minus, minus_di, rtol=1e-10)
+
+
+@pytest.mark.parametrize('forecast_offset', [0, 1])
+def test_rolling_linreg_matches_batch(forecast_offset):
+    data = synthetic_ohlcv(500)
+    data.loc[data.index[200], 'close'] = np.nan
+    outputs = ('slope', 'intercept', 'r2', 'forecast')
+    expected = rolling_linreg(data['close'], 20, outputs, forecast_offset)
+    got = zip(*_replay(streaming.RollingLinreg(20, outputs, forecast_offset), data))
+    for values, batch in zip(got, expected):
+        np.testing.assert_allclose(values, batch, rtol=1e-9, atol=1e-9)
+
+
+def test_rolling_linreg_single_output():
+    data = synthetic_ohlcv(100)
+    values = _replay(streaming.RollingLinreg(14), data)
+    assert isinstance(values[-1], float)
+    np.testing.assert_allclose(values, rolling_linreg(data['close'], 14), rtol=1e-9)
+
+
+def test_kalman_filter_starts_at_the_first_value():
+    data = synthetic_ohlcv(500)
+    data.loc[data.index[:5], 'close'] = np.nan
+    expected = kalman_filter(data, 'close')
+    values = _replay(streaming.KalmanFilter('close'), data)
+    assert np.isnan(values[:5]).all()
+    np.testing.assert_allclose(values, expected, rtol=1e-12, equal_nan=True)
+
+
+def test_series_classes_take_the_column_by_keyword():
+    data = synthetic_ohlcv(100)
+    for cls in (streaming.WMA, streaming.HMA, streaming.THMA):
+        with pytest.raises(TypeError):
+            cls(9, 'high')
+        on_high = _replay(cls(9, column='high'), data)
+        np.testing.assert_allclose(on_high, _replay(cls(9), data.assign(close=data['high'])), equal_nan=True)
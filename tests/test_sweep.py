@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_bollinger_bands import calculate_bollinger_bands
+from indicators.calculate_macd import calculate_macd
+from indicators.stochastic_oscillator import calculate_stochastic
+from indicators.supertrend import calculate_supertrend
+from indicators.sweep import sweep_bollinger_bands, sweep_macd, sweep_stochastic, sweep_supertrend
+
+
+@pytest.fixture
+def data():
+    data = synthetic_ohlcv(1500)
+    data.iloc[400:403] = np.nan
+    return data
+
+
+def test_sweep_macd_matches_each_triple(data):
+    grid = [(12, 26, 9), (8, 26, 9), (12, 21, 5), (8, 21, 9)]
+    macd_line, signal_line = sweep_macd(data, grid)
+    assert list(macd_line.columns) == grid
+    for params in grid:
+        expected_macd, expected_signal = calculate_macd(data.copy(), *params)
+        np.testing.assert_allclose(macd_line[params], expected_macd, rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(signal_line[params], expected_signal, rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize('ratchet', [True, False])
+def test_sweep_supertrend_matches_each_pair(data, ratchet):
+    supertrend, direction = sweep_supertrend(data, [7, 10], [1.5, 3.0], ratchet=ratchet)
+    for period, factor in supertrend.columns:
+        expected = calculate_supertrend(data, period, factor, ratchet=ratchet)
+        np.testing.assert_allclose(supertrend[(period, factor)], expected['supertrend_l'], rtol=1e-12,
+                                   equal_nan=True)
+        if ratchet:
+            np.testing.assert_array_equal(direction[(period, factor)], expected['supertrend_dir'])
+    assert direction.empty != ratchet
+
+
+def test_sweep_bollinger_bands_matches_each_pair(data):
+    upper_band, lower_band = sweep_bollinger_bands(data, [10, 20], [1.5, 2])
+    for window, num_sd in upper_band.columns:
+        expected_upper, expected_lower = calculate_bollinger_bands(data.copy(), window, num_sd)
+        np.testing.assert_allclose(upper_band[(window, num_sd)], expected_upper, rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(lower_band[(window, num_sd)], expected_lower, rtol=1e-12, equal_nan=True)
+
+
+def test_sweep_stochastic_matches_each_pair(data):
+    result = sweep_stochastic(data, [5, 14], [1, 3])
+    assert result.shape[1] == 4
+    for length, smoothing in result.columns:
+        np.testing.assert_array_equal(result[(length, smoothing)], calculate_stochastic(data, length, smoothing))
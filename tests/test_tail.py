@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.adx import calculate_adx
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_bollinger_bands import calculate_bollinger_bands
+from indicators.calculate_macd import calculate_macd
+from indicators.features import compute_features
+from indicators.rsi import calculate_rsi
+from indicators.stochastic_oscillator import calculate_stochastic
+from indicators.tail import last_n, screen
+
+# (func, args, output picked from the result, tolerance)
+CASES = {
+    'rsi': (calculate_rsi, (14,), lambda r: r, 1e-9),
+    'stochastic': (calculate_stochastic, (14, 3), lambda r: r, 1e-9),
+    'bollinger_bands': (calculate_bollinger_bands, (20, 2), lambda r: pd.concat(r, axis=1), 1e-9),
+    # EMA seeds weigh at most `tolerance` (1e-6) of their gap to the full-history value
+    'macd': (calculate_macd, (12, 26, 9), lambda r: pd.concat(r, axis=1), 1e-5),
+    'adx': (calculate_adx, (14, 14), lambda r: r[['DI+', 'DI-', 'ADX']], 1e-9),
+}
+
+
+@pytest.mark.parametrize('case', CASES)
+@pytest.mark.parametrize('n', [1, 25])
+def test_last_n_matches_the_full_run(case, n):
+    data = synthetic_ohlcv(3000)
+    func, args, pick, tolerance = CASES[case]
+    expected = pick(func(data.copy(), *args)).iloc[-n:]
+    result = pick(last_n(data, n, func, *args))
+    assert len(result) == n
+    np.testing.assert_allclose(result, expected, rtol=tolerance, atol=tolerance)
+
+
+def test_screen_filters_on_the_latest_values():
+    panel = synthetic_ohlcv(2000, symbols=40, seed=3)
+    spec = [{'indicator': 'rsi', 'params': {'length': 14}, 'name': 'rsi'},
+            {'indicator': 'stochastic', 'name': 'stoch'},
+            {'indicator': 'macd', 'name': 'macd'}]
+    full = compute_features(panel, spec)
+    values = pd.DataFrame({name: frame.iloc[-1] for name, frame in full.items()})
+    wanted = values.index[(values['rsi'] < 50) & (values['macd_macd'] > values['macd_signal'])]
+    assert 0 < len(wanted) < len(values)
+
+    picks = screen(panel, spec, 'rsi < 50 and macd_macd > macd_signal')
+    assert list(picks.index) == list(wanted)
+    np.testing.assert_allclose(picks, values.loc[wanted, picks.columns], rtol=1e-5, atol=1e-5)
+    by_function = screen(panel, spec, lambda v: (v['rsi'] < 50) & (v['macd_macd'] > v['macd_signal']))
+    pd.testing.assert_frame_equal(by_function, picks)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators.benchmark import synthetic_ohlcv
+from indicators.calculate_macd import calculate_macd
+from indicators.calculate_psar import calculate_psar
+from indicators.hma import hma
+from indicators.rsi import calculate_rsi
+from indicators.supertrend import calculate_supertrend
+from indicators.timeframes import MultiTimeframe, align, resample_bars
+
+RULE = '15min'
+# (func, args, source, output picked from the result)
+CASES = {
+    'rsi': (calculate_rsi, (14,), None, lambda r: r),
+    'macd': (calculate_macd, (12, 26, 9), None, lambda r: r[1]),
+    'supertrend': (calculate_supertrend, (10, 3), None, lambda r: r['supertrend_l']),
+    'psar': (calculate_psar, (), None, lambda r: r['PSAR']),
+    'hma': (hma, (16,), 'close', lambda r: r),
+}
+
+
+def _bars(n=6000):
+    data = synthetic_ohlcv(n)[['open', 'high', 'low', 'close', 'volume']]
+    data.index = pd.date_range('2024-01-02 09:00', periods=n, freq='1min')
+    # A session break (missing minutes), a fully missing 15-minute bar and a few
+    # missing values inside a bar
+    data = data.drop(data.index[700:790])
+    data.iloc[2000:2030] = np.nan
+    data.iloc[3001:3003] = np.nan
+    return data.iloc[:-7]  # the last bar is still forming
+
+
+def _direct(data, func, args, source, pick):
+    bars = resample_bars(data, RULE, partial=False)
+    result = func(bars[source] if source else bars.copy(), *args)
+    return align(pick(result), data.index, RULE)
+
+
+def _incremental(data, func, args, source, pick, cuts=(1000, 1003, 2017, 4500)):
+    edges = (0,) + cuts + (len(data),)
+    mtf = MultiTimeframe(data.iloc[:edges[1]], timeframes=(RULE,))
+    mtf.aligned(RULE, func, *args, source=source)  # carry state from the first chunk on
+    for start, stop in zip(edges[1:], edges[2:]):
+        mtf.update(data.iloc[start:stop])
+    return mtf, pick(mtf.aligned(RULE, func, *args, source=source))
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_incremental_updates_match_a_full_resample(case):
+    data = _bars()
+    func, args, source, pick = CASES[case]
+    _, result = _incremental(data, func, args, source, pick)
+    expected = _direct(data, func, args, source, pick)
+    assert result.index.equals(data.index)
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('case', ['rsi', 'supertrend'])
+def test_aligned_values_do_not_look_ahead(case):
+    data = _bars()
+    func, args, source, pick = CASES[case]
+    before = _incremental(data, func, args, source, pick)[1]
+    # Change every base bar after row k; nothing aligned at or before k may move
+    k = 3217
+    changed = data.copy()
+    changed.iloc[k + 1:] *= 1.05
+    after = _incremental(changed, func, args, source, pick)[1]
+    np.testing.assert_array_equal(after.iloc[:k + 1], before.iloc[:k + 1])
+    # The 15-minute bar containing row k is not visible until its last base bar
+    first = np.flatnonzero(data.index.floor(RULE) == data.index[k].floor(RULE))[0]
+    assert first < k
+    np.testing.assert_array_equal(before.iloc[first:k + 1], before.iloc[first - 1])
+
+
+def test_partial_bar_reaches_only_the_latest_base_bar():
+    data = _bars()
+    mtf = MultiTimeframe(data.iloc[:4000], timeframes=(RULE,)).update(data.iloc[4000:])
+    completed = mtf.aligned(RULE, calculate_rsi, 14)
+    live = mtf.aligned(RULE, calculate_rsi, 14, partial=True)
+    # The forming bar's value matches RSI on bars that include it, on the last row only
+    expected = calculate_rsi(resample_bars(data, RULE, partial=True), 14)
+    assert live.iloc[-1] == pytest.approx(expected.iloc[-1], rel=1e-9)
+    assert live.iloc[-1] != completed.iloc[-1]
+    pd.testing.assert_series_equal(live.iloc[:-1], completed.iloc[:-1])
+    # Reading the partial value leaves the carried state alone
+    pd.testing.assert_series_equal(mtf.aligned(RULE, calculate_rsi, 14), completed)